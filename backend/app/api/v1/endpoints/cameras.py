@@ -1,4 +1,5 @@
-from typing import Any, List, Optional
+import asyncio
+from typing import Any, List, Optional, Set
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 import json
@@ -7,6 +8,8 @@ from pydantic import BaseModel
 from app import schemas
 from app.db import get_db, Camera, User
 from app.core import security
+from app.core.services.pipeline_manager import pipeline_manager
+from app.core.services.live_state import live_state_reader
 
 router = APIRouter()
 
@@ -101,3 +104,104 @@ def create_camera(
         db_obj.detection_config = json.loads(db_obj.detection_config)
         
     return db_obj
+
+
+def _owned_camera_ids(db: Session, user_id: str) -> Set[str]:
+    return {camera_id for (camera_id,) in db.query(Camera.id).filter(Camera.user_id == user_id)}
+
+
+@router.get("/pipelines")
+def list_pipelines(
+    db: Session = Depends(get_db),
+    token_payload: dict = Depends(security.get_current_token_payload)
+) -> Any:
+    """
+    List the user's capture pipelines running in this process.
+    """
+    return pipeline_manager.status(_owned_camera_ids(db, token_payload.get("sub")))
+
+
+@router.get("/live")
+async def list_live_states(
+    db: Session = Depends(get_db),
+    token_payload: dict = Depends(security.get_current_token_payload)
+) -> Any:
+    """
+    Latest detections and status of the user's cameras, from any backend worker.
+    """
+    camera_ids = await asyncio.to_thread(_owned_camera_ids, db, token_payload.get("sub"))
+    try:
+        return await live_state_reader.get_all(camera_ids)
+    except Exception:
+        raise HTTPException(status_code=503, detail="Live state store unavailable")
+
+
+@router.get("/{camera_id}/live")
+async def get_live_state(
+    camera_id: str,
+    db: Session = Depends(get_db),
+    token_payload: dict = Depends(security.get_current_token_payload)
+) -> Any:
+    """
+    Latest detections and status of one camera, from any backend worker.
+    """
+    camera_ids = await asyncio.to_thread(_owned_camera_ids, db, token_payload.get("sub"))
+    if camera_id not in camera_ids:
+        raise HTTPException(status_code=404, detail="Camera not found")
+    try:
+        state = await live_state_reader.get(camera_id)
+    except Exception:
+        raise HTTPException(status_code=503, detail="Live state store unavailable")
+    if state is None:
+        raise HTTPException(status_code=404, detail="No live state for this camera")
+    return state
+
+
+@router.post("/{camera_id}/start", response_model=CameraOut)
+def start_camera(
+    camera_id: str,
+    db: Session = Depends(get_db),
+    token_payload: dict = Depends(security.get_current_token_payload)
+) -> Any:
+    """
+    Activate a camera and start its capture pipeline.
+    """
+    user_id = token_payload.get("sub")
+    camera = db.query(Camera).filter(Camera.id == camera_id, Camera.user_id == user_id).first()
+    if not camera:
+        raise HTTPException(status_code=404, detail="Camera not found")
+    
+    started = pipeline_manager.start_camera(camera)
+    camera.is_active = True
+    camera.status = "online" if started else "error"
+    db.commit()
+    db.refresh(camera)
+    
+    if isinstance(camera.detection_config, str):
+        camera.detection_config = json.loads(camera.detection_config)
+    return camera
+
+
+@router.post("/{camera_id}/stop", response_model=CameraOut)
+def stop_camera(
+    camera_id: str,
+    db: Session = Depends(get_db),
+    token_payload: dict = Depends(security.get_current_token_payload)
+) -> Any:
+    """
+    Deactivate a camera and stop its capture pipeline.
+    """
+    user_id = token_payload.get("sub")
+    camera = db.query(Camera).filter(Camera.id == camera_id, Camera.user_id == user_id).first()
+    if not camera:
+        raise HTTPException(status_code=404, detail="Camera not found")
+    
+    pipeline_manager.stop_camera(camera.id)
+    camera.is_active = False
+    camera.status = "offline"
+    db.commit()
+    db.refresh(camera)
+    
+    if isinstance(camera.detection_config, str):
+        camera.detection_config = json.loads(camera.detection_config)
+    return camera
@@ -1,29 +1,58 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from app.core.services.camera_service import camera_service
+from app.core.services.pipeline_manager import pipeline_manager
+from app.core.metrics import observe_stage
 import asyncio
 from loguru import logger
 
 router = APIRouter()
 
 @router.websocket("/ws/stream")
-async def video_stream(websocket: WebSocket):
+async def video_stream(websocket: WebSocket, quality: str = "auto"):
     await websocket.accept()
     logger.info("WebSocket connection established for video stream")
     
-    # Ensure camera is started
+    # Ensure camera is started (opening the device can block for seconds,
+    # so keep it off the event loop)
     if not camera_service.is_running:
-        camera_service.start()
+        await asyncio.to_thread(camera_service.start)
     
+    await _stream_frames(websocket, camera_service, quality)
+
+
+@router.websocket("/ws/stream/{camera_id}")
+async def camera_stream(websocket: WebSocket, camera_id: str, quality: str = "auto"):
+    await websocket.accept()
+    pipeline = pipeline_manager.get(camera_id)
+    if pipeline is None or not pipeline.is_running:
+        logger.warning(f"WebSocket stream requested for inactive camera {camera_id}")
+        await websocket.close(code=1008, reason="Camera pipeline is not running")
+        return
+    
+    logger.info(f"WebSocket connection established for camera {camera_id}")
+    await _stream_frames(websocket, pipeline, quality)
+
+
+async def _stream_frames(websocket: WebSocket, pipeline, quality: str = "auto"):
+    # Frames are JPEG-encoded once per camera and quality tier by its StreamHub;
+    # this viewer only drains its own queue, so a slow client cannot stall the
+    # others. quality is "high", "medium", "low" or "auto" (adapts to backlog).
+    subscriber = pipeline.stream_hub.subscribe(quality)
     try:
         while True:
-            frame_bytes = await camera_service.get_jpeg_frame()
-            if frame_bytes:
+            frame_bytes = await subscriber.get()
+            if frame_bytes is None:
+                logger.info("Camera pipeline stopped, closing stream")
+                await websocket.close(code=1001, reason="Camera pipeline stopped")
+                break
+            with observe_stage(pipeline.detection_key, "ws_send"):
                 await websocket.send_bytes(frame_bytes)
-            await asyncio.sleep(0.033)
     except WebSocketDisconnect:
         logger.info("WebSocket stream disconnected")
     except Exception as e:
         logger.error(f"WebSocket stream error: {e}")
+    finally:
+        pipeline.stream_hub.unsubscribe(subscriber)
 
 
 @router.websocket("/ws/notifications")
@@ -0,0 +1,89 @@
+"""Prometheus metrics for the capture -> detection -> streaming pipeline"""
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+# Stage latencies range from sub-millisecond (overlay) to seconds (CPU inference)
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Stages: capture_read, queue_wait, inference, face_recognition, overlay, jpeg_encode, ws_send
+STAGE_DURATION = Histogram(
+    "fess_stage_duration_seconds",
+    "Time spent in each pipeline stage",
+    ["camera", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+
+FRAMES_CAPTURED = Counter("fess_frames_captured_total", "Frames read from the camera", ["camera"])
+FRAMES_DETECTED = Counter("fess_frames_detected_total", "Frames that completed a detection pass", ["camera"])
+# reason: detection_queue (replaced by a newer frame), viewer_queue (slow stream client)
+FRAMES_DROPPED = Counter("fess_frames_dropped_total", "Frames dropped before being used", ["camera", "reason"])
+
+CAPTURE_FPS = Gauge("fess_capture_fps", "Effective capture frame rate", ["camera"], multiprocess_mode="liveall")
+DETECTION_FPS = Gauge("fess_detection_fps", "Effective detection frame rate", ["camera"], multiprocess_mode="liveall")
+STREAM_VIEWERS = Gauge("fess_stream_viewers", "Connected live stream viewers", ["camera"], multiprocess_mode="livesum")
+
+
+@contextmanager
+def observe_stage(camera: str, stage: str):
+    """Times the enclosed block into ``fess_stage_duration_seconds``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_DURATION.labels(camera, stage).observe(time.perf_counter() - started)
+
+
+class RateMeter:
+    """Turns per-frame ticks into a frames-per-second gauge, updated once per interval."""
+
+    def __init__(self, gauge, camera: str, interval: float = 1.0):
+        self.gauge = gauge.labels(camera)
+        self.interval = interval
+        self._count = 0
+        self._window_start = time.monotonic()
+
+    def tick(self):
+        self._count += 1
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed >= self.interval:
+            self.gauge.set(self._count / elapsed)
+            self._count = 0
+            self._window_start = now
+
+
+def render_metrics() -> bytes:
+    """Prometheus text exposition, aggregated across processes when multiprocess mode is on."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        # Detection worker processes and uvicorn workers write to shared files
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+__all__ = [
+    "CONTENT_TYPE_LATEST",
+    "STAGE_DURATION",
+    "FRAMES_CAPTURED",
+    "FRAMES_DETECTED",
+    "FRAMES_DROPPED",
+    "CAPTURE_FPS",
+    "DETECTION_FPS",
+    "STREAM_VIEWERS",
+    "observe_stage",
+    "RateMeter",
+    "render_metrics",
+]
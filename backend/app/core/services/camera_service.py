@@ -1,37 +1,47 @@
 import cv2
 import threading
-import queue
 import time
 from loguru import logger
 import asyncio
-from typing import Optional
+from typing import Optional, Union
 from datetime import datetime
 import os
+from functools import partial
 import numpy as np
 
 from app.core.services.detection_service import detection_service
+from app.core.services.detection_workers import detection_workers
+from app.core.services.face_gallery import match_confidence
+from app.core.services.intruder_memory import intruder_memory
+from app.core.services.live_state import live_state
+from app.core.services.frame_buffer import FrameRingBuffer
+from app.core.services.stream_hub import StreamHub
+from app.core.services.motion_gate import MotionGate
 from app.core.services.notification_service import notification_service
 from app.core.config import settings
+from app.core.metrics import (
+    CAPTURE_FPS, DETECTION_FPS, FRAMES_CAPTURED, FRAMES_DETECTED, RateMeter, observe_stage
+)
 
 
 class CameraService:
-    _instance = None
-    _lock = threading.Lock()
-
-    def __new__(cls):
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super(CameraService, cls).__new__(cls)
-                cls._instance._initialized = False
-            return cls._instance
-
-    def __init__(self, src=0):
-        if self._initialized:
-            return
-        
+    """Capture pipeline for a single camera source.
+
+    Several instances can run side by side in one process (see
+    ``PipelineManager``); they all share the global ``detection_service``.
+    """
+
+    def __init__(self, src: Union[int, str] = 0, camera_id: Optional[str] = None, name: Optional[str] = None):
         self.src = src
+        self.camera_id = camera_id
+        self.name = name or f"camera-{src}"
         self.capture = None
-        self.frame_queue = queue.Queue(maxsize=1)
+        # Capture writes into preallocated slots; detection, overlays and
+        # encoding take references instead of copies
+        self.frames = FrameRingBuffer()
+        self._last_served_generation = 0
+        # Encodes each frame once for all /ws/stream viewers of this camera
+        self.stream_hub = StreamHub(self.frames, name=self.name, camera=self.detection_key)
         self.is_running = False
         self.thread = None
         
@@ -39,33 +49,82 @@ class CameraService:
         self.is_armed = True
         self.last_alert_time = 0
         self.alert_cooldown = settings.ALERT_COOLDOWN
+        self.detection_enabled = True
+        self.motion_gate = MotionGate() if settings.MOTION_GATE_ENABLED else None
+        
+        # Latest detection results, drawn on every streamed frame.
+        # Workers swap in a whole (seq, detections, status) tuple at once so
+        # the capture thread never sees detections and status from different passes.
+        self._detection_result = (0, [], "SAFE")
+        self._result_lock = threading.Lock()
+        self._frame_seq = 0
         
-        self._initialized = True
-        logger.info(f"CameraService initialized with src={src}")
+        # Prometheus FPS gauges
+        self._capture_rate = RateMeter(CAPTURE_FPS, self.detection_key)
+        self._detection_rate = RateMeter(DETECTION_FPS, self.detection_key)
+        
+        logger.info(f"CameraService initialized with src={src} (camera_id={camera_id})")
 
-    def start(self):
-        if self.is_running:
-            return
+    @property
+    def current_detections(self):
+        return self._detection_result[1]
+
+    @property
+    def current_status(self):
+        return self._detection_result[2]
+
+    @staticmethod
+    def source_from_camera(camera) -> Union[int, str]:
+        """Resolves the OpenCV capture source of a ``Camera`` database row."""
+        if camera.source_type in ("ip", "rtsp") and camera.source_url:
+            return camera.source_url
+        if camera.source_index is not None:
+            return camera.source_index
+        # Webcam/USB rows may carry a device path or URL instead of an index
+        return camera.source_url if camera.source_url else 0
+
+    @classmethod
+    def from_camera(cls, camera) -> "CameraService":
+        """Builds a pipeline from a ``Camera`` database row."""
+        service = cls(src=cls.source_from_camera(camera), camera_id=camera.id, name=camera.name)
+        service.detection_enabled = bool(camera.detection_enabled)
+        return service
+
+    @property
+    def detection_key(self) -> str:
+        """Key under which the shared detection service keeps our tracker state."""
+        return self.camera_id or f"local-{self.src}"
+
+    def _open_capture(self):
+        if isinstance(self.src, str):
+            # Network streams (RTSP/HTTP) or file paths
+            return cv2.VideoCapture(self.src)
         
         # Windows optimization: CAP_DSHOW is often more stable than MF
-        logger.info(f"Opening camera {self.src} using CAP_DSHOW...")
-        self.capture = cv2.VideoCapture(self.src + cv2.CAP_DSHOW)
+        capture = cv2.VideoCapture(self.src + cv2.CAP_DSHOW)
+        if not capture.isOpened():
+            logger.warning(f"CAP_DSHOW failed for {self.src}, trying default...")
+            capture = cv2.VideoCapture(self.src)
+        return capture
+
+    def start(self):
+        if self.is_running:
+            return True
         
-        if not self.capture.isOpened():
-            logger.warning(f"CAP_DSHOW failed, trying default...")
-            self.capture = cv2.VideoCapture(self.src)
+        logger.info(f"Opening camera {self.name} ({self.src})...")
+        self.capture = self._open_capture()
 
         if not self.capture.isOpened():
             logger.error(f"Could not open camera source {self.src}")
             return False
             
         # Initialize detection model in background to avoid blocking main loop
-        threading.Thread(target=detection_service.load_model, daemon=True).start()
+        detection_workers.preload()
         
         self.is_running = True
         self.thread = threading.Thread(target=self._capture_loop, daemon=True)
         self.thread.start()
-        logger.info("Camera capture thread started")
+        logger.info(f"Camera capture thread started for {self.name}")
         return True
 
     def stop(self):
@@ -74,7 +133,11 @@ class CameraService:
             self.thread.join(timeout=2)
         if self.capture:
             self.capture.release()
-        logger.info("Camera capture thread stopped")
+        self.stream_hub.stop()
+        self.frames.clear()
+        detection_workers.reset_camera(self.detection_key)
+        live_state.remove(self.detection_key)
+        logger.info(f"Camera capture thread stopped for {self.name}")
 
     def _recover_camera(self):
         """Attempts to re-open the camera if the stream is lost."""
@@ -83,23 +146,29 @@ class CameraService:
             self.capture.release()
         
         time.sleep(1.0)
-        self.capture = cv2.VideoCapture(self.src + cv2.CAP_DSHOW)
-        if not self.capture.isOpened():
-            self.capture = cv2.VideoCapture(self.src)
-        
+        self.capture = self._open_capture()
         return self.capture.isOpened()
 
     def _capture_loop(self):
-        # We use a separate state to track the latest detections
-        self.current_detections = []
-        self.current_status = "SAFE"
-        self.detection_in_progress = False
         consecutive_failures = 0
 
         while self.is_running:
+            slot = self.frames.acquire_write()
             try:
-                ret, frame = self.capture.read()
+                # Decode straight into the reserved slot (OpenCV reuses the buffer
+                # when shape and type match, so steady state allocates nothing)
+                try:
+                    with observe_stage(self.detection_key, "capture_read"):
+                        if slot.array is not None:
+                            ret, frame = self.capture.read(slot.array)
+                        else:
+                            ret, frame = self.capture.read()
+                except Exception:
+                    # A slot that is never committed must be handed back to the ring
+                    self.frames.abort(slot)
+                    raise
                 if not ret:
+                    self.frames.abort(slot)
                     consecutive_failures += 1
                     logger.warning(f"Failed to read frame (fail {consecutive_failures})")
                     
@@ -112,54 +181,97 @@ class CameraService:
                         time.sleep(0.1)
                     continue
                 
+                frame_ref = self.frames.commit(slot, frame)
                 consecutive_failures = 0
-                # We start a detection only if one isn't already running
-                # This ensures the stream stays at 30 FPS even if detection is slow
-                if not self.detection_in_progress:
-                    self.detection_in_progress = True
-                    threading.Thread(target=self._run_detection, args=(frame.copy(),), daemon=True).start()
-
-                # --- DRAWING LOGIC ---
-                # Draw the LATEST KNOWN detections on the FRESH frame
-                display_frame = self._draw_overlays(frame.copy())
-                
-                # --- ALERT LOGIC ---
-                if self.is_armed and self.current_status == "CRITICAL":
-                    current_time = time.time()
-                    if current_time - self.last_alert_time > self.alert_cooldown:
-                        self.last_alert_time = current_time
-                        logger.warning(f"!!! SECURITY ALERT !!! - Status is {self.current_status}")
-                        self._handle_alert(display_frame, self.current_detections)
-                    else:
-                        # logger.debug(f"Alert cooled down. Remaining: {int(self.alert_cooldown - (current_time - self.last_alert_time))}s")
-                        pass
-                elif self.current_status == "CRITICAL":
-                    # logger.debug("System CRITICAL but DISARMED")
-                    pass
-                
-                # Update frame queue (Non-blocking)
-                if not self.frame_queue.empty():
-                    try: self.frame_queue.get_nowait()
-                    except queue.Empty: pass
-                self.frame_queue.put(display_frame)
+                FRAMES_CAPTURED.labels(self.detection_key).inc()
+                self._capture_rate.tick()
+                try:
+                    self._process_captured(frame_ref)
+                finally:
+                    frame_ref.release()
 
             except Exception as e:
                 logger.error(f"Error in capture loop: {e}")
                 time.sleep(1)
 
-    def _run_detection(self, frame):
+    def _process_captured(self, frame_ref):
+        """Detection hand-off, overlays, alerting and publishing for one frame."""
+        frame = frame_ref.array
+        
+        # Detection runs on the shared worker pool; if it is still busy
+        # with this camera the pending frame is replaced (latest frame wins),
+        # so the stream stays at 30 FPS even if detection is slow
+        shared_with_detection = False
+        if self.detection_enabled and self._wants_detection(frame):
+            self._frame_seq += 1
+            detection_workers.submit(
+                self.detection_key, self._frame_seq, frame_ref.share(),
+                partial(self._on_detection, frame_ts=frame_ref.timestamp)
+            )
+            shared_with_detection = True
+
+        # --- DRAWING LOGIC ---
+        # Draw the LATEST KNOWN detections on the FRESH frame. When nobody else
+        # holds the raw frame we annotate it in place; otherwise the overlay goes
+        # into a second ring slot so detection keeps seeing clean pixels.
+        if shared_with_detection:
+            display_slot = self.frames.acquire_write()
+            if display_slot.array is not None and display_slot.array.shape == frame.shape:
+                np.copyto(display_slot.array, frame)
+                display_array = display_slot.array
+            else:
+                display_array = frame.copy()
+            display_ref = self.frames.commit(display_slot, display_array)
+        else:
+            display_ref = frame_ref.share()
+        
         try:
-            logger.debug("Starting detection pass...")
-            # We don't need the processed_frame here because we draw ourselves
-            _, detections, status = detection_service.process_frame(frame)
-            if detections:
-                logger.info(f"Detection Success: Found {len(detections)} people. Status: {status}")
-            self.current_detections = detections
-            self.current_status = status
-        except Exception as e:
-            logger.error(f"Detection Error: {e}")
+            with observe_stage(self.detection_key, "overlay"):
+                display_frame = self._draw_overlays(display_ref.array)
+            
+            # --- ALERT LOGIC ---
+            _, detections, status = self._detection_result
+            if self.is_armed and status == "CRITICAL":
+                current_time = time.time()
+                if current_time - self.last_alert_time > self.alert_cooldown:
+                    intruder_ids = self._intruders_to_alert(detections)
+                    if intruder_ids is None:
+                        logger.debug("Alert suppressed: intruder(s) already notified recently")
+                    else:
+                        self.last_alert_time = current_time
+                        logger.warning(f"!!! SECURITY ALERT !!! - Status is {status}")
+                        self._handle_alert(display_frame, detections, intruder_ids)
+                else:
+                    # logger.debug(f"Alert cooled down. Remaining: {int(self.alert_cooldown - (current_time - self.last_alert_time))}s")
+                    pass
+            elif status == "CRITICAL":
+                # logger.debug("System CRITICAL but DISARMED")
+                pass
+            
+            # Hand the annotated frame to streaming consumers (by reference)
+            self.frames.publish(display_ref)
         finally:
-            self.detection_in_progress = False
+            display_ref.release()
+
+    def _wants_detection(self, frame) -> bool:
+        """Motion gate: skip YOLO on static scenes unless people are being tracked."""
+        if self.motion_gate is None:
+            return True
+        return self.motion_gate.should_process(frame, force=self.current_status != "SAFE")
+
+    def _on_detection(self, seq, output, frame_ts: float = 0.0):
+        """Result handoff from the detection pool (runs on a worker or batcher thread)."""
+        _, detections, status = output
+        FRAMES_DETECTED.labels(self.detection_key).inc()
+        self._detection_rate.tick()
+        with self._result_lock:
+            if seq <= self._detection_result[0]:
+                # A newer frame's result has already been applied
+                return
+            self._detection_result = (seq, detections, status)
+        live_state.publish(self.detection_key, detections, status, frame_ts or time.time())
+        if detections:
+            logger.info(f"Detection Success: Found {len(detections)} people. Status: {status}")
 
     def _draw_overlays(self, frame):
         """Draws current detections and ROI on a frame."""
@@ -175,6 +287,7 @@ class CameraService:
             x1, y1, x2, y2 = det["bbox"]
             color = (0, 0, 255) if det["status"] == "CRITICAL" else (0, 255, 255)
             if det["status"] == "AUTHORIZED": color = (0, 255, 0)
+            elif det["status"] == "IDENTIFYING": color = (0, 165, 255)
             
             cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
             label = f"{det['status']} {det['name'] if det['name'] != 'Unknown' else ''}".strip()
@@ -182,7 +295,22 @@ class CameraService:
             
         return frame
 
-    def _handle_alert(self, frame, detections):
+    def _intruders_to_alert(self, detections) -> Optional[list]:
+        """Intruder IDs for a new alert, or None if it would only repeat recent ones.
+
+        Every intruder is notified at most once per INTRUDER_ALERT_SUPPRESS
+        seconds, whichever camera sees them, so only the IDs claimed now are
+        returned. Intruders whose face has not been seen yet carry no ID and
+        always alert.
+        """
+        critical = [d for d in detections if d.get("status") == "CRITICAL"]
+        intruder_ids = {d["intruder_id"] for d in critical if d.get("intruder_id")}
+        fresh = intruder_memory.claim_alerts(intruder_ids)
+        if critical and not fresh and all(d.get("intruder_id") for d in critical):
+            return None
+        return sorted(fresh)
+
+    def _handle_alert(self, frame, detections, intruder_ids=None):
         """Saves alert image, saves to DB, and sends notifications."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"alert_{timestamp}.jpg"
@@ -196,16 +324,29 @@ class CameraService:
         cv2.imwrite(filepath, frame)
         
         alert_msg = "Intruder detected in restricted area!"
+        if intruder_ids:
+            alert_msg += f" Intruder ID: {', '.join(intruder_ids)}"
         time_str = datetime.now().strftime('%H:%M:%S')
         
+        # Closest gallery distance among the alerted intruders whose face could be encoded
+        distances = [
+            d["face_distance"] for d in detections
+            if d.get("status") == "CRITICAL" and d.get("face_distance") is not None
+            and (intruder_ids is None or d.get("intruder_id") in (None, *intruder_ids))
+        ]
+        face_confidence = match_confidence(min(distances)) if distances else None
+        
         # Alert data for broadcasting
         alert_data = {
             "id": f"alert_{int(time.time()*1000)}",
+            "camera_id": self.camera_id,
             "title": "Security Breach",
             "description": alert_msg,
             "severity": "high",
             "created_at": datetime.now().isoformat(),
             "image_path": f"/captures/{filename}",
+            "face_match_confidence": face_confidence,
+            "intruder_ids": intruder_ids or [],
             "is_read": False
         }
 
@@ -245,7 +386,10 @@ class CameraService:
         try:
             # Try to find a default user and camera
             user = db.query(User).first()
-            camera = db.query(Camera).filter(Camera.source_index == self.src).first()
+            if self.camera_id:
+                camera = db.query(Camera).filter(Camera.id == self.camera_id).first()
+            else:
+                camera = db.query(Camera).filter(Camera.source_index == self.src).first()
             
             if not user or not camera:
                 logger.warning("DB: Missing User or Camera record for alert. Alert saved with dummy IDs.")
@@ -263,7 +407,9 @@ class CameraService:
                 title=alert_data["title"],
                 description=alert_data["description"],
                 image_path=alert_data["image_path"],
-                detected_objects=json.dumps(alert_data.get("detections", []))
+                face_match_confidence=alert_data.get("face_match_confidence"),
+                detected_objects=json.dumps(alert_data.get("detections", [])),
+                meta_data=json.dumps({"intruder_ids": alert_data.get("intruder_ids", [])})
             )
             db.add(new_alert)
             db.commit()
@@ -277,20 +423,34 @@ class CameraService:
             db.close()
 
     def get_frame(self):
-        try:
-            return self.frame_queue.get(timeout=0.5)
-        except queue.Empty:
-            return None
+        """Returns a reference to the next annotated frame (caller must release it).
+
+        Blocks for up to 0.5 s; use ``get_jpeg_frame`` from async code.
+        """
+        frame_ref = self.frames.latest(after_generation=self._last_served_generation, timeout=0.5)
+        if frame_ref is not None:
+            self._last_served_generation = frame_ref.generation
+        return frame_ref
+
+    async def get_jpeg_frame(self, timeout: float = 0.5):
+        """Awaits the next annotated frame and JPEG-encodes it in the default executor.
 
-    async def get_jpeg_frame(self):
-        frame = self.get_frame()
-        if frame is None:
+        Neither the wait nor the encode runs on the event loop thread.
+        """
+        frame_ref = await self.frames.latest_async(after_generation=self._last_served_generation, timeout=timeout)
+        if frame_ref is None:
             return None
-            
-        ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
+        self._last_served_generation = frame_ref.generation
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._encode_jpeg, frame_ref)
+
+    def _encode_jpeg(self, frame_ref):
+        with frame_ref, observe_stage(self.detection_key, "jpeg_encode"):
+            ret, buffer = cv2.imencode('.jpg', frame_ref.array, [cv2.IMWRITE_JPEG_QUALITY, settings.STREAM_JPEG_QUALITY])
         if not ret:
             return None
         return buffer.tobytes()
 
-# Global instance
-camera_service = CameraService()
+# Default local camera (used by /ws/stream when no camera id is given)
+camera_service = CameraService(src=settings.CAMERA_INDEX)
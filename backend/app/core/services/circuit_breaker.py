@@ -0,0 +1,81 @@
+import threading
+import time
+from typing import Optional
+from loguru import logger
+
+from app.core.config import settings
+
+
+class CircuitBreaker:
+    """Fail-fast guard for a remote dependency.
+
+    - closed: calls go through; ``failure_threshold`` consecutive failures
+      open the circuit.
+    - open: calls are refused without touching the dependency until
+      ``reset_timeout`` seconds have passed.
+    - half-open: a single probe call is let through; success closes the
+      circuit, failure opens it for another ``reset_timeout``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str = "redis", failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None):
+        self.name = name  # Used in log messages
+        self.failure_threshold = failure_threshold or settings.REDIS_BREAKER_THRESHOLD
+        self.reset_timeout = settings.REDIS_BREAKER_COOLDOWN if reset_timeout is None else reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go to the dependency now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probing = False
+            # Half-open: exactly one probe in flight
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"{self.name}: connection restored, circuit closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def release(self) -> None:
+        """Ends a half-open probe that gave no verdict, so another call may probe."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(
+                        f"{self.name}: {self._failures} consecutive failures, "
+                        f"failing fast for {self.reset_timeout:.0f}s"
+                    )
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
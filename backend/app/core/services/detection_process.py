@@ -0,0 +1,235 @@
+import threading
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+import numpy as np
+from loguru import logger
+
+from app.core.config import settings
+
+# Seconds a process may take to load its model before it is considered stuck
+_STARTUP_TIMEOUT = 120.0
+
+
+def _detection_worker_main(conn, shm_name: str):
+    """Entry point of a detection process: owns its own DetectionService."""
+    # Imported here so the parent never pays for a second model load
+    from app.core.services.detection_service import DetectionService
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    service = DetectionService()
+    try:
+        service.load_model()
+        conn.send(("ready",))
+    except Exception as e:
+        conn.send(("error", str(e)))
+        return
+
+    frame = None
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            if message[0] == "reset":
+                service.reset_camera(message[1])
+                continue
+
+            _, camera_id, shape, dtype = message
+            try:
+                # Zero-copy view of the frame the parent wrote into shared memory
+                frame = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+                _, detections, status = service.process_frame(frame, camera_id=camera_id)
+                conn.send(("ok", detections, status))
+            except Exception as e:
+                conn.send(("error", str(e)))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        # The view must go before the mapping can be closed
+        frame = None
+        shm.close()
+
+
+class _DetectionProcess:
+    """Parent-side handle: process, control pipe and its shared frame buffer.
+
+    All I/O on ``conn`` (including the startup handshake) happens under ``lock``.
+    """
+
+    def __init__(self, index: int, shm_bytes: int, ctx):
+        self.index = index
+        self.lock = threading.Lock()
+        self.shm = shared_memory.SharedMemory(create=True, size=shm_bytes)
+        parent_conn, child_conn = ctx.Pipe()
+        self.conn = parent_conn
+        self.process = ctx.Process(
+            target=_detection_worker_main,
+            args=(child_conn, self.shm.name),
+            name=f"detection-process-{index}",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.started_at = time.monotonic()
+        self.ready = False
+        self.failed = False  # Died, reported an error or never became ready: needs a restart
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Waits for the startup reply. Caller holds ``lock``."""
+        if self.ready or self.failed:
+            return self.ready
+        try:
+            if self.conn.poll(timeout):
+                reply = self.conn.recv()
+                self.ready = reply[0] == "ready"
+                if not self.ready:
+                    self.failed = True
+                    logger.error(f"Detection process {self.index} failed to load: {reply[1]}")
+            elif not self.process.is_alive() or time.monotonic() - self.started_at > _STARTUP_TIMEOUT:
+                self.failed = True
+                logger.error(f"Detection process {self.index} did not become ready")
+        except (EOFError, OSError):
+            self.failed = True
+            logger.error(f"Detection process {self.index} exited during startup")
+        return self.ready
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+        self.shm.close()
+        self.shm.unlink()
+
+
+class ProcessDetectionBackend:
+    """Runs DetectionService in separate worker processes to escape the GIL.
+
+    Frames are written into a per-process shared-memory buffer (one memcpy,
+    no pickling) and only the small detection list comes back over a pipe.
+    Each camera is pinned to one process so its tracker state stays in one
+    place. Every process loads its own copy of the model.
+    """
+
+    def __init__(self, num_processes: Optional[int] = None, shm_mb: Optional[int] = None):
+        self.num_processes = max(1, num_processes or settings.DETECTION_PROCESSES)
+        self.shm_bytes = (shm_mb or settings.DETECTION_SHM_FRAME_MB) * 1024 * 1024
+        self.timeout = settings.DETECTION_PROCESS_TIMEOUT
+
+        self._ctx = mp.get_context("spawn")
+        self._processes: List[_DetectionProcess] = []
+        self._routes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def load_model(self):
+        """Starts the worker processes (each loads the model once)."""
+        with self._lock:
+            if self._processes:
+                return
+            self._processes = [_DetectionProcess(i, self.shm_bytes, self._ctx) for i in range(self.num_processes)]
+            processes = list(self._processes)
+        for worker in processes:
+            with worker.lock:
+                worker.wait_ready(timeout=_STARTUP_TIMEOUT)
+        ready = sum(1 for w in processes if w.ready)
+        logger.success(f"--- {ready}/{self.num_processes} DETECTION PROCESSES READY ---")
+
+    def _route(self, camera_id: str) -> _DetectionProcess:
+        with self._lock:
+            index = self._routes.get(camera_id)
+            if index is None:
+                # Pin new cameras to the least loaded process
+                load = [0] * len(self._processes)
+                for assigned in self._routes.values():
+                    load[assigned] += 1
+                index = load.index(min(load))
+                self._routes[camera_id] = index
+            return self._processes[index]
+
+    def _acquire(self, camera_id: str) -> _DetectionProcess:
+        """Routes ``camera_id`` and locks its process, skipping one replaced while we waited."""
+        while True:
+            worker = self._route(camera_id)
+            if not worker.lock.acquire(timeout=self.timeout):
+                raise TimeoutError(f"Detection process {worker.index} is busy")
+            if self._route(camera_id) is worker:
+                return worker
+            worker.lock.release()
+
+    def _restart(self, worker: _DetectionProcess):
+        """Replaces a broken process. Caller holds ``worker.lock``.
+
+        The replacement is not waited for here: whoever locks it next
+        receives its ready message.
+        """
+        with self._lock:
+            if worker not in self._processes:
+                # Already replaced, or the backend is stopping
+                return
+            logger.warning(f"Restarting detection process {worker.index}")
+            self._processes[worker.index] = _DetectionProcess(worker.index, self.shm_bytes, self._ctx)
+        worker.close()
+
+    def infer(self, camera_id: str, frame: np.ndarray):
+        if not self._processes:
+            self.load_model()
+
+        worker = self._acquire(camera_id)
+        try:
+            if frame.nbytes > worker.shm.size:
+                raise ValueError(f"Frame of {frame.nbytes} bytes exceeds DETECTION_SHM_FRAME_MB")
+            if not worker.wait_ready(timeout=self.timeout):
+                if worker.failed:
+                    self._restart(worker)
+                raise RuntimeError(f"Detection process {worker.index} is not ready")
+            shared = np.ndarray(frame.shape, dtype=frame.dtype, buffer=worker.shm.buf)
+            shared[...] = frame
+            try:
+                worker.conn.send(("frame", camera_id, frame.shape, frame.dtype.str))
+                if not worker.conn.poll(self.timeout):
+                    raise TimeoutError(f"Detection process {worker.index} timed out")
+                reply = worker.conn.recv()
+            except (EOFError, BrokenPipeError, OSError, TimeoutError):
+                self._restart(worker)
+                raise
+        finally:
+            worker.lock.release()
+
+        if reply[0] != "ok":
+            raise RuntimeError(reply[1])
+        return frame, reply[1], reply[2]
+
+    def reset_camera(self, camera_id: str):
+        with self._lock:
+            index = self._routes.pop(camera_id, None)
+            if index is None or index >= len(self._processes):
+                return
+            worker = self._processes[index]
+        with worker.lock:
+            try:
+                worker.conn.send(("reset", camera_id))
+            except (BrokenPipeError, OSError):
+                pass
+
+    def stop(self):
+        with self._lock:
+            processes, self._processes = self._processes, []
+            self._routes.clear()
+        for worker in processes:
+            # Don't wait out a model load; a caller still using the pipe just sees it close
+            locked = worker.lock.acquire(timeout=self.timeout)
+            try:
+                worker.close()
+            finally:
+                if locked:
+                    worker.lock.release()
+
+
+# Global instance (processes are only spawned when DETECTION_BACKEND="process")
+process_detection_backend = ProcessDetectionBackend()
@@ -1,10 +1,12 @@
 import cv2
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import os
+import time
 from loguru import logger
 from datetime import datetime
-from typing import List, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any
 
 # ===== PYTORCH 2.6 COMPATIBILITY PATCH =====
 import torch
@@ -42,7 +44,17 @@ torch.load = patched_torch_load
 # ===== END PATCH =====
 
 from ultralytics import YOLO
+from ultralytics.trackers.byte_tracker import BYTETracker
+from ultralytics.utils import IterableSimpleNamespace, yaml_load
+from ultralytics.utils.checks import check_yaml
 from app.core.config import settings
+from app.core.metrics import STAGE_DURATION
+from app.core.services.face_crop import FaceCropper
+from app.core.services.face_gallery import NO_MATCH, FaceGallery, reported_distance
+from app.core.services.face_store import FaceEncodingStore, name_from_filename
+from app.core.services.face_worker import FaceIdentifyWorker
+from app.core.services.intruder_memory import intruder_memory
+from app.core.services.track_identity import TrackIdentityStore
 
 try:
     import face_recognition
@@ -53,6 +65,16 @@ except ImportError:
     print("DEBUG: Face Recognition Library is MISSING")
 
 
+class CameraDetectionState:
+    """Tracking and identity state for one camera sharing the detector."""
+
+    def __init__(self, camera_id: str):
+        self.camera_id = camera_id
+        self.tracker = None
+        self.identities = TrackIdentityStore()  # Bounded, voted track ID -> identity
+        self.frame_count = 0
+
+
 class DetectionService:
     def __init__(self, model_name="yolov8n.pt"):
         self.model = None
@@ -62,15 +84,28 @@ class DetectionService:
         self.is_ready = False
         self.confidence_threshold = settings.CONFIDENCE_THRESHOLD
         self._load_lock = threading.Lock()
+        # The YOLO predictor is not thread-safe, cameras take turns on it
+        self._inference_lock = threading.Lock()
         
-        # Face Recognition
-        self.known_face_encodings = []
-        self.known_face_names = []
+        # Face Recognition (the gallery is replaced wholesale on reload, never mutated)
+        self.gallery = FaceGallery()
+        self.face_store = FaceEncodingStore()
+        self.face_cropper = FaceCropper()
+        # Face location + encoding for everyone in a batch runs here in parallel
+        self._face_pool = ThreadPoolExecutor(
+            max_workers=settings.FACE_ENCODE_WORKERS or os.cpu_count() or 1,
+            thread_name_prefix="face-encode"
+        )
+        # Asynchronous face stage: detection never waits for recognition
+        self.face_worker = FaceIdentifyWorker(self) if settings.FACE_ASYNC else None
+        self._faces_lock = threading.Lock()
+        self._face_watcher = None
+        self._face_watch_stop = threading.Event()
         
-        # Track identities
-        self.identity_map = {} # {track_id: {'name': str, 'last_checked': int}}
-        self.frame_count = 0
-        self.face_check_interval = 10
+        # Per-camera tracker and identity state (the model itself is shared)
+        self.camera_states: Dict[str, CameraDetectionState] = {}
+        self._states_lock = threading.Lock()
+        self._tracker_cfg = None
         
         # ROI from settings (normalized)
         self.roi_points = [
@@ -89,7 +124,9 @@ class DetectionService:
             try:
                 logger.info(f"Checking for model at: {self.model_path}")
                 self.model = YOLO(self.model_path)
+                self._tracker_cfg = IterableSimpleNamespace(**yaml_load(check_yaml("bytetrack.yaml")))
                 self._load_known_faces()
+                self.start_face_watcher()
                 self.is_ready = True
                 logger.success("--- YOLO DETECTION SERVICE IS NOW READY ---")
             except Exception as e:
@@ -107,144 +144,384 @@ class DetectionService:
             return
 
         logger.info(f"Loading known faces from {known_faces_path}...")
-        for filename in os.listdir(known_faces_path):
-            if filename.lower().endswith(('.jpg', '.jpeg', '.png')):
-                filepath = os.path.join(known_faces_path, filename)
-                try:
-                    img = cv2.imread(filepath)
-                    if img is None: continue
-                    rgb_img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                    rgb_img = np.array(rgb_img, dtype=np.uint8)
-                    encodings = face_recognition.face_encodings(rgb_img)
-                    
-                    if encodings:
-                        self.known_face_encodings.append(encodings[0])
-                        name = os.path.splitext(filename)[0].split('_')[0]
-                        self.known_face_names.append(name)
-                        logger.debug(f"Loaded face: {name}")
-                except Exception as e:
-                    logger.error(f"Error loading face {filename}: {e}")
+        self.reload_known_faces()
+
+    def reload_known_faces(self):
+        """Re-syncs the gallery with KNOWN_FACES_DIR.
+
+        Only images that are new or changed get encoded. The new gallery is
+        built off to the side and swapped in with a single assignment, so a
+        frame being matched sees either the old or the new gallery in full.
+        """
+        with self._faces_lock:
+            before = self.face_store.entries
+            encodings, filenames = self.face_store.sync(self._encode_known_face)
+            after = self.face_store.entries
+            self.gallery = FaceGallery(encodings, [name_from_filename(f) for f in filenames])
+
+        changed = {
+            f for f in set(before) | set(after)
+            if before.get(f, {}).get("sha1") != after.get(f, {}).get("sha1")
+        }
+        if before and changed:
+            # People whose photos changed may now match differently, and
+            # anyone cached as Unknown may be one of the new faces
+            self._invalidate_identities({name_from_filename(f) for f in changed} | {"Unknown"})
+            logger.info(f"Known faces reloaded: {len(changed)} file(s) changed")
+        logger.info(f"Face gallery ready with {len(self.gallery)} encodings")
+
+    def _invalidate_identities(self, names):
+        with self._states_lock:
+            states = list(self.camera_states.values())
+        for state in states:
+            state.identities.invalidate(names)
+
+    def start_face_watcher(self):
+        """Polls KNOWN_FACES_DIR in the background and reloads on change."""
+        if not FACE_REC_AVAILABLE or settings.KNOWN_FACES_RELOAD_INTERVAL <= 0 or self._face_watcher:
+            return
+        self._face_watch_stop.clear()
+        self._face_watcher = threading.Thread(target=self._watch_known_faces, name="known-faces-watcher", daemon=True)
+        self._face_watcher.start()
+
+    def stop_face_watcher(self):
+        self._face_watch_stop.set()
+        if self._face_watcher:
+            self._face_watcher.join(timeout=2)
+            self._face_watcher = None
+
+    def stop_workers(self):
+        """Stops the background face threads (known-faces watcher and face stage)."""
+        self.stop_face_watcher()
+        if self.face_worker is not None:
+            self.face_worker.stop()
+
+    def _watch_known_faces(self):
+        snapshot = self.face_store.snapshot()
+        while not self._face_watch_stop.wait(settings.KNOWN_FACES_RELOAD_INTERVAL):
+            try:
+                current = self.face_store.snapshot()
+                if current == snapshot:
+                    continue
+                # Taken before the sync, so edits made during it are picked up next round
+                snapshot = current
+                self.reload_known_faces()
+            except Exception as e:
+                logger.error(f"Known faces reload failed: {e}")
+
+    @staticmethod
+    def _encode_known_face(filepath: str) -> Optional[np.ndarray]:
+        img = cv2.imread(filepath)
+        if img is None:
+            raise ValueError("unreadable image")
+        rgb_img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        rgb_img = np.array(rgb_img, dtype=np.uint8)
+        face_encodings = face_recognition.face_encodings(rgb_img)
+        if not face_encodings:
+            logger.warning(f"No face found in {os.path.basename(filepath)}")
+            return None
+        logger.debug(f"Encoded face: {os.path.basename(filepath)}")
+        return face_encodings[0]
+
+    def get_camera_state(self, camera_id: str) -> CameraDetectionState:
+        with self._states_lock:
+            state = self.camera_states.get(camera_id)
+            if state is None:
+                state = CameraDetectionState(camera_id)
+                self.camera_states[camera_id] = state
+            return state
+
+    def reset_camera(self, camera_id: str):
+        """Drops tracker and identity state, e.g. when a pipeline is stopped."""
+        with self._states_lock:
+            self.camera_states.pop(camera_id, None)
+
+    def _track(self, state: CameraDetectionState, result):
+        """Runs the camera's own BYTETracker over a prediction result.
+
+        Mirrors what ``model.track(persist=True)`` does internally, but keeps
+        one tracker per camera so IDs never leak between streams.
+        """
+        if state.tracker is None:
+            state.tracker = BYTETracker(args=self._tracker_cfg, frame_rate=30)
+
+        det = result.boxes.cpu().numpy()
+        if len(det) == 0:
+            return result
+        tracks = state.tracker.update(det, result.orig_img)
+        if len(tracks) == 0:
+            return result
+        idx = tracks[:, -1].astype(int)
+        result = result[idx]
+        result.update(boxes=torch.as_tensor(tracks[:, :-1]))
+        return result
 
     def identify_face(self, frame, bbox):
-        if not FACE_REC_AVAILABLE or not self.known_face_encodings:
-            return "Unknown"
-        
-        x1, y1, x2, y2 = bbox
+        return self.match_face(frame, bbox)[0]
+
+    def match_face(self, frame, bbox) -> Tuple[str, Optional[float]]:
+        """Closest known identity for the face in person box ``bbox`` and its encoding distance.
+
+        The distance is None when no face could be found or encoded, and
+        ``NO_MATCH`` when the gallery is empty.
+        """
+        return self.match_faces([(frame, bbox)])[0]
+
+    def match_faces(self, items: List[Tuple[np.ndarray, Any]]) -> List[Tuple[str, Optional[float]]]:
+        """Identifies several ``(frame, person_bbox)`` at once.
+
+        Faces are located and encoded in parallel on the face pool, then
+        matched against the gallery in a single vectorised call.
+        """
+        return self._match_people(items, intruders=False)[0]
+
+    def identify_people(self, items: List[Tuple[np.ndarray, Any]], camera_ids: List[str]) -> List[Tuple[str, Optional[float], Optional[str], bool]]:
+        """``match_faces`` plus the intruder memory for faces nobody knows.
+
+        Returns ``(name, distance, intruder_id, known_intruder)`` per item;
+        ``known_intruder`` is True once the intruder has been seen at least
+        FACE_VOTE_MIN times, so the track can stop re-checking.
+        """
+        identities, encodings = self._match_people(items, intruders=intruder_memory.enabled)
+        people = []
+        for (name, distance), encoding, camera_id in zip(identities, encodings, camera_ids):
+            intruder_id, sightings = None, 0
+            if name == "Unknown" and encoding is not None and intruder_memory.enabled:
+                intruder_id, sightings = intruder_memory.match_or_add(encoding, camera_id)
+            people.append((name, distance, intruder_id, sightings >= settings.FACE_VOTE_MIN))
+        return people
+
+    def _match_people(self, items, intruders: bool):
+        """Encodes and matches ``items``; returns the identities and the encodings found.
+
+        With ``intruders`` set faces are encoded even for an empty gallery,
+        so unknown people still get an intruder ID.
+        """
+        gallery = self.gallery  # One consistent gallery even if a reload swaps it meanwhile
+        identities: List[Tuple[str, Optional[float]]] = [("Unknown", None)] * len(items)
+        encodings: List[Optional[np.ndarray]] = [None] * len(items)
+        if not FACE_REC_AVAILABLE or not items:
+            return identities, encodings
+        if not len(gallery) and not intruders:
+            # Nobody to recognise: everyone is Unknown, no need to find their face
+            return [("Unknown", NO_MATCH)] * len(items), encodings
+
+        if len(items) == 1:
+            encodings = [self._encode_person(*items[0])]
+        else:
+            encodings = list(self._face_pool.map(lambda item: self._encode_person(*item), items))
+
+        found = [k for k, encoding in enumerate(encodings) if encoding is not None]
+        if found:
+            matches = gallery.match_many(np.stack([encodings[k] for k in found]))
+            for k, match in zip(found, matches):
+                identities[k] = match
+        return identities, encodings
+
+    def _encode_person(self, frame, bbox) -> Optional[np.ndarray]:
         try:
-            face_img = frame[y1:y2, x1:x2]
-            if face_img.size == 0: return "Unknown"
-            
-            rgb_face = cv2.cvtColor(face_img, cv2.COLOR_BGR2RGB)
-            rgb_face = np.array(rgb_face, dtype=np.uint8)
-            face_encodings = face_recognition.face_encodings(rgb_face)
-            
-            if not face_encodings:
-                return "Unknown"
-            
-            matches = face_recognition.compare_faces(self.known_face_encodings, face_encodings[0], tolerance=0.5)
-            if True in matches:
-                return self.known_face_names[matches.index(True)]
-            return "Unknown"
+            located = self.face_cropper.locate(frame, bbox)
+            if located is None:
+                return None
+            rgb_crop, location = located
+            face_encodings = face_recognition.face_encodings(rgb_crop, known_face_locations=[location])
+            return face_encodings[0] if face_encodings else None
         except Exception:
-            return "Unknown"
+            return None
+
+    def process_frame(self, frame: np.ndarray, camera_id: str = "default") -> Tuple[np.ndarray, List[Dict], str]:
+        return self.process_batch([frame], [camera_id])[0]
+
+    def process_batch(self, frames: List[np.ndarray], camera_ids: List[str]) -> List[Tuple[np.ndarray, List[Dict], str]]:
+        """Runs one YOLO forward pass over frames from several cameras.
 
-    def process_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, List[Dict], str]:
+        Each result is tracked with its own camera's tracker and returned in
+        the same order as ``frames``.
+        """
         if not self.is_ready:
             logger.info("DetectionService: Model not loaded, attempting auto-load...")
             try:
                 self.load_model()
             except Exception:
-                return frame, [], "SAFE"
+                return [(frame, [], "SAFE") for frame in frames]
 
-        if frame is None:
-            return None, [], "SAFE"
+        outputs: List[Tuple[np.ndarray, List[Dict], str]] = [(None, [], "SAFE")] * len(frames)
+        valid = [i for i, frame in enumerate(frames) if frame is not None]
+        if not valid:
+            return outputs
 
-        self.frame_count += 1
-        # logger.debug(f"Processing frame {self.frame_count}")
-        
         # Optimization: Use smaller imgsz for faster CPU inference
-        results = self.model.track(
-            frame, 
-            classes=[0], 
-            conf=self.confidence_threshold, 
-            persist=True, 
-            verbose=False,
-            imgsz=480 # Increased from 320 for better quality
-        )
-        
-        height, width = frame.shape[:2]
-        detections = []
-        overall_status = "SAFE"
-        
-        # ROI
-        roi_pixel_cnt = np.array([
+        with self._inference_lock:
+            started = time.perf_counter()
+            results = self.model.predict(
+                [frames[i] for i in valid], 
+                classes=[0], 
+                conf=self.confidence_threshold, 
+                verbose=False,
+                imgsz=480 # Increased from 320 for better quality
+            )
+            inference_seconds = time.perf_counter() - started
+
+        people_by_frame = {}
+        for i, result in zip(valid, results):
+            STAGE_DURATION.labels(camera_ids[i], "inference").observe(inference_seconds)
+            state = self.get_camera_state(camera_ids[i])
+            state.frame_count += 1
+            result = self._track(state, result)
+            people_by_frame[i] = (state, self._collect_people(frames[i], result, state))
+
+        # Everyone in the batch that needs a face check, across all cameras, in one go
+        pending = [
+            (i, state, person)
+            for i, (state, people) in people_by_frame.items()
+            for person in people if person["needs_check"]
+        ]
+        if pending and self.face_worker is not None:
+            # Hand tracked people to the face stage; their identity shows up on a later frame
+            inline = []
+            for i, state, person in pending:
+                track_id = person["track_id"]
+                if track_id == -1:
+                    inline.append((i, state, person))
+                else:
+                    # If the face stage is saturated the track is retried on its next frame
+                    submitted = self.face_worker.submit(state, track_id, frames[i], person["bbox"], state.frame_count)
+                    state.identities.mark_pending(track_id, submitted=submitted)
+            pending = inline
+
+        if pending:
+            started = time.perf_counter()
+            identities = self.identify_people(
+                [(frames[i], person["bbox"]) for i, _, person in pending],
+                [state.camera_id for _, state, _ in pending]
+            )
+            face_seconds = time.perf_counter() - started
+            for (i, state, person), (name, distance, intruder_id, known_intruder) in zip(pending, identities):
+                if person["track_id"] != -1:
+                    # Report the identity voted over all of the track's checks so far
+                    identity = state.identities.record(
+                        person["track_id"], name, distance, state.frame_count, intruder_id, known_intruder
+                    )
+                    name, distance, intruder_id = identity.name, identity.distance, identity.intruder_id
+                person["name"], person["face_distance"] = name, reported_distance(distance)
+                person["intruder_id"] = intruder_id if name == "Unknown" else None
+            for camera_id in {state.camera_id for _, state, _ in pending}:
+                STAGE_DURATION.labels(camera_id, "face_recognition").observe(face_seconds)
+
+        for i, (state, people) in people_by_frame.items():
+            outputs[i] = self._analyze(frames[i], people, state)
+            state.identities.evict(state.frame_count)
+        return outputs
+
+    def _roi_contour(self, width: int, height: int) -> np.ndarray:
+        return np.array([
             (int(x * width), int(y * height)) 
             for x, y in self.roi_points
         ], dtype=np.int32)
+
+    def _collect_people(self, frame: np.ndarray, result, state: CameraDetectionState) -> List[Dict]:
+        """Boxes of one tracked result with ROI membership and any cached identity.
+
+        People inside the ROI whose identity is missing or stale are flagged
+        ``needs_check`` so the batch can run their face checks together.
+        """
+        height, width = frame.shape[:2]
+        roi_pixel_cnt = self._roi_contour(width, height)
+        people = []
+        boxes = result.boxes if result.boxes is not None else []
+        for box in boxes:
+            cls = int(box.cls[0].cpu().numpy())
+            conf = float(box.conf[0].cpu().numpy())
+            logger.debug(f"Found object class {cls} with conf {conf}")
+            x1, y1, x2, y2 = map(int, box.xyxy[0].cpu().numpy())
+            track_id = int(box.id[0].cpu().numpy()) if box.id is not None else -1
+            
+            # ROI Check
+            center = (int((x1 + x2) / 2), int((y1 + y2) / 2))
+            is_inside = cv2.pointPolygonTest(roi_pixel_cnt, center, False) >= 0
+            
+            person = {
+                "bbox": (x1, y1, x2, y2),
+                "conf": conf,
+                "track_id": track_id,
+                "is_inside": is_inside,
+                "name": "Unknown",
+                "face_distance": None,
+                "intruder_id": None,
+                "needs_check": False
+            }
+            identity = state.identities.touch(track_id, state.frame_count) if track_id != -1 else None
+            if is_inside:
+                if identity is not None:
+                    # Best answer so far, even while a fresh check is pending
+                    person["name"] = identity.name
+                    person["face_distance"] = identity.distance
+                    if identity.name == "Unknown":
+                        person["intruder_id"] = identity.intruder_id
+                person["needs_check"] = identity is None or state.identities.needs_check(track_id, state.frame_count)
+            people.append(person)
+        return people
+
+    def _analyze(self, frame: np.ndarray, people: List[Dict], state: CameraDetectionState) -> Tuple[np.ndarray, List[Dict], str]:
+        """Status evaluation for one frame's identified people (plus the face-only fallback)."""
+        height, width = frame.shape[:2]
+        detections = []
+        overall_status = "SAFE"
+        roi_pixel_cnt = self._roi_contour(width, height)
         
-        found_any = False
-        for result in results:
-            if result.boxes is None: continue
-                
-            for box in result.boxes:
-                found_any = True
-                cls = int(box.cls[0].cpu().numpy())
-                conf = float(box.conf[0].cpu().numpy())
-                logger.debug(f"Found object class {cls} with conf {conf}")
-                x1, y1, x2, y2 = map(int, box.xyxy[0].cpu().numpy())
-                track_id = int(box.id[0].cpu().numpy()) if box.id is not None else -1
-                conf = float(box.conf[0].cpu().numpy())
-                
-                # ROI Check
-                center = (int((x1 + x2) / 2), int((y1 + y2) / 2))
-                is_inside = cv2.pointPolygonTest(roi_pixel_cnt, center, False) >= 0
-                
-                name = "Unknown"
-                if is_inside:
-                    if track_id != -1 and track_id in self.identity_map and \
-                       (self.frame_count - self.identity_map[track_id]['last_checked']) <= self.face_check_interval:
-                        name = self.identity_map[track_id]['name']
-                    else:
-                        name = self.identify_face(frame, (x1, y1, x2, y2))
-                        if track_id != -1:
-                            self.identity_map[track_id] = {'name': name, 'last_checked': self.frame_count}
-                
-                # Status
-                status = "WARNING"
-                color = (0, 255, 255)
-                
-                if is_inside:
-                    if name == "Unknown":
-                        status = "CRITICAL"
-                        color = (0, 0, 255)
-                        overall_status = "CRITICAL"
-                    else:
-                        status = "AUTHORIZED"
-                        color = (0, 255, 0)
-                elif overall_status != "CRITICAL":
-                    overall_status = "WARNING"
-
-                detections.append({
-                    "bbox": (x1, y1, x2, y2),
-                    "conf": conf,
-                    "status": status,
-                    "name": name,
-                    "is_inside": is_inside
-                })
-                
-                # Visualization
-                cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
-                label = f"{status} {name if name != 'Unknown' else ''}".strip()
-                cv2.putText(frame, label, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+        found_any = bool(people)
+        for person in people:
+            name, is_inside = person["name"], person["is_inside"]
+            
+            # Status
+            status = "WARNING"
+            
+            if is_inside:
+                if name != "Unknown":
+                    status = "AUTHORIZED"
+                elif person["track_id"] != -1 and state.identities.is_identifying(person["track_id"]):
+                    # Face check still in flight: hold off on the alert, but only briefly
+                    status = "IDENTIFYING"
+                    if overall_status != "CRITICAL":
+                        overall_status = "WARNING"
+                else:
+                    status = "CRITICAL"
+                    overall_status = "CRITICAL"
+            elif overall_status != "CRITICAL":
+                overall_status = "WARNING"
+
+            detections.append({
+                "bbox": person["bbox"],
+                "conf": person["conf"],
+                "status": status,
+                "name": name,
+                "face_distance": person["face_distance"],
+                "intruder_id": person["intruder_id"],
+                "is_inside": is_inside
+            })
+            # No drawing here: the frame may be a shared ring-buffer slot, the
+            # camera pipeline draws overlays on its own display frame
 
         if not found_any and FACE_REC_AVAILABLE:
             # Fallback: If YOLO misses a close-up person, try face detection
             try:
+                face_started = time.perf_counter()
                 rgb_small = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
                 face_locations = face_recognition.face_locations(rgb_small, model="hog")
+                # All faces of the frame encoded at their known locations and matched together
+                gallery = self.gallery
+                identities = [("Unknown", None)] * len(face_locations)
+                encodings = []
+                if face_locations and (len(gallery) or intruder_memory.enabled):
+                    encodings = face_recognition.face_encodings(rgb_small, known_face_locations=face_locations)
+                    if encodings:
+                        identities = gallery.match_many(np.stack(encodings))
                 
-                for top, right, bottom, left in face_locations:
+                for k, ((top, right, bottom, left), (name, face_distance)) in enumerate(zip(face_locations, identities)):
                     found_any = True
+                    intruder_id = None
+                    if name == "Unknown" and k < len(encodings) and intruder_memory.enabled:
+                        intruder_id, _ = intruder_memory.match_or_add(encodings[k], state.camera_id)
                     # Create a pseudo-bbox for the "person" based on face
                     # We expand it a bit downwards to cover shoulders
                     p_x1, p_y1 = max(0, left - 50), max(0, top - 50)
@@ -253,7 +530,6 @@ class DetectionService:
                     center = (int((p_x1 + p_x2) / 2), int((p_y1 + p_y2) / 2))
                     is_inside = cv2.pointPolygonTest(roi_pixel_cnt, center, False) >= 0
                     
-                    name = self.identify_face(frame, (left, top, right, bottom))
                     status = "AUTHORIZED" if name != "Unknown" else ("CRITICAL" if is_inside else "WARNING")
                     if status == "CRITICAL": overall_status = "CRITICAL"
                     elif overall_status != "CRITICAL": overall_status = "WARNING"
@@ -263,8 +539,11 @@ class DetectionService:
                         "conf": 0.9,
                         "status": status,
                         "name": name,
+                        "face_distance": reported_distance(face_distance),
+                        "intruder_id": intruder_id,
                         "is_inside": is_inside
                     })
+                STAGE_DURATION.labels(state.camera_id, "face_recognition").observe(time.perf_counter() - face_started)
             except Exception as e:
                 logger.error(f"Face fallback error: {e}")
 
@@ -0,0 +1,220 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import partial
+from typing import Callable, Dict, Optional
+from loguru import logger
+
+from app.core.config import settings
+from app.core.metrics import FRAMES_DROPPED, STAGE_DURATION
+from app.core.services.frame_buffer import FrameRef
+from app.core.services.inference_batcher import inference_batcher
+
+
+class _DetectionJob:
+    __slots__ = ("camera_key", "seq", "frame_ref", "callback", "submitted_at")
+
+    def __init__(self, camera_key: str, seq: int, frame_ref: FrameRef, callback: Callable):
+        self.camera_key = camera_key
+        self.seq = seq
+        self.frame_ref = frame_ref
+        self.callback = callback
+        self.submitted_at = time.perf_counter()
+
+
+def _default_backend():
+    """Thread mode batches in-process; process mode fans out to worker processes."""
+    if settings.DETECTION_BACKEND == "process":
+        from app.core.services.detection_process import process_detection_backend
+        return process_detection_backend
+    return inference_batcher
+
+
+class DetectionWorkerPool:
+    """Long-lived detection workers fed from a bounded queue.
+
+    Each camera has at most one pending frame and at most one frame in
+    flight. Submitting while a frame is still pending replaces it ("latest
+    frame wins"), so slow detection never builds a backlog. Results are
+    handed back through the submitter's callback together with the frame's
+    sequence number.
+
+    Frames are passed as ring-buffer references; the pool owns the reference
+    it is given and releases it once the frame is processed or dropped.
+
+    Backends with a non-blocking ``submit`` (the in-process batcher) are
+    handed frames without a worker waiting on each one: the job completes
+    in a done-callback, so every camera can have a frame in the batcher at
+    once and ``DETECTION_BATCH_SIZE`` is reachable with only a few workers.
+    Backends with only a blocking ``infer`` hold a worker per frame, so a
+    process backend gets at least one worker per detection process.
+    """
+
+    def __init__(self, num_workers: Optional[int] = None, max_pending: Optional[int] = None, backend=None):
+        self.num_workers = max(1, num_workers or settings.DETECTION_WORKERS)
+        self.max_pending = max(1, max_pending or settings.DETECTION_QUEUE_SIZE)
+        self.backend = backend or _default_backend()
+
+        num_processes = getattr(self.backend, "num_processes", 0)
+        if self.num_workers < num_processes:
+            logger.warning(
+                f"DETECTION_WORKERS={self.num_workers} would leave detection processes idle, "
+                f"using {num_processes} workers (one per DETECTION_PROCESSES)"
+            )
+            self.num_workers = num_processes
+
+        self._pending: "OrderedDict[str, _DetectionJob]" = OrderedDict()
+        self._in_flight = set()
+        self._cond = threading.Condition()
+        self._workers = []
+        self._running = False
+
+        # {camera_key: {'queued': int, 'dropped': int, 'processed': int, 'failed': int}}
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, camera_key: str, counter: str):
+        self.counters.setdefault(camera_key, {"queued": 0, "dropped": 0, "processed": 0, "failed": 0})[counter] += 1
+        if counter == "dropped":
+            FRAMES_DROPPED.labels(camera_key, "detection_queue").inc()
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            for i in range(self.num_workers):
+                worker = threading.Thread(target=self._worker_loop, name=f"detection-worker-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+        logger.info(f"DetectionWorkerPool started with {self.num_workers} workers")
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            for job in self._pending.values():
+                job.frame_ref.release()
+            self._pending.clear()
+            self._cond.notify_all()
+        for worker in self._workers:
+            worker.join(timeout=2)
+        self._workers = []
+        if hasattr(self.backend, "stop"):
+            self.backend.stop()
+
+    def preload(self):
+        """Loads the detection model(s) in the background so the first frame is not delayed."""
+        threading.Thread(target=self.backend.load_model, daemon=True).start()
+
+    def reset_camera(self, camera_key: str):
+        """Forgets a camera: drops its pending frame and its tracker state."""
+        self.cancel(camera_key)
+        self.backend.reset_camera(camera_key)
+
+    def submit(self, camera_key: str, seq: int, frame_ref: FrameRef, callback: Callable):
+        """Queues a frame for detection.
+
+        ``callback(seq, (frame, detections, status))`` is invoked from a worker
+        or batcher thread once the frame has been processed. ``frame`` aliases the ring
+        slot and is only valid inside the callback.
+        """
+        if not self._running:
+            self.start()
+
+        with self._cond:
+            if camera_key in self._pending:
+                # Latest frame wins: the older pending frame is never processed
+                self._count(camera_key, "dropped")
+                self._pending.pop(camera_key).frame_ref.release()
+            self._pending[camera_key] = _DetectionJob(camera_key, seq, frame_ref, callback)
+            self._count(camera_key, "queued")
+
+            while len(self._pending) > self.max_pending:
+                _, oldest = self._pending.popitem(last=False)
+                oldest.frame_ref.release()
+                self._count(oldest.camera_key, "dropped")
+
+            self._cond.notify()
+
+    def cancel(self, camera_key: str):
+        """Drops a camera's pending frame, e.g. when its pipeline stops."""
+        with self._cond:
+            job = self._pending.pop(camera_key, None)
+            if job is not None:
+                job.frame_ref.release()
+                self._count(camera_key, "dropped")
+
+    def is_busy(self, camera_key: str) -> bool:
+        with self._cond:
+            return camera_key in self._in_flight or camera_key in self._pending
+
+    def _next_job(self) -> Optional[_DetectionJob]:
+        # Caller holds self._cond. Frames of one camera are processed in order,
+        # never concurrently, so its tracker sees a consistent sequence.
+        for camera_key in self._pending:
+            if camera_key not in self._in_flight:
+                self._in_flight.add(camera_key)
+                return self._pending.pop(camera_key)
+        return None
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None and self._running:
+                    self._cond.wait(timeout=0.5)
+                    job = self._next_job()
+                if not self._running:
+                    return
+
+            STAGE_DURATION.labels(job.camera_key, "queue_wait").observe(time.perf_counter() - job.submitted_at)
+            self._dispatch(job).add_done_callback(partial(self._complete, job))
+
+    def _dispatch(self, job: _DetectionJob) -> Future:
+        """Hands a job to the backend; blocks only for backends without ``submit``."""
+        submit = getattr(self.backend, "submit", None)
+        if submit is not None:
+            try:
+                return submit(job.camera_key, job.frame_ref.array)
+            except Exception as e:
+                future = Future()
+                future.set_exception(e)
+                return future
+
+        future = Future()
+        try:
+            future.set_result(self.backend.infer(job.camera_key, job.frame_ref.array))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _complete(self, job: _DetectionJob, future: Future):
+        """Finishes a job: result callback, counters, ring slot and in-flight release."""
+        counter = "failed"
+        try:
+            job.callback(job.seq, future.result())
+            counter = "processed"
+        except Exception as e:
+            logger.error(f"Detection worker error on {job.camera_key}: {e}")
+        finally:
+            job.frame_ref.release()
+            with self._cond:
+                self._count(job.camera_key, counter)
+                self._in_flight.discard(job.camera_key)
+                self._cond.notify_all()
+
+    def stats(self, camera_key: Optional[str] = None) -> dict:
+        with self._cond:
+            if camera_key is not None:
+                return dict(self.counters.get(camera_key, {"queued": 0, "dropped": 0, "processed": 0, "failed": 0}))
+            totals = {"queued": 0, "dropped": 0, "processed": 0, "failed": 0}
+            for counts in self.counters.values():
+                for key, value in counts.items():
+                    totals[key] += value
+            totals["pending"] = len(self._pending)
+            totals["in_flight"] = len(self._in_flight)
+            return totals
+
+
+# Global instance
+detection_workers = DetectionWorkerPool()
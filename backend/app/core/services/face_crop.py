@@ -0,0 +1,88 @@
+from typing import Optional, Tuple
+import cv2
+import numpy as np
+
+from app.core.config import settings
+
+try:
+    import face_recognition
+    FACE_REC_AVAILABLE = True
+except ImportError:
+    FACE_REC_AVAILABLE = False
+
+# (top, right, bottom, left), the face_recognition convention
+FaceLocation = Tuple[int, int, int, int]
+
+
+class FaceCropper:
+    """Finds the face inside a person box cheaply, ahead of encoding.
+
+    HOG only runs over the upper ``top_ratio`` of the box, downscaled so the
+    expected face (``face_width_ratio`` of the box width) is about
+    ``target_face_px`` wide, which is comfortably above dlib's ~80 px
+    minimum without upsampling. The location is mapped back to the full
+    resolution crop so the encoder can take it as ``known_face_locations``
+    and skip detection.
+    """
+
+    def __init__(
+        self,
+        top_ratio: Optional[float] = None,
+        face_width_ratio: Optional[float] = None,
+        target_face_px: Optional[int] = None,
+        upsample: Optional[int] = None
+    ):
+        self.top_ratio = settings.FACE_CROP_TOP_RATIO if top_ratio is None else top_ratio
+        self.face_width_ratio = settings.FACE_CROP_FACE_WIDTH_RATIO if face_width_ratio is None else face_width_ratio
+        self.target_face_px = settings.FACE_CROP_TARGET_PX if target_face_px is None else target_face_px
+        self.upsample = settings.FACE_DETECT_UPSAMPLE if upsample is None else upsample
+
+    def search_region(self, bbox, frame_shape) -> Tuple[int, int, int, int]:
+        """Upper part of the person box, clipped to the frame."""
+        height, width = frame_shape[:2]
+        x1, y1, x2, y2 = bbox
+        x1, x2 = max(0, x1), min(width, x2)
+        y1 = max(0, y1)
+        y2 = min(height, y1 + max(1, int((y2 - y1) * self.top_ratio)))
+        return x1, y1, x2, y2
+
+    def scale_for(self, box_width: int) -> float:
+        """Downscale factor bringing the expected face to ``target_face_px`` (never enlarges)."""
+        expected_face = box_width * self.face_width_ratio
+        if expected_face <= 0:
+            return 1.0
+        return min(1.0, self.target_face_px / expected_face)
+
+    def locate(self, frame: np.ndarray, bbox) -> Optional[Tuple[np.ndarray, FaceLocation]]:
+        """Returns ``(rgb_crop, location)`` for the largest face in the box, or None.
+
+        ``location`` is relative to ``rgb_crop``, the full resolution search region.
+        """
+        if not FACE_REC_AVAILABLE:
+            return None
+        x1, y1, x2, y2 = self.search_region(bbox, frame.shape)
+        if x2 <= x1 or y2 <= y1:
+            return None
+        rgb = cv2.cvtColor(frame[y1:y2, x1:x2], cv2.COLOR_BGR2RGB)
+
+        scale = self.scale_for(x2 - x1)
+        small = rgb
+        if scale < 1.0:
+            small = cv2.resize(rgb, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        # Small or distant people: let dlib upsample rather than miss the face
+        upsample = self.upsample
+        if (x2 - x1) * self.face_width_ratio * scale < self.target_face_px * 0.8:
+            upsample = max(upsample, 1)
+
+        locations = face_recognition.face_locations(small, number_of_times_to_upsample=upsample, model="hog")
+        if not locations:
+            return None
+        top, right, bottom, left = max(locations, key=lambda l: (l[2] - l[0]) * (l[1] - l[3]))
+        crop_h, crop_w = rgb.shape[:2]
+        location = (
+            max(0, int(top / scale)),
+            min(crop_w, int(right / scale)),
+            min(crop_h, int(bottom / scale)),
+            max(0, int(left / scale)),
+        )
+        return rgb, location
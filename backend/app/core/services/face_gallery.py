@@ -0,0 +1,119 @@
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+from app.core.config import settings
+from app.core.services.face_index import IVFIndex
+
+# Distance of a face checked against an empty gallery: like any other
+# unrecognised face it votes Unknown, but there is no closest entry to report
+NO_MATCH = float("inf")
+
+
+class FaceGallery:
+    """Known face encodings held as one contiguous float32 matrix.
+
+    Squared norms are precomputed at build time, so matching a probe against
+    the whole gallery is a single matrix-vector product:
+    ``|g - q|^2 = |g|^2 + |q|^2 - 2 g.q``. The distance is the same Euclidean
+    distance ``face_recognition.face_distance`` reports.
+
+    Galleries of at least ``FACE_ANN_MIN_GALLERY`` entries are additionally
+    indexed with an ``IVFIndex`` when ``FACE_ANN_ENABLED`` is set; ``match``
+    then scans only the closest cells instead of every row.
+    """
+
+    def __init__(
+        self,
+        encodings: Sequence[np.ndarray] = (),
+        names: Sequence[str] = (),
+        tolerance: Optional[float] = None,
+        ann: Optional[bool] = None
+    ):
+        self.tolerance = settings.FACE_MATCH_TOLERANCE if tolerance is None else tolerance
+        self.ann = settings.FACE_ANN_ENABLED if ann is None else ann
+        self.index: Optional[IVFIndex] = None
+        self.names: List[str] = []
+        self.matrix = np.empty((0, 128), dtype=np.float32)
+        self._sq_norms = np.empty(0, dtype=np.float32)
+        if len(encodings):
+            self.build(encodings, names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def build(self, encodings: Sequence[np.ndarray], names: Sequence[str]):
+        """Replaces the gallery contents."""
+        if len(encodings) != len(names):
+            raise ValueError("encodings and names must have the same length")
+        if len(encodings):
+            # Always a private copy, so a memory-mapped source can be released
+            matrix = np.array(encodings, dtype=np.float32).reshape(len(encodings), -1)
+        else:
+            matrix = np.empty((0, 128), dtype=np.float32)
+        self.matrix = matrix
+        self._sq_norms = np.einsum("ij,ij->i", matrix, matrix)
+        self.names = list(names)
+
+        self.index = None
+        if self.ann and len(matrix) >= settings.FACE_ANN_MIN_GALLERY:
+            index = IVFIndex(nlist=settings.FACE_ANN_NLIST or None, nprobe=settings.FACE_ANN_NPROBE)
+            index.build(matrix)
+            self.index = index
+
+    def distances(self, encoding: np.ndarray) -> np.ndarray:
+        """Euclidean distance from ``encoding`` to every gallery entry."""
+        probe = np.asarray(encoding, dtype=np.float32)
+        sq = self._sq_norms + np.dot(probe, probe) - 2.0 * (self.matrix @ probe)
+        # Rounding can push near-identical encodings slightly below zero
+        return np.sqrt(np.maximum(sq, 0.0))
+
+    def match(self, encoding: np.ndarray) -> Tuple[str, Optional[float]]:
+        """Closest identity and its distance.
+
+        Returns ``("Unknown", distance)`` when even the closest entry is
+        farther than the tolerance, and ``("Unknown", NO_MATCH)`` for an
+        empty gallery.
+        """
+        if not self.names:
+            return "Unknown", NO_MATCH
+        if self.index is not None:
+            best, distance = self.index.search(encoding)
+        else:
+            distances = self.distances(encoding)
+            best = int(np.argmin(distances))
+            distance = float(distances[best])
+        if distance <= self.tolerance:
+            return self.names[best], distance
+        return "Unknown", distance
+
+    def match_many(self, encodings: np.ndarray) -> List[Tuple[str, Optional[float]]]:
+        """``match`` for a K x 128 block of probes in one matrix product."""
+        if not self.names:
+            return [("Unknown", NO_MATCH)] * len(encodings)
+        probes = np.asarray(encodings, dtype=np.float32).reshape(len(encodings), -1)
+        if self.index is not None:
+            found = [self.index.search(probe) for probe in probes]
+        else:
+            sq = self._sq_norms[None, :] + np.einsum("ij,ij->i", probes, probes)[:, None] - 2.0 * (probes @ self.matrix.T)
+            best = np.argmin(sq, axis=1)
+            distances = np.sqrt(np.maximum(sq[np.arange(len(probes)), best], 0.0))
+            found = zip(best.tolist(), distances.tolist())
+        return [
+            (self.names[row], float(distance)) if distance <= self.tolerance else ("Unknown", float(distance))
+            for row, distance in found
+        ]
+
+
+def reported_distance(distance: Optional[float]) -> Optional[float]:
+    """Distance as shown in detections: None for no face and for ``NO_MATCH``."""
+    if distance is None or distance == NO_MATCH:
+        return None
+    return distance
+
+
+def match_confidence(distance: Optional[float]) -> Optional[float]:
+    """Maps a face distance to a 0..1 confidence (1 = identical encodings)."""
+    distance = reported_distance(distance)
+    if distance is None:
+        return None
+    return round(max(0.0, 1.0 - distance), 4)
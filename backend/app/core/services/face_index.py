@@ -0,0 +1,104 @@
+import math
+from typing import Optional, Tuple
+import numpy as np
+
+
+def _sq_distances(vectors: np.ndarray, vector_sq_norms: np.ndarray, centroids: np.ndarray, centroid_sq_norms: np.ndarray) -> np.ndarray:
+    return vector_sq_norms[:, None] + centroid_sq_norms[None, :] - 2.0 * (vectors @ centroids.T)
+
+
+class IVFIndex:
+    """Inverted-file index over face encodings (coarse k-means quantiser).
+
+    ``build`` clusters the gallery into ``nlist`` cells and stores the
+    vectors grouped by cell. A query is compared against the centroids
+    first and only the vectors of the ``nprobe`` closest cells are scanned.
+    ``nprobe`` is the recall/latency knob: 1 is fastest, ``nlist`` is
+    exhaustive and returns the same answer as an exact scan.
+    """
+
+    # Points per centroid used to train k-means; the rest are only assigned
+    TRAIN_POINTS_PER_LIST = 32
+    # Rows per chunk when assigning, bounds the N x nlist distance matrix
+    ASSIGN_CHUNK = 8192
+
+    def __init__(self, nlist: Optional[int] = None, nprobe: int = 16, iterations: int = 10, seed: int = 0):
+        self.nlist = nlist
+        self.nprobe = max(1, nprobe)
+        self.iterations = iterations
+        self.seed = seed
+        self._reset()
+
+    def _reset(self):
+        self.centroids = np.empty((0, 128), dtype=np.float32)
+        self._centroid_sq_norms = np.empty(0, dtype=np.float32)
+        self._vectors = np.empty((0, 128), dtype=np.float32)  # Grouped by cell
+        self._sq_norms = np.empty(0, dtype=np.float32)
+        self._ids = np.empty(0, dtype=np.int64)  # Row in the original matrix
+        self._offsets = np.zeros(1, dtype=np.int64)  # Cell i is _vectors[_offsets[i]:_offsets[i + 1]]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _assign(self, vectors: np.ndarray, sq_norms: np.ndarray) -> np.ndarray:
+        labels = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), self.ASSIGN_CHUNK):
+            end = start + self.ASSIGN_CHUNK
+            d = _sq_distances(vectors[start:end], sq_norms[start:end], self.centroids, self._centroid_sq_norms)
+            labels[start:end] = np.argmin(d, axis=1)
+        return labels
+
+    def build(self, matrix: np.ndarray):
+        """Trains the quantiser on ``matrix`` (N x 128 float32) and indexes every row."""
+        n = len(matrix)
+        if n == 0:
+            self._reset()
+            return
+        nlist = self.nlist or int(4 * math.sqrt(n))
+        nlist = max(1, min(nlist, n))
+        rng = np.random.default_rng(self.seed)
+        sq_norms = np.einsum("ij,ij->i", matrix, matrix)
+
+        # k-means on a sample, seeded with random gallery rows
+        sample_size = min(n, nlist * self.TRAIN_POINTS_PER_LIST)
+        sample_idx = rng.choice(n, sample_size, replace=False) if sample_size < n else np.arange(n)
+        sample, sample_sq = matrix[sample_idx], sq_norms[sample_idx]
+        self.centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(self.iterations):
+            self._centroid_sq_norms = np.einsum("ij,ij->i", self.centroids, self.centroids)
+            labels = self._assign(sample, sample_sq)
+            counts = np.bincount(labels, minlength=nlist)
+            filled = counts > 0
+            # Per-cell sums in one pass over the sample sorted by cell
+            order = np.argsort(labels, kind="stable")
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+            sums = np.add.reduceat(sample[order], starts, axis=0)
+            # Empty cells keep their previous centroid
+            self.centroids[filled] = sums / counts[filled, None]
+        self._centroid_sq_norms = np.einsum("ij,ij->i", self.centroids, self.centroids)
+
+        labels = self._assign(matrix, sq_norms)
+        order = np.argsort(labels, kind="stable")
+        self._ids = order
+        self._vectors = np.ascontiguousarray(matrix[order])
+        self._sq_norms = sq_norms[order]
+        self._offsets = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=nlist))))
+
+    def search(self, probe: np.ndarray, nprobe: Optional[int] = None) -> Tuple[int, float]:
+        """Nearest indexed row to ``probe`` and its Euclidean distance (-1, inf when empty)."""
+        if not len(self._ids):
+            return -1, math.inf
+        probe = np.asarray(probe, dtype=np.float32)
+        probe_sq = float(np.dot(probe, probe))
+        nlist = len(self.centroids)
+        nprobe = min(nprobe or self.nprobe, nlist)
+
+        cell_d = self._centroid_sq_norms - 2.0 * (self.centroids @ probe)
+        cells = np.argpartition(cell_d, nprobe - 1)[:nprobe] if nprobe < nlist else np.arange(nlist)
+        spans = [np.arange(self._offsets[c], self._offsets[c + 1]) for c in cells if self._offsets[c + 1] > self._offsets[c]]
+        # All probed cells empty (only possible with tiny galleries): scan everything
+        candidates = np.concatenate(spans) if spans else np.arange(len(self._ids))
+
+        sq = self._sq_norms[candidates] + probe_sq - 2.0 * (self._vectors[candidates] @ probe)
+        best = int(np.argmin(sq))
+        return int(self._ids[candidates[best]]), math.sqrt(max(float(sq[best]), 0.0))
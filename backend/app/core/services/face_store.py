@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from loguru import logger
+
+from app.core.config import settings
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def _file_sha1(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _matrix_sha1(matrix: np.ndarray) -> str:
+    return hashlib.sha1(np.ascontiguousarray(matrix).data).hexdigest()
+
+
+class FaceEncodingStore:
+    """Persistent cache of known-face encodings keyed by image content hash.
+
+    The cache directory holds ``encodings.npy`` (an N x 128 float32 matrix,
+    opened memory-mapped) and ``index.json`` mapping each image file to its
+    SHA-1, size/mtime and matrix row. On ``sync`` only new or changed images
+    are passed to ``encode``; a file whose size and mtime are unchanged is
+    not even re-hashed. Images in which no face was found are remembered too
+    (row -1) so they are not retried on every start.
+
+    The index also records the matrix's shape and checksum. The two files
+    are replaced one after the other, so a crash or another process syncing
+    in between can leave them from different writes; such a pair is
+    rejected and rebuilt instead of pairing rows with the wrong images.
+    """
+
+    VERSION = 2
+
+    def __init__(self, faces_dir: Optional[Path] = None, cache_dir: Optional[Path] = None):
+        self.faces_dir = Path(faces_dir or settings.KNOWN_FACES_DIR)
+        self.cache_dir = Path(cache_dir or settings.FACE_ENCODING_CACHE_DIR)
+        self.matrix_path = self.cache_dir / "encodings.npy"
+        self.index_path = self.cache_dir / "index.json"
+        # Index entries as of the last sync: {filename: {sha1, size, mtime, row}}
+        self.entries: Dict[str, dict] = {}
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Cheap directory fingerprint {filename: (size, mtime_ns)} used to poll for changes."""
+        if not self.faces_dir.exists():
+            return {}
+        return {
+            entry.name: (entry.stat().st_size, entry.stat().st_mtime_ns)
+            for entry in os.scandir(self.faces_dir)
+            if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS)
+        }
+
+    def _load(self) -> Tuple[Dict[str, dict], np.ndarray]:
+        empty = np.empty((0, 128), dtype=np.float32)
+        if not self.index_path.exists() or not self.matrix_path.exists():
+            return {}, empty
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") != self.VERSION:
+                return {}, empty
+            matrix = np.load(self.matrix_path, mmap_mode="r")
+            if list(matrix.shape) != index.get("shape") or _matrix_sha1(matrix) != index.get("matrix_sha1"):
+                logger.warning("Face encoding cache index does not match its matrix, rebuilding")
+                return {}, empty
+            return index.get("entries", {}), matrix
+        except Exception as e:
+            logger.warning(f"Face encoding cache unreadable, rebuilding: {e}")
+            return {}, empty
+
+    def _save(self, entries: Dict[str, dict], matrix: np.ndarray):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to temp files and swap them in so a crash never leaves a torn cache
+        # (per-PID names: every detection process syncs the same directory)
+        tmp_matrix = self.cache_dir / f"encodings.{os.getpid()}.tmp.npy"
+        tmp_index = self.cache_dir / f"index.{os.getpid()}.tmp.json"
+        np.save(tmp_matrix, matrix)
+        with open(tmp_index, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": self.VERSION,
+                "shape": list(matrix.shape),
+                "matrix_sha1": _matrix_sha1(matrix),
+                "entries": entries,
+            }, f)
+        os.replace(tmp_matrix, self.matrix_path)
+        os.replace(tmp_index, self.index_path)
+
+    def sync(self, encode: Callable[[str], Optional[np.ndarray]]) -> Tuple[np.ndarray, List[str]]:
+        """Brings the cache in line with the faces directory.
+
+        Args:
+            encode: Returns the encoding for an image path, or None if it has no face
+
+        Returns:
+            (matrix, filenames): float32 encodings and the image each row came from
+        """
+        if not self.faces_dir.exists():
+            self.entries = {}
+            return np.empty((0, 128), dtype=np.float32), []
+
+        cached, cached_matrix = self._load()
+        entries: Dict[str, dict] = {}
+        rows: List[np.ndarray] = []
+        filenames: List[str] = []
+        encoded = reused = 0
+        changed = False
+
+        for filename in sorted(os.listdir(self.faces_dir)):
+            if not filename.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            path = str(self.faces_dir / filename)
+            try:
+                stat = os.stat(path)
+                previous = cached.get(filename)
+                if previous and previous["size"] == stat.st_size and previous["mtime"] == stat.st_mtime:
+                    sha1 = previous["sha1"]
+                else:
+                    sha1 = _file_sha1(path)
+
+                if previous and previous["sha1"] == sha1 and previous["row"] < len(cached_matrix):
+                    encoding = cached_matrix[previous["row"]] if previous["row"] >= 0 else None
+                    reused += 1
+                    if previous["size"] != stat.st_size or previous["mtime"] != stat.st_mtime:
+                        changed = True
+                else:
+                    encoding = encode(path)
+                    encoded += 1
+                    changed = True
+            except Exception as e:
+                logger.error(f"Error loading face {filename}: {e}")
+                changed = True
+                continue
+
+            row = -1
+            if encoding is not None:
+                row = len(rows)
+                rows.append(np.asarray(encoding, dtype=np.float32))
+                filenames.append(filename)
+            entries[filename] = {"sha1": sha1, "size": stat.st_size, "mtime": stat.st_mtime, "row": row}
+
+        if set(cached) - set(entries):
+            changed = True
+
+        matrix = np.stack(rows) if rows else np.empty((0, 128), dtype=np.float32)
+        # Drop the memory map before the files are replaced (required on Windows)
+        rows = cached_matrix = encoding = None
+        if changed:
+            try:
+                self._save(entries, matrix)
+            except OSError as e:
+                logger.warning(f"Could not write face encoding cache: {e}")
+        self.entries = entries
+        logger.info(f"Face encodings: {reused} from cache, {encoded} encoded")
+        return matrix, filenames
+
+
+def name_from_filename(filename: str) -> str:
+    """``alice_2.jpg`` -> ``alice``"""
+    return os.path.splitext(filename)[0].split('_')[0]
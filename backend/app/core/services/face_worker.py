@@ -0,0 +1,107 @@
+import queue
+import threading
+import time
+from typing import List, Optional
+import numpy as np
+from loguru import logger
+
+from app.core.config import settings
+from app.core.metrics import STAGE_DURATION
+
+
+class _FaceJob:
+    __slots__ = ("state", "track_id", "crop", "bbox", "frame_no")
+
+    def __init__(self, state, track_id: int, crop: np.ndarray, bbox, frame_no: int):
+        self.state = state
+        self.track_id = track_id
+        self.crop = crop
+        self.bbox = bbox
+        self.frame_no = frame_no
+
+
+class FaceIdentifyWorker:
+    """Face recognition stage running beside detection.
+
+    Detection hands over a private copy of each person's face search region
+    and moves on; this thread drains whatever is queued (across cameras),
+    identifies it with one ``identify_people`` call and records the result on
+    the track, where the next detection pass picks it up.
+    """
+
+    def __init__(self, service, max_queue: Optional[int] = None, max_batch: int = 16):
+        self.service = service
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[_FaceJob]" = queue.Queue(maxsize=max_queue or settings.FACE_QUEUE_SIZE)
+        self._thread = None
+        self._running = False
+        self._start_lock = threading.Lock()
+        self.dropped = 0
+
+    def start(self):
+        with self._start_lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="face-identify", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def submit(self, state, track_id: int, frame: np.ndarray, bbox, frame_no: int) -> bool:
+        """Queues a face check for ``track_id``; False if the stage is saturated."""
+        if not self._running:
+            self.start()
+        # Copy only the region the face cropper will search: the frame itself
+        # goes back to the ring buffer as soon as detection returns
+        x1, y1, x2, y2 = self.service.face_cropper.search_region(bbox, frame.shape)
+        if x2 <= x1 or y2 <= y1:
+            return False
+        crop = frame[y1:y2, x1:x2].copy()
+        local_bbox = (0, 0, x2 - x1, bbox[3] - y1)
+        try:
+            self._queue.put_nowait(_FaceJob(state, track_id, crop, local_bbox, frame_no))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _collect(self) -> List[_FaceJob]:
+        try:
+            jobs = [self._queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        while len(jobs) < self.max_batch:
+            try:
+                jobs.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return jobs
+
+    def _run(self):
+        while self._running:
+            jobs = self._collect()
+            if not jobs:
+                continue
+            started = time.perf_counter()
+            try:
+                identities = self.service.identify_people(
+                    [(job.crop, job.bbox) for job in jobs], [job.state.camera_id for job in jobs]
+                )
+            except Exception as e:
+                logger.error(f"Face identification failed ({len(jobs)} faces): {e}")
+                for job in jobs:
+                    job.state.identities.clear_pending(job.track_id)
+                continue
+            elapsed = time.perf_counter() - started
+
+            for job, (name, distance, intruder_id, known_intruder) in zip(jobs, identities):
+                # Tracks that left the scene meanwhile have been evicted: don't resurrect them
+                if job.track_id in job.state.identities:
+                    job.state.identities.record(job.track_id, name, distance, job.frame_no, intruder_id, known_intruder)
+            for camera_id in {job.state.camera_id for job in jobs}:
+                STAGE_DURATION.labels(camera_id, "face_recognition").observe(elapsed)
@@ -0,0 +1,191 @@
+import asyncio
+import threading
+import time
+from typing import List, Optional, Tuple
+import numpy as np
+
+from app.core.config import settings
+
+
+class FrameSlot:
+    """One preallocated frame buffer in a ring."""
+
+    __slots__ = ("index", "array", "generation", "refcount", "timestamp")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.array: Optional[np.ndarray] = None
+        self.generation = 0
+        self.refcount = 0
+        self.timestamp = 0.0
+
+
+class FrameRef:
+    """Read handle to one generation of a slot.
+
+    The slot is not handed back to the writer while any reference is alive,
+    so ``array`` can be read without copying. Call ``release()`` (or use the
+    ref as a context manager) when done. Readers must not modify ``array``.
+    """
+
+    __slots__ = ("_ring", "_slot", "generation", "timestamp", "_released")
+
+    def __init__(self, ring: "FrameRingBuffer", slot: FrameSlot):
+        self._ring = ring
+        self._slot = slot
+        self.generation = slot.generation
+        self.timestamp = slot.timestamp
+        self._released = False
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._slot.array
+
+    def share(self) -> "FrameRef":
+        """Returns an independent reference to the same frame."""
+        return self._ring._share(self._slot)
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._ring._release(self._slot)
+
+    def __enter__(self) -> "FrameRef":
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class FrameRingBuffer:
+    """Per-camera ring of reusable frame buffers shared by capture, detection and streaming.
+
+    Capture fills a free slot in place (``acquire_write`` + ``commit``),
+    consumers take reference-counted ``FrameRef`` handles instead of copies,
+    and a slot only becomes writable again once every reference to it has
+    been released. Generation numbers identify each committed frame.
+    """
+
+    def __init__(self, num_slots: Optional[int] = None):
+        num_slots = max(2, num_slots or settings.FRAME_RING_SLOTS)
+        self._slots: List[FrameSlot] = [FrameSlot(i) for i in range(num_slots)]
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._latest: Optional[FrameRef] = None
+        # Coroutines waiting in latest_async(), woken thread-safely by publish()
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        # Writes that found every slot in use and fell back to a one-off buffer
+        self.overruns = 0
+
+    def acquire_write(self) -> FrameSlot:
+        """Reserves a slot nobody is reading. Its ``array`` may be reused in place."""
+        with self._cond:
+            free = [slot for slot in self._slots if slot.refcount == 0]
+            if free:
+                # Prefer slots that already hold a buffer so memory stays bounded
+                # by the number of frames actually in use
+                slot = next((s for s in free if s.array is not None), free[0])
+            else:
+                self.overruns += 1
+                slot = FrameSlot(-1)
+            slot.refcount = 1
+            return slot
+
+    def commit(self, slot: FrameSlot, array: np.ndarray) -> FrameRef:
+        """Stamps a written slot with a new generation; the writer's hold becomes the returned ref."""
+        with self._cond:
+            self._generation += 1
+            slot.array = array
+            slot.generation = self._generation
+            slot.timestamp = time.time()
+            return FrameRef(self, slot)
+
+    def abort(self, slot: FrameSlot):
+        """Gives back a slot from ``acquire_write`` without committing it."""
+        self._release(slot)
+
+    def publish(self, ref: FrameRef):
+        """Makes ``ref`` the frame returned by ``latest()``."""
+        with self._cond:
+            previous = self._latest
+            self._latest = self._share_locked(ref._slot)
+            if previous is not None:
+                previous._released = True
+                previous._slot.refcount -= 1
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                # Waiter's loop has been closed
+                pass
+
+    def latest(self, after_generation: int = 0, timeout: Optional[float] = None) -> Optional[FrameRef]:
+        """Returns a reference to the newest published frame.
+
+        Waits up to ``timeout`` seconds for one newer than ``after_generation``.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._latest is not None and self._latest.generation > after_generation,
+                timeout=timeout
+            ):
+                return None
+            return self._share_locked(self._latest._slot)
+
+    async def latest_async(self, after_generation: int = 0, timeout: Optional[float] = None) -> Optional[FrameRef]:
+        """Awaitable ``latest()``: suspends the coroutine instead of blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            with self._cond:
+                if self._latest is not None and self._latest.generation > after_generation:
+                    return self._share_locked(self._latest._slot)
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+
+            remaining = None if deadline is None else deadline - loop.time()
+            try:
+                if remaining is not None and remaining <= 0:
+                    raise asyncio.TimeoutError
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                with self._cond:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+                return None
+
+    def clear(self):
+        with self._cond:
+            if self._latest is not None:
+                self._latest._released = True
+                self._latest._slot.refcount -= 1
+                self._latest = None
+
+    def _share_locked(self, slot: FrameSlot) -> FrameRef:
+        slot.refcount += 1
+        return FrameRef(self, slot)
+
+    def _share(self, slot: FrameSlot) -> FrameRef:
+        with self._cond:
+            return self._share_locked(slot)
+
+    def _release(self, slot: FrameSlot):
+        with self._cond:
+            slot.refcount -= 1
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "slots": len(self._slots),
+                "allocated": sum(1 for s in self._slots if s.array is not None),
+                "in_use": sum(1 for s in self._slots if s.refcount > 0),
+                "generation": self._generation,
+                "overruns": self.overruns,
+            }
+
+
+def _wake(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
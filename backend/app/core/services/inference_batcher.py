@@ -0,0 +1,173 @@
+import threading
+import queue
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+import numpy as np
+from loguru import logger
+
+from app.core.config import settings
+from app.core.services.detection_service import detection_service
+
+
+class LatencyStats:
+    """Running latency figures for one camera, in milliseconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self.total_ms = 0.0
+        self.queue_total_ms = 0.0
+        self.batch_size_total = 0
+
+    def record(self, total_ms: float, queue_ms: float, batch_size: int):
+        self.count += 1
+        self.last_ms = total_ms
+        self.max_ms = max(self.max_ms, total_ms)
+        self.total_ms += total_ms
+        self.queue_total_ms += queue_ms
+        self.batch_size_total += batch_size
+
+    def to_dict(self) -> dict:
+        count = max(self.count, 1)
+        return {
+            "frames": self.count,
+            "last_ms": round(self.last_ms, 2),
+            "avg_ms": round(self.total_ms / count, 2),
+            "max_ms": round(self.max_ms, 2),
+            "avg_queue_ms": round(self.queue_total_ms / count, 2),
+            "avg_batch_size": round(self.batch_size_total / count, 2),
+        }
+
+
+class _PendingFrame:
+    __slots__ = ("camera_id", "frame", "future", "submitted_at")
+
+    def __init__(self, camera_id: str, frame: np.ndarray):
+        self.camera_id = camera_id
+        self.frame = frame
+        self.future: Future = Future()
+        self.submitted_at = time.perf_counter()
+
+
+class InferenceBatcher:
+    """Collects frames from all cameras and runs them through YOLO together.
+
+    The first pending frame opens a batch window of ``max_wait_ms``; anything
+    that arrives before the window closes (up to ``max_batch_size`` frames)
+    rides along in the same forward pass. Results are routed back to each
+    caller through a ``Future``.
+    """
+
+    def __init__(self, service=detection_service, max_batch_size: Optional[int] = None, max_wait_ms: Optional[float] = None):
+        self.service = service
+        self.max_batch_size = max(1, max_batch_size or settings.DETECTION_BATCH_SIZE)
+        wait_ms = settings.DETECTION_BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+        self.max_wait = max(0.0, wait_ms) / 1000.0
+
+        self._queue: "queue.Queue[_PendingFrame]" = queue.Queue()
+        self._thread = None
+        self._running = False
+        self._start_lock = threading.Lock()
+
+        self.latency: Dict[str, LatencyStats] = {}
+        self._stats_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+            self._thread.start()
+            logger.info(f"InferenceBatcher started (batch={self.max_batch_size}, wait={self.max_wait * 1000:.0f}ms)")
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2)
+        # Callers completing in a done-callback must not wait forever
+        while True:
+            try:
+                self._queue.get_nowait().future.set_exception(RuntimeError("InferenceBatcher stopped"))
+            except queue.Empty:
+                break
+        self.service.stop_workers()
+
+    def load_model(self):
+        self.service.load_model()
+
+    def reset_camera(self, camera_id: str):
+        self.service.reset_camera(camera_id)
+
+    def submit(self, camera_id: str, frame: np.ndarray) -> Future:
+        """Queues a frame; the future resolves to ``(frame, detections, status)``."""
+        if not self._running:
+            self.start()
+        pending = _PendingFrame(camera_id, frame)
+        self._queue.put(pending)
+        return pending.future
+
+    def infer(self, camera_id: str, frame: np.ndarray, timeout: Optional[float] = None):
+        """Blocking convenience wrapper around ``submit``."""
+        return self.submit(camera_id, frame).result(timeout=timeout)
+
+    def _collect(self) -> List[_PendingFrame]:
+        try:
+            first = self._queue.get(timeout=0.5)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while self._running:
+            batch = self._collect()
+            if not batch:
+                continue
+
+            started_at = time.perf_counter()
+            try:
+                outputs = self.service.process_batch(
+                    [p.frame for p in batch],
+                    [p.camera_id for p in batch]
+                )
+            except Exception as e:
+                logger.error(f"Batched inference failed ({len(batch)} frames): {e}")
+                for pending in batch:
+                    pending.future.set_exception(e)
+                continue
+
+            finished_at = time.perf_counter()
+            with self._stats_lock:
+                for pending in batch:
+                    stats = self.latency.setdefault(pending.camera_id, LatencyStats())
+                    stats.record(
+                        (finished_at - pending.submitted_at) * 1000.0,
+                        (started_at - pending.submitted_at) * 1000.0,
+                        len(batch)
+                    )
+
+            for pending, output in zip(batch, outputs):
+                pending.future.set_result(output)
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-camera latency report (end-to-end, queue wait, batch size)."""
+        with self._stats_lock:
+            return {camera_id: s.to_dict() for camera_id, s in self.latency.items()}
+
+
+# Global instance
+inference_batcher = InferenceBatcher()
@@ -0,0 +1,123 @@
+import threading
+import time
+import uuid
+from typing import Iterable, List, Optional, Set, Tuple
+import numpy as np
+
+from app.core.config import settings
+
+
+class IntruderMemory:
+    """Short-lived memory of unknown faces, so a returning intruder keeps one ID.
+
+    Unknown encodings are matched against every intruder seen within the
+    last ``ttl`` seconds (one vectorised distance computation, as for the
+    gallery). A match returns the existing intruder ID, whichever camera
+    saw it first; otherwise a new ID is issued. The same ID lets the alert
+    path suppress repeat notifications for ``alert_suppress`` seconds.
+
+    The memory is per process: with DETECTION_BACKEND="process", intruders
+    are only recognised across the cameras that share a detection process.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        tolerance: Optional[float] = None,
+        alert_suppress: Optional[float] = None,
+        max_entries: Optional[int] = None
+    ):
+        self.ttl = settings.INTRUDER_MEMORY_TTL if ttl is None else ttl
+        self.tolerance = settings.INTRUDER_MATCH_TOLERANCE if tolerance is None else tolerance
+        self.alert_suppress = settings.INTRUDER_ALERT_SUPPRESS if alert_suppress is None else alert_suppress
+        self.max_entries = max_entries or settings.INTRUDER_MEMORY_MAX
+        self._lock = threading.Lock()
+
+        self._encodings = np.empty((0, 128), dtype=np.float32)
+        self._sq_norms = np.empty(0, dtype=np.float32)
+        self._ids: List[str] = []
+        self._first_seen: List[float] = []
+        self._first_camera: List[str] = []
+        self._last_seen: List[float] = []
+        self._hits: List[int] = []
+        self._last_alerted: dict = {}  # intruder_id -> time.time() of the last notification
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _expire_locked(self, now: float):
+        keep = [k for k, seen in enumerate(self._last_seen) if now - seen <= self.ttl]
+        if len(keep) > self.max_entries:
+            # Keep the most recently seen
+            keep = sorted(keep, key=lambda k: self._last_seen[k])[-self.max_entries:]
+        if len(keep) != len(self._ids):
+            self._encodings = self._encodings[keep]
+            self._sq_norms = self._sq_norms[keep]
+            self._ids = [self._ids[k] for k in keep]
+            self._first_seen = [self._first_seen[k] for k in keep]
+            self._first_camera = [self._first_camera[k] for k in keep]
+            self._last_seen = [self._last_seen[k] for k in keep]
+            self._hits = [self._hits[k] for k in keep]
+        # Alerts are claimed for IDs from other processes too, so forgotten
+        # intruders are pruned here even when no encoding expired
+        alive = set(self._ids)
+        self._last_alerted = {
+            i: t for i, t in self._last_alerted.items() if i in alive or now - t <= self.alert_suppress
+        }
+
+    def match_or_add(self, encoding: np.ndarray, camera_id: str) -> Tuple[str, int]:
+        """Intruder ID for an unknown face and how many times it has been seen (1 = new)."""
+        probe = np.asarray(encoding, dtype=np.float32)
+        now = time.time()
+        with self._lock:
+            self._expire_locked(now)
+            if self._ids:
+                sq = self._sq_norms + np.dot(probe, probe) - 2.0 * (self._encodings @ probe)
+                best = int(np.argmin(sq))
+                if np.sqrt(max(float(sq[best]), 0.0)) <= self.tolerance:
+                    self._last_seen[best] = now
+                    self._hits[best] += 1
+                    return self._ids[best], self._hits[best]
+
+            intruder_id = f"intruder-{uuid.uuid4().hex[:8]}"
+            self._encodings = np.vstack([self._encodings, probe[None, :]])
+            self._sq_norms = np.append(self._sq_norms, np.float32(np.dot(probe, probe)))
+            self._ids.append(intruder_id)
+            self._first_seen.append(now)
+            self._first_camera.append(camera_id)
+            self._last_seen.append(now)
+            self._hits.append(1)
+            return intruder_id, 1
+
+    def claim_alerts(self, intruder_ids: Iterable[str]) -> Set[str]:
+        """Returns the IDs not notified within ``alert_suppress`` seconds and marks them notified."""
+        now = time.time()
+        fresh = set()
+        with self._lock:
+            self._expire_locked(now)
+            for intruder_id in intruder_ids:
+                if now - self._last_alerted.get(intruder_id, 0.0) > self.alert_suppress:
+                    self._last_alerted[intruder_id] = now
+                    fresh.add(intruder_id)
+        return fresh
+
+    def info(self, intruder_id: str) -> Optional[dict]:
+        with self._lock:
+            if intruder_id not in self._ids:
+                return None
+            k = self._ids.index(intruder_id)
+            return {
+                "intruder_id": intruder_id,
+                "first_seen": self._first_seen[k],
+                "first_camera": self._first_camera[k],
+                "last_seen": self._last_seen[k],
+                "sightings": self._hits[k],
+            }
+
+
+# Global instance
+intruder_memory = IntruderMemory()
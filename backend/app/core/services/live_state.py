@@ -0,0 +1,254 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+import redis
+import redis.asyncio as aioredis
+from loguru import logger
+
+from app.core.config import settings
+from app.core.services.circuit_breaker import CircuitBreaker
+
+KEY_PREFIX = "fess:live:"
+INDEX_KEY = f"{KEY_PREFIX}cameras"  # Set of camera IDs with a published state
+
+# Errors that mean Redis itself is unreachable or unhealthy (count towards the breaker)
+CONNECTION_ERRORS = (redis.ConnectionError, redis.TimeoutError, OSError)
+
+
+@contextmanager
+def _guarded(breaker: CircuitBreaker) -> Iterator[None]:
+    """Reports the outcome of the enclosed Redis call(s) to ``breaker``.
+
+    Connection errors count as failures; any reply, even an error reply,
+    counts as a success. Anything else (e.g. cancellation) ends a half-open
+    probe without a verdict.
+    """
+    try:
+        yield
+    except CONNECTION_ERRORS:
+        breaker.record_failure()
+        raise
+    except redis.RedisError:
+        breaker.record_success()
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record_success()
+
+
+def _compact(detection: dict) -> dict:
+    """Detection dict trimmed to what dashboards need, floats rounded, Nones dropped."""
+    compact = {
+        "bbox": [int(v) for v in detection["bbox"]],
+        "status": detection["status"],
+        "name": detection.get("name"),
+        "conf": round(float(detection["conf"]), 3),
+        "face_distance": (
+            round(float(detection["face_distance"]), 3) if detection.get("face_distance") is not None else None
+        ),
+        "intruder_id": detection.get("intruder_id"),
+        "is_inside": bool(detection.get("is_inside")),
+    }
+    return {k: v for k, v in compact.items() if v is not None}
+
+
+class LiveStatePublisher:
+    """Mirrors each pipeline's latest detection result into a Redis hash.
+
+    ``publish`` only records the newest result per camera and returns; a
+    background thread writes at most one update per camera every
+    LIVE_STATE_INTERVAL seconds, all cameras in one pipelined round trip.
+    Each camera's hash (``fess:live:<camera_id>``) holds status, detection
+    count, compact JSON detections and the frame timestamp, and expires
+    after CACHE_DETECTION_TTL seconds without updates.
+
+    Redis is optional: while it is unreachable updates are dropped, with
+    one warning per outage.
+    """
+
+    def __init__(self, url: Optional[str] = None, ttl: Optional[int] = None, interval: Optional[float] = None):
+        self.url = url or settings.REDIS_URL
+        self.ttl = ttl or settings.CACHE_DETECTION_TTL
+        self.interval = settings.LIVE_STATE_INTERVAL if interval is None else interval
+        self._client = None
+        self._latest: Dict[str, Optional[dict]] = {}  # None = remove the camera's state
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._running = False
+        self._failing = False
+
+    def publish(self, camera_id: str, detections: List[dict], status: str, frame_ts: float):
+        """Records a camera's latest result; written to Redis asynchronously."""
+        if not settings.LIVE_STATE_ENABLED:
+            return
+        state = {
+            "camera_id": camera_id,
+            "status": status,
+            "count": len(detections),
+            "detections": [_compact(d) for d in detections],
+            "frame_ts": frame_ts,
+            "updated_at": time.time(),
+        }
+        with self._lock:
+            self._latest[camera_id] = state
+        self._ensure_running()
+        self._wakeup.set()
+
+    def remove(self, camera_id: str):
+        """Drops a stopped camera's state instead of letting it expire."""
+        if not settings.LIVE_STATE_ENABLED:
+            return
+        with self._lock:
+            self._latest[camera_id] = None
+        self._ensure_running()
+        self._wakeup.set()
+
+    def _ensure_running(self):
+        if self._running:
+            return
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="live-state", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        self._flush()
+
+    def _run(self):
+        while self._running:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            started = time.monotonic()
+            self._flush()
+            # Coalesce: whatever arrives meanwhile goes out in the next round
+            remaining = self.interval - (time.monotonic() - started)
+            if remaining > 0:
+                time.sleep(remaining)
+
+    def _flush(self):
+        with self._lock:
+            pending, self._latest = self._latest, {}
+        if not pending:
+            return
+        try:
+            if self._client is None:
+                self._client = redis.Redis.from_url(self.url, socket_timeout=2, socket_connect_timeout=1)
+            pipe = self._client.pipeline(transaction=False)
+            for camera_id, state in pending.items():
+                key = f"{KEY_PREFIX}{camera_id}"
+                if state is None:
+                    pipe.delete(key)
+                    pipe.srem(INDEX_KEY, camera_id)
+                    continue
+                pipe.hset(key, mapping={
+                    "status": state["status"],
+                    "count": state["count"],
+                    "detections": json.dumps(state["detections"], separators=(",", ":")),
+                    "frame_ts": state["frame_ts"],
+                    "updated_at": state["updated_at"],
+                })
+                pipe.expire(key, self.ttl)
+                pipe.sadd(INDEX_KEY, camera_id)
+            pipe.execute()
+            if self._failing:
+                logger.info("Live state publishing to Redis resumed")
+                self._failing = False
+        except Exception as e:
+            if not self._failing:
+                logger.warning(f"Live state publishing to Redis failed, dropping updates until it recovers: {e}")
+                self._failing = True
+
+
+class LiveStateReader:
+    """Reads published live state from any process, without blocking the event loop.
+
+    Reads go through a circuit breaker: after repeated connection errors
+    they return an empty result at once instead of waiting out a socket
+    timeout on every request, until a probe finds Redis back.
+    """
+
+    def __init__(self, url: Optional[str] = None, breaker: Optional[CircuitBreaker] = None):
+        self.url = url or settings.REDIS_URL
+        self.breaker = breaker or CircuitBreaker("Live state Redis")
+        self._client = None
+
+    @property
+    def client(self):
+        # Created lazily so the connection pool binds to the serving event loop
+        if self._client is None:
+            self._client = aioredis.Redis.from_url(self.url, socket_timeout=2, socket_connect_timeout=1)
+        return self._client
+
+    @staticmethod
+    def _decode(camera_id: str, raw: dict) -> Optional[dict]:
+        if not raw:
+            return None
+        fields = {k.decode(): v.decode() for k, v in raw.items()}
+        frame_ts = float(fields["frame_ts"])
+        return {
+            "camera_id": camera_id,
+            "status": fields["status"],
+            "count": int(fields["count"]),
+            "detections": json.loads(fields["detections"]),
+            "frame_ts": frame_ts,
+            "updated_at": float(fields["updated_at"]),
+            "age": round(max(0.0, time.time() - frame_ts), 3),
+        }
+
+    async def get(self, camera_id: str) -> Optional[dict]:
+        """One camera's state, or None if nothing was published within the TTL (or Redis is failing fast)."""
+        if not self.breaker.allow():
+            return None
+        with _guarded(self.breaker):
+            raw = await self.client.hgetall(f"{KEY_PREFIX}{camera_id}")
+        return self._decode(camera_id, raw)
+
+    async def get_all(self, camera_ids: Optional[Iterable[str]] = None) -> List[dict]:
+        """States of every camera that published within the TTL (two round trips).
+
+        With ``camera_ids`` only those cameras are read, in one round trip.
+        Empty while Redis is failing fast.
+        """
+        if not self.breaker.allow():
+            return []
+        with _guarded(self.breaker):
+            return await self._get_all(camera_ids)
+
+    async def _get_all(self, camera_ids: Optional[Iterable[str]]) -> List[dict]:
+        if camera_ids is None:
+            members = await self.client.smembers(INDEX_KEY)
+            camera_ids = (m.decode() for m in members)
+        camera_ids = sorted(camera_ids)
+        if not camera_ids:
+            return []
+        pipe = self.client.pipeline(transaction=False)
+        for camera_id in camera_ids:
+            pipe.hgetall(f"{KEY_PREFIX}{camera_id}")
+        raws = await pipe.execute()
+
+        states, expired = [], []
+        for camera_id, raw in zip(camera_ids, raws):
+            state = self._decode(camera_id, raw)
+            if state is None:
+                expired.append(camera_id)
+            else:
+                states.append(state)
+        if expired:
+            await self.client.srem(INDEX_KEY, *expired)
+        return states
+
+
+# Global instances
+live_state = LiveStatePublisher()
+live_state_reader = LiveStateReader()
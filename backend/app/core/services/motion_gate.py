@@ -0,0 +1,92 @@
+import time
+from typing import Optional
+import cv2
+import numpy as np
+
+from app.core.config import settings
+
+
+class MotionGate:
+    """Cheap change detector that decides whether a frame needs a YOLO pass.
+
+    Frames are downscaled to a small grayscale thumbnail and compared with a
+    running-average background. Only when enough pixels changed is the frame
+    handed to detection; a forced pass every ``force_interval`` seconds keeps
+    stationary intruders from going unnoticed.
+    """
+
+    def __init__(
+        self,
+        width: Optional[int] = None,
+        pixel_threshold: Optional[int] = None,
+        min_area_ratio: Optional[float] = None,
+        force_interval: Optional[float] = None,
+        learning_rate: float = 0.05
+    ):
+        self.width = width or settings.MOTION_GATE_WIDTH
+        self.pixel_threshold = pixel_threshold or settings.MOTION_PIXEL_THRESHOLD
+        self.min_area_ratio = settings.MOTION_MIN_AREA_RATIO if min_area_ratio is None else min_area_ratio
+        self.force_interval = settings.MOTION_FORCE_INTERVAL if force_interval is None else force_interval
+        self.learning_rate = learning_rate
+
+        self._background: Optional[np.ndarray] = None
+        self._last_pass = 0.0
+        self.last_motion_ratio = 0.0
+
+        # Counters
+        self.passed = 0
+        self.forced = 0
+        self.skipped = 0
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        height, width = frame.shape[:2]
+        scale = self.width / float(width)
+        small = cv2.resize(frame, (self.width, max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def should_process(self, frame: np.ndarray, force: bool = False) -> bool:
+        """Returns True if the frame should go through detection.
+
+        ``force`` bypasses the gate, e.g. while people are already tracked.
+        """
+        gray = self._thumbnail(frame)
+        now = time.monotonic()
+
+        if self._background is None or self._background.shape != gray.shape:
+            self._background = gray.astype(np.float32)
+            self._last_pass = now
+            self.passed += 1
+            return True
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self._background))
+        _, mask = cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)
+        self.last_motion_ratio = cv2.countNonZero(mask) / float(mask.size)
+        cv2.accumulateWeighted(gray, self._background, self.learning_rate)
+
+        if force or self.last_motion_ratio >= self.min_area_ratio:
+            self._last_pass = now
+            self.passed += 1
+            return True
+
+        if now - self._last_pass >= self.force_interval:
+            # Periodic full pass so a motionless person is still re-checked
+            self._last_pass = now
+            self.forced += 1
+            return True
+
+        self.skipped += 1
+        return False
+
+    def reset(self):
+        self._background = None
+
+    def stats(self) -> dict:
+        total = self.passed + self.forced + self.skipped
+        return {
+            "passed": self.passed,
+            "forced": self.forced,
+            "skipped": self.skipped,
+            "skip_ratio": round(self.skipped / total, 3) if total else 0.0,
+            "last_motion_ratio": round(self.last_motion_ratio, 4),
+        }
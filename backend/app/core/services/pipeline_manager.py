@@ -0,0 +1,110 @@
+import threading
+from typing import Dict, Iterable, List, Optional
+from loguru import logger
+
+from app.core.services.camera_service import CameraService
+from app.core.services.detection_workers import detection_workers
+from app.core.services.inference_batcher import inference_batcher
+
+
+class PipelineManager:
+    """Runs one capture pipeline per active camera inside this process.
+
+    All pipelines share one detection backend, so the YOLO model and the
+    known-face encodings are loaded once (or once per worker process when
+    DETECTION_BACKEND="process") no matter how many cameras are attached.
+    """
+
+    def __init__(self):
+        self.pipelines: Dict[str, CameraService] = {}
+        self._lock = threading.Lock()
+
+    def get(self, camera_id: str) -> Optional[CameraService]:
+        return self.pipelines.get(camera_id)
+
+    def start_camera(self, camera) -> bool:
+        """Starts (or restarts on source change) the pipeline for a ``Camera`` row."""
+        with self._lock:
+            pipeline = self.pipelines.get(camera.id)
+            if pipeline is not None:
+                if pipeline.is_running and pipeline.src == CameraService.source_from_camera(camera):
+                    pipeline.detection_enabled = bool(camera.detection_enabled)
+                    return True
+                pipeline.stop()
+
+            pipeline = CameraService.from_camera(camera)
+            self.pipelines[camera.id] = pipeline
+
+        started = pipeline.start()
+        if not started:
+            logger.error(f"PipelineManager: could not start camera {camera.name} ({camera.id})")
+        return bool(started)
+
+    def stop_camera(self, camera_id: str) -> bool:
+        with self._lock:
+            pipeline = self.pipelines.pop(camera_id, None)
+        if pipeline is None:
+            return False
+        pipeline.stop()
+        return True
+
+    def sync(self) -> Dict[str, bool]:
+        """Reconciles running pipelines with the active rows in the cameras table.
+
+        Returns a mapping of camera id to whether its pipeline is running.
+        """
+        from app.db.base import SessionLocal
+        from app.db.models.camera import Camera
+
+        db = SessionLocal()
+        try:
+            cameras = db.query(Camera).filter(Camera.is_active == True).all()  # noqa: E712
+        finally:
+            db.close()
+
+        active_ids = {camera.id for camera in cameras}
+        for camera_id in list(self.pipelines):
+            if camera_id not in active_ids:
+                logger.info(f"PipelineManager: camera {camera_id} no longer active, stopping")
+                self.stop_camera(camera_id)
+
+        if cameras:
+            # Load the shared model once up front instead of racing per camera
+            detection_workers.preload()
+
+        result = {}
+        for camera in cameras:
+            result[camera.id] = self.start_camera(camera)
+        logger.info(f"PipelineManager: {sum(result.values())}/{len(result)} camera pipelines running")
+        return result
+
+    def stop_all(self):
+        for camera_id in list(self.pipelines):
+            self.stop_camera(camera_id)
+
+    def status(self, camera_ids: Optional[Iterable[str]] = None) -> List[dict]:
+        """Per-pipeline status, limited to ``camera_ids`` when given."""
+        if camera_ids is not None:
+            camera_ids = set(camera_ids)
+        latency = inference_batcher.stats()
+        return [
+            {
+                "camera_id": camera_id,
+                "name": pipeline.name,
+                "source": str(pipeline.src),
+                "is_running": pipeline.is_running,
+                "status": pipeline.current_status,
+                "detections": len(pipeline.current_detections),
+                "detection_latency": latency.get(pipeline.detection_key),
+                "detection_frames": detection_workers.stats(pipeline.detection_key),
+                "frame_buffer": pipeline.frames.stats(),
+                "stream": pipeline.stream_hub.stats(),
+                "motion_gate": pipeline.motion_gate.stats() if pipeline.motion_gate else None,
+            }
+            for camera_id, pipeline in list(self.pipelines.items())
+            if camera_ids is None or camera_id in camera_ids
+        ]
+
+
+# Global instance
+pipeline_manager = PipelineManager()
@@ -0,0 +1,244 @@
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional, Set
+import cv2
+from loguru import logger
+
+from app.core.config import settings
+from app.core.metrics import FRAMES_DROPPED, STREAM_VIEWERS, observe_stage
+from app.core.services.frame_buffer import FrameRingBuffer
+
+
+class StreamTier:
+    """Resolution / JPEG quality / frame-rate profile shared by all viewers on it."""
+
+    def __init__(self, name: str, max_width: Optional[int], quality: int, max_fps: float):
+        self.name = name
+        self.max_width = max_width  # None keeps the capture resolution
+        self.quality = quality
+        self.max_fps = max_fps
+
+    @property
+    def min_interval(self) -> float:
+        return 1.0 / self.max_fps if self.max_fps > 0 else 0.0
+
+
+# Ordered best to worst; auto viewers step along this list
+STREAM_TIERS: List[StreamTier] = [
+    StreamTier("high", None, settings.STREAM_JPEG_QUALITY, 30),
+    StreamTier("medium", 960, 65, 15),
+    StreamTier("low", 480, 45, 5),
+]
+TIERS_BY_NAME: Dict[str, StreamTier] = {tier.name: tier for tier in STREAM_TIERS}
+
+
+class StreamSubscriber:
+    """One viewer's send queue. Oldest frames are dropped when it backs up.
+
+    Viewers in auto mode step down a tier when they keep dropping frames and
+    try the next tier up again after a quiet period.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queue: int, tier: str = "auto", drop_counter=None):
+        self.loop = loop
+        self._drop_counter = drop_counter
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_queue))
+        self.auto = tier not in TIERS_BY_NAME
+        self.tier_index = 0 if self.auto else STREAM_TIERS.index(TIERS_BY_NAME[tier])
+        self.sent = 0
+        self.dropped = 0
+        self.closed = False
+
+        self._window_start = time.monotonic()
+        self._window_drops = 0
+        self._last_change = self._window_start
+
+    @property
+    def tier(self) -> StreamTier:
+        return STREAM_TIERS[self.tier_index]
+
+    def _offer(self, data: Optional[bytes]):
+        # Runs on the subscriber's event loop; None is the end-of-stream marker
+        if self.closed:
+            return
+        if data is None:
+            self.closed = True
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            else:
+                if data is not None:
+                    self.dropped += 1
+                    self._window_drops += 1
+                    if self._drop_counter is not None:
+                        self._drop_counter.inc()
+        self.queue.put_nowait(data)
+        if self.auto and data is not None:
+            self._adapt()
+
+    def _adapt(self):
+        now = time.monotonic()
+        if self._window_drops >= settings.STREAM_DOWNGRADE_DROPS and self.tier_index < len(STREAM_TIERS) - 1:
+            self.tier_index += 1
+            self._last_change = now
+            logger.debug(f"Stream viewer backing up, stepping down to {self.tier.name}")
+        elif (self.tier_index > 0 and self._window_drops == 0
+              and now - self._last_change >= settings.STREAM_UPGRADE_AFTER):
+            self.tier_index -= 1
+            self._last_change = now
+            logger.debug(f"Stream viewer keeping up, stepping up to {self.tier.name}")
+        else:
+            if now - self._window_start >= settings.STREAM_ADAPT_WINDOW:
+                self._window_start = now
+                self._window_drops = 0
+            return
+        self._window_start = now
+        self._window_drops = 0
+
+    def close(self) -> bool:
+        """Ends the stream from any thread: pending and later ``get`` calls return None.
+
+        Returns False if the viewer's loop is already gone, so nobody will
+        see the end of the stream.
+        """
+        try:
+            self.loop.call_soon_threadsafe(self._offer, None)
+            return True
+        except RuntimeError:
+            self.closed = True
+            return False
+
+    async def get(self) -> Optional[bytes]:
+        """Next JPEG, or None once the stream has been closed."""
+        data = await self.queue.get()
+        if data is None:
+            # Leave the marker for any later call
+            self.queue.put_nowait(None)
+            return None
+        self.sent += 1
+        return data
+
+
+class StreamHub:
+    """Encodes each new frame of one camera once per tier and fans the JPEG out to all viewers.
+
+    A single encoder thread follows the camera's ring buffer while at least
+    one viewer is subscribed. Each tier in use is resized and encoded once
+    (at most at its own max FPS) and every subscriber on that tier gets the
+    same bytes through its own bounded queue, so a slow browser only loses
+    its own frames.
+    """
+
+    def __init__(self, frames: FrameRingBuffer, name: str = "camera", camera: Optional[str] = None):
+        self.frames = frames
+        self.name = name
+        self.camera = camera or name  # Metrics label
+        self.client_queue_size = settings.STREAM_CLIENT_QUEUE
+
+        self._subscribers: Set[StreamSubscriber] = set()
+        self._lock = threading.Lock()
+        self._has_subscribers = threading.Event()
+        self._thread = None
+        self._running = False
+        self.frames_encoded = 0
+        self._last_tier_encode: Dict[str, float] = {}
+
+    def subscribe(self, tier: str = "auto") -> StreamSubscriber:
+        """Registers a viewer on a tier name or "auto". Must be called from the viewer's event loop."""
+        subscriber = StreamSubscriber(
+            asyncio.get_running_loop(), self.client_queue_size, tier,
+            drop_counter=FRAMES_DROPPED.labels(self.camera, "viewer_queue")
+        )
+        with self._lock:
+            self._subscribers.add(subscriber)
+            STREAM_VIEWERS.labels(self.camera).inc()
+            self._has_subscribers.set()
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(target=self._encode_loop, name=f"stream-hub-{self.name}", daemon=True)
+                self._thread.start()
+        logger.debug(f"StreamHub {self.name}: viewer joined ({len(self._subscribers)} total)")
+        return subscriber
+
+    def unsubscribe(self, subscriber: StreamSubscriber):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.discard(subscriber)
+                STREAM_VIEWERS.labels(self.camera).dec()
+            if not self._subscribers:
+                self._has_subscribers.clear()
+        logger.debug(f"StreamHub {self.name}: viewer left ({len(self._subscribers)} total)")
+
+    def stop(self):
+        """Stops encoding and ends every viewer's stream (they unsubscribe as they leave)."""
+        self._running = False
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            if not subscriber.close():
+                self.unsubscribe(subscriber)
+        self._has_subscribers.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def _encode_loop(self):
+        last_generation = 0
+        while self._running:
+            if not self._has_subscribers.wait(timeout=1.0):
+                continue
+
+            frame_ref = self.frames.latest(after_generation=last_generation, timeout=0.5)
+            if frame_ref is None:
+                continue
+
+            with self._lock:
+                subscribers = list(self._subscribers)
+            by_tier: Dict[int, List[StreamSubscriber]] = {}
+            for subscriber in subscribers:
+                by_tier.setdefault(subscriber.tier_index, []).append(subscriber)
+
+            with frame_ref:
+                last_generation = frame_ref.generation
+                now = time.monotonic()
+                for tier_index, tier_subscribers in by_tier.items():
+                    tier = STREAM_TIERS[tier_index]
+                    if now - self._last_tier_encode.get(tier.name, 0.0) < tier.min_interval:
+                        continue
+                    data = self._encode(frame_ref.array, tier)
+                    if data is None:
+                        continue
+                    self._last_tier_encode[tier.name] = now
+                    self.frames_encoded += 1
+                    for subscriber in tier_subscribers:
+                        try:
+                            subscriber.loop.call_soon_threadsafe(subscriber._offer, data)
+                        except RuntimeError:
+                            # Viewer's loop already closed
+                            self.unsubscribe(subscriber)
+
+    def _encode(self, frame, tier: StreamTier) -> Optional[bytes]:
+        with observe_stage(self.camera, "jpeg_encode"):
+            height, width = frame.shape[:2]
+            if tier.max_width and width > tier.max_width:
+                scale = tier.max_width / float(width)
+                frame = cv2.resize(frame, (tier.max_width, int(height * scale)), interpolation=cv2.INTER_AREA)
+            ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, tier.quality])
+        return buffer.tobytes() if ret else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return {
+            "viewers": len(subscribers),
+            "frames_encoded": self.frames_encoded,
+            "viewer_tiers": [s.tier.name for s in subscribers],
+            "viewer_dropped": [s.dropped for s in subscribers],
+        }
@@ -0,0 +1,206 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from app.core.config import settings
+
+
+class TrackIdentity:
+    """Identity evidence gathered for one track over several face checks."""
+
+    __slots__ = (
+        "votes", "best_distance", "checks", "last_checked", "last_seen", "confident",
+        "pending_since", "identifying_since", "intruder_id"
+    )
+
+    def __init__(self, frame: int):
+        self.votes: Dict[str, int] = {}
+        self.best_distance: Dict[str, float] = {}
+        self.checks = 0
+        self.last_checked = frame
+        self.last_seen = frame
+        self.confident = False
+        # Monotonic times: a face check is in flight / the track is waiting for its first vote
+        self.pending_since: Optional[float] = None
+        self.identifying_since: Optional[float] = None
+        self.intruder_id: Optional[str] = None  # Set once an unknown face was seen on the track
+
+    @property
+    def name(self) -> str:
+        if not self.votes:
+            return "Unknown"
+        return max(self.votes, key=self.votes.get)
+
+    @property
+    def distance(self) -> Optional[float]:
+        return self.best_distance.get(self.name)
+
+    @property
+    def confidence(self) -> float:
+        """Share of face observations that agree with the leading name."""
+        total = sum(self.votes.values())
+        return self.votes[self.name] / total if total else 0.0
+
+
+class TrackIdentityStore:
+    """Bounded per-camera map of track ID -> voted identity.
+
+    Tracks are kept in least-recently-seen order: tracks not seen for
+    ``ttl_frames`` are evicted, and the oldest go first if more than
+    ``max_tracks`` are alive. A track is re-checked every
+    ``recheck_interval`` frames until ``min_votes`` face observations agree
+    on one name with at least ``min_confidence``; after that it is never
+    re-checked.
+
+    With asynchronous face checks a track is ``mark_pending`` while its
+    check is in flight. A track without any vote counts as identifying for
+    at most ``identify_timeout`` seconds, after which it is treated as
+    Unknown even if no answer arrived.
+    """
+
+    def __init__(
+        self,
+        max_tracks: Optional[int] = None,
+        ttl_frames: Optional[int] = None,
+        recheck_interval: Optional[int] = None,
+        min_votes: Optional[int] = None,
+        min_confidence: Optional[float] = None,
+        identify_timeout: Optional[float] = None
+    ):
+        self.max_tracks = max_tracks or settings.TRACK_IDENTITY_MAX
+        self.ttl_frames = ttl_frames or settings.TRACK_IDENTITY_TTL_FRAMES
+        self.recheck_interval = recheck_interval or settings.FACE_RECHECK_INTERVAL
+        self.min_votes = min_votes or settings.FACE_VOTE_MIN
+        self.min_confidence = settings.FACE_VOTE_CONFIDENCE if min_confidence is None else min_confidence
+        self.identify_timeout = settings.FACE_IDENTIFY_TIMEOUT if identify_timeout is None else identify_timeout
+        self._tracks: "OrderedDict[int, TrackIdentity]" = OrderedDict()
+        # Detection threads and the known-faces reloader both touch the store
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def __contains__(self, track_id: int) -> bool:
+        return track_id in self._tracks
+
+    def get(self, track_id: int) -> Optional[TrackIdentity]:
+        return self._tracks.get(track_id)
+
+    def touch(self, track_id: int, frame: int) -> TrackIdentity:
+        """Marks a track as seen in ``frame``, creating it if new."""
+        with self._lock:
+            return self._touch_locked(track_id, frame)
+
+    def _touch_locked(self, track_id: int, frame: int) -> TrackIdentity:
+        identity = self._tracks.get(track_id)
+        if identity is None:
+            identity = TrackIdentity(frame)
+            self._tracks[track_id] = identity
+            while len(self._tracks) > self.max_tracks:
+                self._tracks.popitem(last=False)
+        else:
+            self._tracks.move_to_end(track_id)
+        identity.last_seen = max(identity.last_seen, frame)
+        return identity
+
+    def needs_check(self, track_id: int, frame: int) -> bool:
+        identity = self._tracks.get(track_id)
+        if identity is None:
+            return True
+        if identity.pending_since is not None and time.monotonic() - identity.pending_since < self.identify_timeout:
+            return False
+        if identity.checks == 0:
+            return True
+        if identity.confident:
+            return False
+        return frame - identity.last_checked >= self.recheck_interval
+
+    def mark_pending(self, track_id: int, submitted: bool = True):
+        """Records that a face check for the track was handed to the face stage.
+
+        With ``submitted=False`` (stage saturated) only the identifying clock
+        is started, so the track is retried on its next frame.
+        """
+        with self._lock:
+            identity = self._tracks.get(track_id)
+            if identity is None:
+                return
+            now = time.monotonic()
+            if submitted:
+                identity.pending_since = now
+            if not identity.votes and identity.identifying_since is None:
+                identity.identifying_since = now
+
+    def clear_pending(self, track_id: int):
+        with self._lock:
+            identity = self._tracks.get(track_id)
+            if identity is not None:
+                identity.pending_since = None
+
+    def is_identifying(self, track_id: int) -> bool:
+        """True while a track with no vote yet is still within ``identify_timeout``."""
+        identity = self._tracks.get(track_id)
+        return (
+            identity is not None and not identity.votes and identity.identifying_since is not None
+            and time.monotonic() - identity.identifying_since <= self.identify_timeout
+        )
+
+    def record(
+        self,
+        track_id: int,
+        name: str,
+        distance: Optional[float],
+        frame: int,
+        intruder_id: Optional[str] = None,
+        known_intruder: bool = False
+    ) -> TrackIdentity:
+        """Adds one face check result. A check that found no face (distance None) casts no vote.
+
+        A face checked against an empty gallery (distance ``inf``) votes
+        Unknown like any other unrecognised face, without a best distance.
+
+        ``intruder_id`` tags the track with the unknown face it showed. When
+        that face is already well established in the intruder memory
+        (``known_intruder``), an Unknown track needs no further votes.
+        """
+        with self._lock:
+            identity = self._touch_locked(track_id, frame)
+            identity.checks += 1
+            identity.last_checked = max(identity.last_checked, frame)
+            identity.pending_since = None
+            if distance is not None:
+                identity.identifying_since = None
+                identity.votes[name] = identity.votes.get(name, 0) + 1
+                if distance < identity.best_distance.get(name, float("inf")):
+                    identity.best_distance[name] = distance
+                identity.confident = (
+                    sum(identity.votes.values()) >= self.min_votes
+                    and identity.confidence >= self.min_confidence
+                )
+            if intruder_id is not None:
+                if identity.intruder_id is None:
+                    identity.intruder_id = intruder_id
+                if known_intruder and identity.name == "Unknown":
+                    identity.identifying_since = None
+                    identity.confident = True
+            return identity
+
+    def evict(self, frame: int) -> int:
+        """Drops tracks not seen for ``ttl_frames``; returns how many."""
+        evicted = 0
+        with self._lock:
+            while self._tracks:
+                track_id, identity = next(iter(self._tracks.items()))
+                if frame - identity.last_seen <= self.ttl_frames:
+                    break
+                del self._tracks[track_id]
+                evicted += 1
+        return evicted
+
+    def invalidate(self, names: Iterable[str]):
+        """Forgets tracks currently identified as any of ``names`` (e.g. after a gallery change)."""
+        names = set(names)
+        with self._lock:
+            for track_id in [t for t, identity in self._tracks.items() if identity.name in names]:
+                del self._tracks[track_id]
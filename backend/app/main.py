@@ -1,8 +1,10 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 
 from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE_LATEST, render_metrics
 from app.db.base import engine, Base
 
 
@@ -17,10 +19,21 @@ async def lifespan(app: FastAPI):
     Base.metadata.create_all(bind=engine)
     print("✅ Database tables created/verified")
     
+    from app.core.services.pipeline_manager import pipeline_manager
+    if settings.PIPELINES_AUTOSTART:
+        # Opening capture devices can block for seconds, keep it off the loop
+        running = await asyncio.to_thread(pipeline_manager.sync)
+        print(f"🎥 Camera pipelines running: {sum(running.values())}/{len(running)}")
+    
     yield
     
     # Shutdown
     print("👋 Shutting down API...")
+    await asyncio.to_thread(pipeline_manager.stop_all)
+    from app.core.services.detection_workers import detection_workers
+    detection_workers.stop()
+    from app.core.services.live_state import live_state
+    await asyncio.to_thread(live_state.stop)
 
 
 # Create FastAPI application
@@ -60,6 +73,12 @@ async def health_check():
     }
 
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint (per-camera stage latencies, FPS, drops, viewers)"""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 # Include routers
 from app.api.v1.router import api_router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
@@ -0,0 +1,86 @@
+"""Benchmark face localisation inside person boxes.
+
+Usage (from backend/):
+    python scripts/benchmark_face_crop.py known_faces/*.jpg --top 0.3 0.4 0.5 --target 80 100 140
+
+Each image is treated as one person box (pass full-body or upper-body
+shots). The baseline is the old path: ``face_encodings`` over the whole box,
+which runs HOG with one upsample over every pixel. Each FaceCropper setting
+is reported with its time per face, how many faces it still finds and the
+distance between its encoding and the baseline one (< 0.1 means the
+identity decision is unaffected).
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import face_recognition  # noqa: E402
+from app.core.services.face_crop import FaceCropper  # noqa: E402
+
+
+def timed(fn, repeat: int):
+    result = None
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - started) / repeat * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("images", nargs="+")
+    parser.add_argument("--top", type=float, nargs="+", default=[0.3, 0.4, 0.5])
+    parser.add_argument("--target", type=int, nargs="+", default=[80, 100, 140])
+    parser.add_argument("--face-width", type=float, default=0.35)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = [img for img in (cv2.imread(path) for path in args.images) if img is not None]
+    if not frames:
+        sys.exit("No readable images")
+
+    baseline = []
+    total_ms = 0.0
+    for frame in frames:
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        encodings, ms = timed(lambda: face_recognition.face_encodings(rgb), args.repeat)
+        baseline.append(encodings[0] if encodings else None)
+        total_ms += ms
+    found = sum(e is not None for e in baseline)
+    print(f"{'method':>24} {'ms/face':>9} {'found':>7} {'max dist':>9}")
+    print(f"{'full box (baseline)':>24} {total_ms / len(frames):>9.1f} {found:>3}/{len(frames):<3} {'-':>9}")
+
+    for top in args.top:
+        for target in args.target:
+            cropper = FaceCropper(top_ratio=top, face_width_ratio=args.face_width, target_face_px=target, upsample=0)
+            total_ms, hits, drift = 0.0, 0, []
+            for frame, reference in zip(frames, baseline):
+                height, width = frame.shape[:2]
+
+                def run():
+                    located = cropper.locate(frame, (0, 0, width, height))
+                    if located is None:
+                        return None
+                    rgb_crop, location = located
+                    encodings = face_recognition.face_encodings(rgb_crop, known_face_locations=[location])
+                    return encodings[0] if encodings else None
+
+                encoding, ms = timed(run, args.repeat)
+                total_ms += ms
+                if encoding is not None:
+                    hits += 1
+                    if reference is not None:
+                        drift.append(float(np.linalg.norm(encoding - reference)))
+            label = f"top={top} target={target}px"
+            max_drift = f"{max(drift):.3f}" if drift else "-"
+            print(f"{label:>24} {total_ms / len(frames):>9.1f} {hits:>3}/{len(frames):<3} {max_drift:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark the IVF face index against exact gallery search.
+
+Usage (from backend/):
+    python scripts/benchmark_face_index.py --sizes 10000 50000 --nprobe 1 4 8 16
+
+Encodings are synthetic: one random identity vector per gallery entry and
+queries that are a gallery entry plus noise, scaled so same-person and
+different-person distances are in the range dlib produces (~0.35 vs ~0.9).
+Uniform random identities are a pessimistic case for IVF recall; real
+galleries cluster more and do better at the same nprobe.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.services.face_gallery import FaceGallery  # noqa: E402
+from app.core.services.face_index import IVFIndex  # noqa: E402
+
+
+def make_gallery(size: int, rng: np.random.Generator) -> np.ndarray:
+    gallery = rng.normal(size=(size, 128)).astype(np.float32)
+    gallery *= 0.65 / np.linalg.norm(gallery, axis=1, keepdims=True)
+    return gallery
+
+
+def make_queries(gallery: np.ndarray, count: int, rng: np.random.Generator):
+    truth = rng.choice(len(gallery), count, replace=False)
+    noise = rng.normal(scale=0.35 / np.sqrt(128), size=(count, 128)).astype(np.float32)
+    return gallery[truth] + noise
+
+
+def time_queries(search, queries: np.ndarray):
+    results = []
+    started = time.perf_counter()
+    for query in queries:
+        results.append(search(query))
+    elapsed = time.perf_counter() - started
+    return results, elapsed / len(queries) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--nlist", type=int, default=0, help="IVF cells, 0 = 4 * sqrt(size)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'size':>8} {'method':>14} {'ms/query':>10} {'recall@1':>9} {'build s':>8}")
+    for size in args.sizes:
+        gallery = make_gallery(size, rng)
+        queries = make_queries(gallery, min(args.queries, size), rng)
+
+        exact = FaceGallery(list(gallery), [str(i) for i in range(size)], ann=False)
+        exact_results, exact_ms = time_queries(lambda q: int(np.argmin(exact.distances(q))), queries)
+        print(f"{size:>8} {'exact':>14} {exact_ms:>10.3f} {1.0:>9.3f} {'-':>8}")
+
+        started = time.perf_counter()
+        index = IVFIndex(nlist=args.nlist or None)
+        index.build(gallery)
+        build_s = time.perf_counter() - started
+
+        for nprobe in args.nprobe:
+            results, ms = time_queries(lambda q: index.search(q, nprobe=nprobe)[0], queries)
+            recall = np.mean([a == b for a, b in zip(results, exact_results)])
+            label = f"ivf nprobe={nprobe}"
+            print(f"{size:>8} {label:>14} {ms:>10.3f} {recall:>9.3f} {build_s:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import sys
+import threading
+import time
+import types
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+try:
+    from app.core.services import detection_workers as detection_workers_module
+except ImportError:
+    # The in-process batcher pulls in the YOLO stack (torch); these tests
+    # always pass their own backend, so the default one is not needed
+    stub = types.ModuleType("app.core.services.inference_batcher")
+    stub.inference_batcher = None
+    sys.modules[stub.__name__] = stub
+    from app.core.services import detection_workers as detection_workers_module
+
+from app.core.services.frame_buffer import FrameRingBuffer
+
+DetectionWorkerPool = detection_workers_module.DetectionWorkerPool
+
+
+class BlockingBackend:
+    """``infer`` backend that holds each frame until ``gate`` is set."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.calls = []
+
+    def infer(self, camera_key, frame):
+        self.calls.append((camera_key, int(frame[0, 0])))
+        self.started.set()
+        self.gate.wait(timeout=5)
+        if frame[0, 0] == 255:
+            raise RuntimeError("bad frame")
+        return frame, [], "SAFE"
+
+
+class FutureBackend:
+    """``submit`` backend whose futures are completed by the test."""
+
+    def __init__(self):
+        self.submitted = []
+        self.lock = threading.Lock()
+
+    def submit(self, camera_key, frame):
+        future = Future()
+        with self.lock:
+            self.submitted.append((camera_key, int(frame[0, 0]), future))
+        return future
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class Results(list):
+    """Sequence numbers handed to the result callback, in order."""
+
+    def callback(self, seq, output):
+        self.append(seq)
+
+
+class TestDetectionWorkerPool:
+
+    @pytest.fixture
+    def ring(self):
+        return FrameRingBuffer(num_slots=8)
+
+    def frame(self, ring, value):
+        slot = ring.acquire_write()
+        return ring.commit(slot, np.full((4, 4), value, dtype=np.uint8))
+
+    @pytest.fixture
+    def results(self):
+        return Results()
+
+    def test_latest_frame_wins(self, ring, results):
+        backend = BlockingBackend()
+        pool = DetectionWorkerPool(num_workers=1, max_pending=4, backend=backend)
+        try:
+            pool.submit("cam", 1, self.frame(ring, 1), results.callback)
+            assert backend.started.wait(5)
+            pool.submit("cam", 2, self.frame(ring, 2), results.callback)
+            pool.submit("cam", 3, self.frame(ring, 3), results.callback)
+
+            backend.gate.set()
+            assert wait_for(lambda: results == [1, 3])
+        finally:
+            pool.stop()
+
+        assert [value for _, value in backend.calls] == [1, 3]
+        assert pool.stats("cam") == {"queued": 3, "dropped": 1, "processed": 2, "failed": 0}
+        assert ring.stats()["in_use"] == 0
+
+    def test_oldest_camera_dropped_over_max_pending(self, ring, results):
+        backend = BlockingBackend()
+        pool = DetectionWorkerPool(num_workers=1, max_pending=2, backend=backend)
+        try:
+            pool.submit("busy", 1, self.frame(ring, 1), results.callback)
+            assert backend.started.wait(5)
+            for seq, camera in enumerate(("a", "b", "c"), start=10):
+                pool.submit(camera, seq, self.frame(ring, seq), results.callback)
+
+            assert not pool.is_busy("a")
+            assert pool.is_busy("b") and pool.is_busy("c")
+            backend.gate.set()
+            assert wait_for(lambda: sorted(results) == [1, 11, 12])
+        finally:
+            pool.stop()
+
+        assert pool.stats("a")["dropped"] == 1
+        assert ring.stats()["in_use"] == 0
+
+    def test_failed_inference_releases_frame(self, ring, results):
+        backend = BlockingBackend()
+        backend.gate.set()
+        pool = DetectionWorkerPool(num_workers=1, backend=backend)
+        try:
+            pool.submit("cam", 1, self.frame(ring, 255), results.callback)
+            assert wait_for(lambda: pool.stats("cam")["failed"] == 1)
+        finally:
+            pool.stop()
+
+        assert results == []
+        assert not pool.is_busy("cam")
+        assert ring.stats()["in_use"] == 0
+
+    def test_cancel_drops_pending_frame(self, ring, results):
+        backend = BlockingBackend()
+        pool = DetectionWorkerPool(num_workers=1, backend=backend)
+        try:
+            pool.submit("cam", 1, self.frame(ring, 1), results.callback)
+            assert backend.started.wait(5)
+            pool.submit("cam", 2, self.frame(ring, 2), results.callback)
+
+            pool.cancel("cam")
+            backend.gate.set()
+            assert wait_for(lambda: results == [1])
+        finally:
+            pool.stop()
+
+        assert pool.stats("cam")["dropped"] == 1
+        assert ring.stats()["in_use"] == 0
+
+    def test_submit_backend_holds_no_worker(self, ring, results):
+        backend = FutureBackend()
+        pool = DetectionWorkerPool(num_workers=1, backend=backend)
+        try:
+            for seq, camera in enumerate(("a", "b", "c"), start=1):
+                pool.submit(camera, seq, self.frame(ring, seq), results.callback)
+            # One worker, yet every camera has a frame with the backend at once
+            assert wait_for(lambda: len(backend.submitted) == 3)
+
+            pool.submit("a", 4, self.frame(ring, 4), results.callback)
+            assert len(backend.submitted) == 3  # "a" is in flight, its next frame waits
+
+            for _, _, future in list(backend.submitted):
+                future.set_result((None, [], "SAFE"))
+            assert wait_for(lambda: len(backend.submitted) == 4)
+            backend.submitted[3][2].set_result((None, [], "SAFE"))
+            assert wait_for(lambda: sorted(results) == [1, 2, 3, 4])
+        finally:
+            pool.stop()
+
+        assert [value for camera, value, _ in backend.submitted if camera == "a"] == [1, 4]
+        assert ring.stats()["in_use"] == 0
+
+    def test_at_least_one_worker_per_detection_process(self):
+        backend = BlockingBackend()
+        backend.num_processes = 3
+
+        assert DetectionWorkerPool(num_workers=1, backend=backend).num_workers == 3
+        assert DetectionWorkerPool(num_workers=5, backend=backend).num_workers == 5
@@ -0,0 +1,69 @@
+import types
+
+import numpy as np
+import pytest
+
+from app.core.services import face_crop as face_crop_module
+from app.core.services.face_crop import FaceCropper
+
+
+class TestFaceCropper:
+
+    @pytest.fixture
+    def cropper(self):
+        return FaceCropper(top_ratio=0.4, face_width_ratio=0.35, target_face_px=100, upsample=0)
+
+    @pytest.fixture
+    def detector(self, monkeypatch):
+        """Stands in for face_recognition's HOG detector, recording each call."""
+        detector = types.SimpleNamespace(calls=[], locations=[])
+
+        def face_locations(image, number_of_times_to_upsample=1, model="hog"):
+            detector.calls.append((image.shape, number_of_times_to_upsample))
+            return detector.locations
+
+        monkeypatch.setattr(face_crop_module, "face_recognition",
+                            types.SimpleNamespace(face_locations=face_locations), raising=False)
+        monkeypatch.setattr(face_crop_module, "FACE_REC_AVAILABLE", True)
+        return detector
+
+    def test_search_region_is_upper_box(self, cropper):
+        assert cropper.search_region((100, 50, 300, 550), (720, 1280, 3)) == (100, 50, 300, 250)
+
+    def test_search_region_clipped_to_frame(self, cropper):
+        assert cropper.search_region((-20, -10, 1400, 500), (720, 1280, 3)) == (0, 0, 1280, 200)
+
+    def test_scale_for(self, cropper):
+        assert cropper.scale_for(1000) == pytest.approx(100 / 350)
+        assert cropper.scale_for(200) == 1.0  # Never enlarges
+        assert cropper.scale_for(0) == 1.0
+
+    def test_locate_maps_back_to_full_resolution(self, cropper, detector):
+        frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        # Box 1000 px wide: search region is downscaled by 100 / 350
+        detector.locations = [(10, 60, 50, 20), (0, 100, 100, 0)]
+
+        rgb, location = cropper.locate(frame, (0, 0, 1000, 2000))
+
+        scale = 100 / 350
+        assert rgb.shape == (800, 1000, 3)
+        assert detector.calls == [((int(800 * scale + 0.5), int(1000 * scale + 0.5), 3), 0)]
+        # Largest face wins, coordinates scaled back up
+        assert location == (0, int(100 / scale), int(100 / scale), 0)
+
+    def test_small_person_upsampled(self, cropper, detector):
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        assert cropper.locate(frame, (0, 0, 120, 300)) is None
+        assert detector.calls[0][1] == 1
+
+    def test_empty_region(self, cropper, detector):
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        assert cropper.locate(frame, (700, 0, 800, 100)) is None
+        assert detector.calls == []
+
+    def test_unavailable_without_face_recognition(self, cropper, monkeypatch):
+        monkeypatch.setattr(face_crop_module, "FACE_REC_AVAILABLE", False)
+
+        assert cropper.locate(np.zeros((480, 640, 3), dtype=np.uint8), (0, 0, 200, 400)) is None
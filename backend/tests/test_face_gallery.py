@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from app.core.services.face_gallery import NO_MATCH, FaceGallery, match_confidence, reported_distance
+
+
+@pytest.fixture
+def encodings():
+    rng = np.random.default_rng(0)
+    return rng.normal(0.0, 0.1, size=(20, 128)).astype(np.float32)
+
+
+@pytest.fixture
+def names():
+    return [f"person{i}" for i in range(20)]
+
+
+class TestFaceGallery:
+
+    def test_distances_match_euclidean(self, encodings, names):
+        gallery = FaceGallery(encodings, names, ann=False)
+        probe = encodings[3] + 0.01
+
+        np.testing.assert_allclose(
+            gallery.distances(probe), np.linalg.norm(encodings - probe, axis=1), rtol=1e-4, atol=1e-5
+        )
+
+    def test_match_within_tolerance(self, encodings, names):
+        gallery = FaceGallery(encodings, names, tolerance=0.5, ann=False)
+
+        name, distance = gallery.match(encodings[7] + 0.001)
+
+        assert name == "person7"
+        assert distance == pytest.approx(np.linalg.norm(np.full(128, 0.001)), abs=1e-4)
+
+    def test_match_beyond_tolerance_is_unknown(self, encodings, names):
+        gallery = FaceGallery(encodings, names, tolerance=0.5, ann=False)
+        probe = np.full(128, 5.0, dtype=np.float32)
+
+        name, distance = gallery.match(probe)
+
+        assert name == "Unknown"
+        assert distance == pytest.approx(np.linalg.norm(encodings - probe, axis=1).min(), rel=1e-4)
+
+    def test_empty_gallery(self):
+        gallery = FaceGallery(ann=False)
+
+        assert gallery.match(np.zeros(128)) == ("Unknown", NO_MATCH)
+        assert gallery.match_many(np.zeros((2, 128))) == [("Unknown", NO_MATCH)] * 2
+
+    def test_match_many_agrees_with_match(self, encodings, names):
+        gallery = FaceGallery(encodings, names, tolerance=0.3, ann=False)
+        probes = np.vstack([encodings[:5] + 0.002, np.full((1, 128), 5.0)])
+
+        many = gallery.match_many(probes)
+
+        for probe, (name, distance) in zip(probes, many):
+            expected_name, expected_distance = gallery.match(probe)
+            assert name == expected_name
+            assert distance == pytest.approx(expected_distance, abs=1e-4)
+
+    def test_build_copies_memory_mapped_source(self, encodings, names, tmp_path):
+        path = tmp_path / "encodings.npy"
+        np.save(path, encodings)
+        mapped = np.load(path, mmap_mode="r")
+
+        gallery = FaceGallery(mapped, names, ann=False)
+
+        assert not isinstance(gallery.matrix, np.memmap)
+        assert gallery.matrix.dtype == np.float32
+
+    def test_build_rejects_mismatched_names(self, encodings):
+        with pytest.raises(ValueError):
+            FaceGallery(encodings, ["only one"], ann=False)
+
+
+def test_reported_distance_and_confidence():
+    assert reported_distance(None) is None
+    assert reported_distance(NO_MATCH) is None
+    assert reported_distance(0.25) == 0.25
+    assert match_confidence(NO_MATCH) is None
+    assert match_confidence(0.25) == 0.75
+    assert match_confidence(1.5) == 0.0
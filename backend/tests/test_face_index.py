@@ -0,0 +1,76 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.core.services.face_gallery import FaceGallery
+from app.core.services.face_index import IVFIndex
+
+
+@pytest.fixture(scope="module")
+def gallery():
+    """2000 encodings around 50 identities, roughly like real face clusters."""
+    rng = np.random.default_rng(1)
+    centres = rng.normal(0.0, 0.15, size=(50, 128))
+    members = centres[rng.integers(0, 50, size=2000)] + rng.normal(0.0, 0.03, size=(2000, 128))
+    return members.astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def probes(gallery):
+    rng = np.random.default_rng(2)
+    rows = rng.choice(len(gallery), 200, replace=False)
+    return (gallery[rows] + rng.normal(0.0, 0.01, size=(200, 128))).astype(np.float32)
+
+
+def exact(gallery, probe):
+    distances = np.linalg.norm(gallery - probe, axis=1)
+    best = int(np.argmin(distances))
+    return best, float(distances[best])
+
+
+class TestIVFIndex:
+
+    def test_recall_against_exact_search(self, gallery, probes):
+        index = IVFIndex(nprobe=8)
+        index.build(gallery)
+
+        hits = sum(index.search(probe)[0] == exact(gallery, probe)[0] for probe in probes)
+
+        assert hits / len(probes) >= 0.95
+
+    def test_probing_every_cell_is_exact(self, gallery, probes):
+        index = IVFIndex(nlist=32, nprobe=32)
+        index.build(gallery)
+
+        for probe in probes[:50]:
+            row, distance = index.search(probe)
+            expected_row, expected_distance = exact(gallery, probe)
+            assert row == expected_row
+            assert distance == pytest.approx(expected_distance, abs=1e-4)
+
+    def test_every_row_indexed_once(self, gallery):
+        index = IVFIndex(nlist=40)
+        index.build(gallery)
+
+        assert len(index) == len(gallery)
+        assert sorted(index._ids.tolist()) == list(range(len(gallery)))
+        assert index._offsets[-1] == len(gallery)
+
+    def test_empty_index(self):
+        index = IVFIndex()
+        index.build(np.empty((0, 128), dtype=np.float32))
+
+        assert index.search(np.zeros(128)) == (-1, math.inf)
+
+    def test_gallery_uses_index_above_threshold(self, gallery, probes, monkeypatch):
+        monkeypatch.setattr(settings, "FACE_ANN_MIN_GALLERY", 1000)
+        names = [f"person{i}" for i in range(len(gallery))]
+
+        indexed = FaceGallery(gallery, names, tolerance=0.5, ann=True)
+        exhaustive = FaceGallery(gallery, names, tolerance=0.5, ann=False)
+
+        assert indexed.index is not None and exhaustive.index is None
+        agree = sum(indexed.match(probe)[0] == exhaustive.match(probe)[0] for probe in probes)
+        assert agree / len(probes) >= 0.95
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from app.core.services.face_store import FaceEncodingStore
+
+
+class TestFaceEncodingStore:
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        faces = tmp_path / "known_faces"
+        faces.mkdir()
+        (faces / "alice.jpg").write_bytes(b"alice")
+        (faces / "bob_2.png").write_bytes(b"bob")
+        return FaceEncodingStore(faces, tmp_path / "cache")
+
+    @pytest.fixture
+    def encoder(self):
+        calls = []
+
+        def encode(path):
+            calls.append(path)
+            return np.full(128, float(len(calls)))
+
+        encode.calls = calls
+        return encode
+
+    def test_second_sync_reuses_cache(self, store, encoder):
+        first, _ = store.sync(encoder)
+        encoder.calls.clear()
+
+        second, filenames = store.sync(encoder)
+
+        assert encoder.calls == []
+        assert filenames == ["alice.jpg", "bob_2.png"]
+        np.testing.assert_array_equal(first, second)
+        assert sorted(p.name for p in store.cache_dir.iterdir()) == ["encodings.npy", "index.json"]
+
+    def test_matrix_from_another_write_is_rejected(self, store, encoder):
+        store.sync(encoder)
+        # As if another process replaced the matrix between our two renames
+        np.save(store.matrix_path, np.full((2, 128), 99.0, dtype=np.float32))
+        encoder.calls.clear()
+
+        matrix, _ = store.sync(encoder)
+
+        assert len(encoder.calls) == 2
+        assert not (matrix == 99.0).any()
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+
+import numpy as np
+
+from app.core.services.frame_buffer import FrameRingBuffer
+
+
+def write(ring: FrameRingBuffer, value: int):
+    slot = ring.acquire_write()
+    array = slot.array if slot.array is not None else np.empty((2, 2), dtype=np.uint8)
+    array.fill(value)
+    return ring.commit(slot, array)
+
+
+class TestFrameRingBuffer:
+
+    def test_generations_increase(self):
+        ring = FrameRingBuffer(num_slots=3)
+
+        first = write(ring, 1)
+        second = write(ring, 2)
+
+        assert second.generation == first.generation + 1
+
+    def test_referenced_slot_is_not_rewritten(self):
+        ring = FrameRingBuffer(num_slots=2)
+        held = write(ring, 1)
+        write(ring, 2).release()
+
+        for value in range(3, 10):
+            write(ring, value).release()
+
+        assert (held.array == 1).all()
+        assert ring.overruns == 0
+
+    def test_released_slot_is_reused_in_place(self):
+        ring = FrameRingBuffer(num_slots=2)
+        ref = write(ring, 1)
+        array = ref.array
+        ref.release()
+
+        again = write(ring, 2)
+
+        assert again.array is array
+        assert ring.stats()["allocated"] == 1
+
+    def test_overrun_when_every_slot_is_held(self):
+        ring = FrameRingBuffer(num_slots=2)
+        held = [write(ring, 1), write(ring, 2)]
+
+        extra = write(ring, 3)
+
+        assert ring.overruns == 1
+        assert (extra.array == 3).all()
+        assert all((ref.array == value).all() for ref, value in zip(held, (1, 2)))
+
+    def test_share_keeps_slot_until_all_released(self):
+        ring = FrameRingBuffer(num_slots=2)
+        ref = write(ring, 1)
+        shared = ref.share()
+
+        ref.release()
+        ref.release()  # Releasing twice is harmless
+        assert ring.stats()["in_use"] == 1
+
+        shared.release()
+        assert ring.stats()["in_use"] == 0
+
+    def test_abort_returns_slot(self):
+        ring = FrameRingBuffer(num_slots=2)
+
+        ring.abort(ring.acquire_write())
+
+        assert ring.stats()["in_use"] == 0
+
+    def test_latest_follows_published_frames(self):
+        ring = FrameRingBuffer(num_slots=3)
+        assert ring.latest(timeout=0) is None
+
+        with write(ring, 1) as ref:
+            ring.publish(ref)
+        with ring.latest() as latest:
+            assert (latest.array == 1).all()
+            generation = latest.generation
+
+        assert ring.latest(after_generation=generation, timeout=0) is None
+
+        with write(ring, 2) as ref:
+            ring.publish(ref)
+        with ring.latest(after_generation=generation, timeout=0) as latest:
+            assert (latest.array == 2).all()
+
+        # Only the published frame is still held
+        assert ring.stats()["in_use"] == 1
+        ring.clear()
+        assert ring.stats()["in_use"] == 0
+
+    def test_latest_waits_for_publish(self):
+        ring = FrameRingBuffer(num_slots=3)
+
+        def publish_later():
+            with write(ring, 7) as ref:
+                ring.publish(ref)
+
+        timer = threading.Timer(0.05, publish_later)
+        timer.start()
+        latest = ring.latest(timeout=5)
+        timer.join()
+
+        assert latest is not None and (latest.array == 7).all()
+        latest.release()
+
+    def test_latest_async_woken_by_publish(self):
+        ring = FrameRingBuffer(num_slots=3)
+
+        async def scenario():
+            waiter = asyncio.create_task(ring.latest_async(timeout=5))
+            await asyncio.sleep(0.01)
+            with write(ring, 9) as ref:
+                await asyncio.to_thread(ring.publish, ref)
+            return await waiter
+
+        latest = asyncio.run(scenario())
+
+        assert (latest.array == 9).all()
+        latest.release()
+
+    def test_latest_async_times_out(self):
+        ring = FrameRingBuffer(num_slots=3)
+
+        assert asyncio.run(ring.latest_async(timeout=0.01)) is None
+        assert ring._async_waiters == []
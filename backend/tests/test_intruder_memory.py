@@ -0,0 +1,94 @@
+import types
+
+import numpy as np
+import pytest
+
+from app.core.services import intruder_memory as intruder_memory_module
+from app.core.services.intruder_memory import IntruderMemory
+
+
+def face(value: float) -> np.ndarray:
+    encoding = np.zeros(128, dtype=np.float32)
+    encoding[0] = value
+    return encoding
+
+
+class TestIntruderMemory:
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        clock = types.SimpleNamespace(now=1000.0)
+        clock.time = lambda: clock.now
+        monkeypatch.setattr(intruder_memory_module, "time", clock)
+        return clock
+
+    @pytest.fixture
+    def memory(self, clock):
+        return IntruderMemory(ttl=60, tolerance=0.5, alert_suppress=30, max_entries=3)
+
+    def test_returning_face_keeps_its_id(self, memory):
+        first_id, first_hits = memory.match_or_add(face(0.0), "cam-1")
+        same_id, hits = memory.match_or_add(face(0.2), "cam-2")
+
+        assert same_id == first_id
+        assert (first_hits, hits) == (1, 2)
+        assert memory.info(first_id)["first_camera"] == "cam-1"
+
+    def test_different_face_gets_new_id(self, memory):
+        first_id, _ = memory.match_or_add(face(0.0), "cam-1")
+        other_id, hits = memory.match_or_add(face(2.0), "cam-1")
+
+        assert other_id != first_id
+        assert hits == 1
+        assert len(memory) == 2
+
+    def test_face_forgotten_after_ttl(self, memory, clock):
+        first_id, _ = memory.match_or_add(face(0.0), "cam-1")
+        clock.now += 61
+
+        again_id, hits = memory.match_or_add(face(0.0), "cam-1")
+
+        assert again_id != first_id
+        assert hits == 1
+        assert memory.info(first_id) is None
+
+    def test_least_recently_seen_dropped_over_capacity(self, memory, clock):
+        ids = []
+        for value in (0.0, 2.0, 4.0):
+            ids.append(memory.match_or_add(face(value), "cam-1")[0])
+            clock.now += 1
+        memory.match_or_add(face(0.0), "cam-1")  # First face seen again
+
+        memory.match_or_add(face(6.0), "cam-1")
+        memory.claim_alerts([])  # The cap is applied on the next access
+
+        assert len(memory) == 3
+        assert memory.info(ids[1]) is None
+        assert memory.info(ids[0]) is not None
+
+    def test_alert_claimed_once_per_suppress_window(self, memory, clock):
+        assert memory.claim_alerts(["intruder-a", "intruder-b"]) == {"intruder-a", "intruder-b"}
+
+        clock.now += 10
+        assert memory.claim_alerts(["intruder-a", "intruder-c"]) == {"intruder-c"}
+
+        clock.now += 25
+        assert memory.claim_alerts(["intruder-a"]) == {"intruder-a"}
+
+    def test_claim_prunes_unknown_ids(self, memory, clock):
+        # IDs issued by another detection process are never in this memory
+        memory.claim_alerts(f"intruder-{n}" for n in range(100))
+        clock.now += 31
+
+        memory.claim_alerts(["intruder-new"])
+
+        assert list(memory._last_alerted) == ["intruder-new"]
+
+    def test_claim_keeps_alerts_of_remembered_intruders(self, memory, clock):
+        intruder_id, _ = memory.match_or_add(face(0.0), "cam-1")
+        memory.claim_alerts([intruder_id])
+        clock.now += 31
+
+        memory.claim_alerts([])
+
+        assert intruder_id in memory._last_alerted
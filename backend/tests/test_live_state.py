@@ -0,0 +1,124 @@
+import asyncio
+import json
+
+import pytest
+import redis
+
+from app.core.services.circuit_breaker import CircuitBreaker
+from app.core.services.live_state import INDEX_KEY, KEY_PREFIX, LiveStateReader
+
+
+def state_hash(count: int = 1) -> dict:
+    return {
+        b"status": b"SAFE",
+        b"count": str(count).encode(),
+        b"detections": json.dumps([]).encode(),
+        b"frame_ts": b"1000.0",
+        b"updated_at": b"1000.5",
+    }
+
+
+class FakePipeline:
+
+    def __init__(self, client):
+        self.client = client
+        self.keys = []
+
+    def hgetall(self, key):
+        self.keys.append(key)
+
+    async def execute(self):
+        self.client.round_trips += 1
+        return [self.client.hashes.get(key, {}) for key in self.keys]
+
+
+class FakeAsyncRedis:
+    """Just the calls LiveStateReader makes; ``down`` simulates an unreachable server."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.index = set()
+        self.round_trips = 0
+        self.down = False
+
+    def _call(self):
+        self.round_trips += 1
+        if self.down:
+            raise redis.ConnectionError("connection refused")
+
+    async def hgetall(self, key):
+        self._call()
+        return self.hashes.get(key, {})
+
+    async def smembers(self, key):
+        self._call()
+        return {m.encode() for m in self.index} if key == INDEX_KEY else set()
+
+    async def srem(self, key, *members):
+        self._call()
+        self.index.difference_update(members)
+
+    def pipeline(self, transaction=False):
+        if self.down:
+            raise redis.ConnectionError("connection refused")
+        return FakePipeline(self)
+
+
+class TestLiveStateReader:
+
+    @pytest.fixture
+    def client(self):
+        client = FakeAsyncRedis()
+        for camera_id in ("cam-a", "cam-b"):
+            client.hashes[f"{KEY_PREFIX}{camera_id}"] = state_hash()
+            client.index.add(camera_id)
+        client.index.add("cam-gone")  # Expired hash still listed in the index
+        return client
+
+    @pytest.fixture
+    def reader(self, client):
+        reader = LiveStateReader("redis://unused", breaker=CircuitBreaker("test", failure_threshold=2, reset_timeout=60))
+        reader._client = client
+        return reader
+
+    def test_get_all_drops_expired_cameras(self, reader, client):
+        states = asyncio.run(reader.get_all())
+
+        assert [s["camera_id"] for s in states] == ["cam-a", "cam-b"]
+        assert "cam-gone" not in client.index
+
+    def test_get_all_limited_to_camera_ids(self, reader, client):
+        states = asyncio.run(reader.get_all(["cam-b"]))
+
+        assert [s["camera_id"] for s in states] == ["cam-b"]
+        assert client.round_trips == 1  # No SMEMBERS
+
+    def test_get(self, reader):
+        state = asyncio.run(reader.get("cam-a"))
+
+        assert state["status"] == "SAFE"
+        assert state["count"] == 1
+        assert asyncio.run(reader.get("cam-missing")) is None
+
+    def test_fails_fast_while_circuit_open(self, reader, client):
+        client.down = True
+        for _ in range(2):
+            with pytest.raises(redis.ConnectionError):
+                asyncio.run(reader.get("cam-a"))
+        calls = client.round_trips
+
+        assert asyncio.run(reader.get("cam-a")) is None
+        assert asyncio.run(reader.get_all()) == []
+        assert client.round_trips == calls
+        assert reader.breaker.state == CircuitBreaker.OPEN
+
+    def test_probe_closes_circuit_once_redis_is_back(self, reader, client):
+        reader.breaker.reset_timeout = 0
+        client.down = True
+        for _ in range(2):
+            with pytest.raises(redis.ConnectionError):
+                asyncio.run(reader.get_all())
+        client.down = False
+
+        assert len(asyncio.run(reader.get_all())) == 2
+        assert reader.breaker.state == CircuitBreaker.CLOSED
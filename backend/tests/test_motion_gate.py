@@ -0,0 +1,89 @@
+import types
+
+import numpy as np
+import pytest
+
+from app.core.services import motion_gate as motion_gate_module
+from app.core.services.motion_gate import MotionGate
+
+
+def frame(value: int = 0, box: bool = False) -> np.ndarray:
+    image = np.full((240, 320, 3), value, dtype=np.uint8)
+    if box:
+        image[60:180, 80:240] = 255
+    return image
+
+
+class TestMotionGate:
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        clock = types.SimpleNamespace(now=100.0)
+        clock.monotonic = lambda: clock.now
+        monkeypatch.setattr(motion_gate_module, "time", clock)
+        return clock
+
+    @pytest.fixture
+    def gate(self, clock):
+        return MotionGate(width=80, pixel_threshold=25, min_area_ratio=0.01, force_interval=5.0)
+
+    def test_first_frame_always_processed(self, gate):
+        assert gate.should_process(frame())
+        assert gate.passed == 1
+
+    def test_static_scene_skipped(self, gate, clock):
+        gate.should_process(frame())
+        clock.now += 1
+
+        assert not gate.should_process(frame())
+        assert gate.skipped == 1
+        assert gate.last_motion_ratio == 0.0
+
+    def test_motion_passes(self, gate, clock):
+        gate.should_process(frame())
+        clock.now += 1
+
+        assert gate.should_process(frame(box=True))
+        assert gate.passed == 2
+        assert gate.last_motion_ratio > 0.2
+
+    def test_force_bypasses_gate(self, gate, clock):
+        gate.should_process(frame())
+        clock.now += 1
+
+        assert gate.should_process(frame(), force=True)
+        assert gate.skipped == 0
+
+    def test_periodic_pass_on_static_scene(self, gate, clock):
+        gate.should_process(frame())
+        clock.now += 4.9
+        assert not gate.should_process(frame())
+
+        clock.now += 0.2
+
+        assert gate.should_process(frame())
+        assert gate.forced == 1
+
+    def test_background_adapts_to_lasting_change(self, gate, clock):
+        gate.should_process(frame())
+        for _ in range(200):
+            clock.now += 0.01
+            gate.should_process(frame(box=True))
+
+        assert not gate.should_process(frame(box=True))
+
+    def test_resolution_change_resets_background(self, gate, clock):
+        gate.should_process(frame())
+        clock.now += 1
+
+        assert gate.should_process(np.zeros((480, 320, 3), dtype=np.uint8))
+
+    def test_stats(self, gate, clock):
+        gate.should_process(frame())
+        clock.now += 1
+        gate.should_process(frame())
+
+        stats = gate.stats()
+
+        assert (stats["passed"], stats["forced"], stats["skipped"]) == (1, 0, 1)
+        assert stats["skip_ratio"] == 0.5
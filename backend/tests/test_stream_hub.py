@@ -0,0 +1,52 @@
+import asyncio
+
+from app.core.services.frame_buffer import FrameRingBuffer
+from app.core.services.stream_hub import StreamHub
+
+
+class TestStreamHub:
+
+    def test_stop_ends_waiting_viewers(self):
+        """Test stopping the hub wakes a viewer blocked on get() with None."""
+        hub = StreamHub(FrameRingBuffer(num_slots=2), name="test")
+
+        async def viewer():
+            subscriber = hub.subscribe()
+            waiting = asyncio.ensure_future(subscriber.get())
+            await asyncio.sleep(0.05)
+            await asyncio.to_thread(hub.stop)
+            frame = await asyncio.wait_for(waiting, timeout=2)
+            again = await asyncio.wait_for(subscriber.get(), timeout=2)
+            hub.unsubscribe(subscriber)
+            return frame, again
+
+        assert asyncio.run(viewer()) == (None, None)
+        assert hub.subscriber_count == 0
+
+    def test_stop_drops_viewers_of_closed_loops(self):
+        """Test viewers whose event loop is gone are unsubscribed by stop()."""
+        hub = StreamHub(FrameRingBuffer(num_slots=2), name="test")
+
+        async def subscribe():
+            return hub.subscribe()
+
+        asyncio.run(subscribe())
+        hub.stop()
+
+        assert hub.subscriber_count == 0
+
+    def test_frames_after_close_are_ignored(self):
+        """Test a frame delivered after the end marker is not queued behind it."""
+        hub = StreamHub(FrameRingBuffer(num_slots=2), name="test")
+
+        async def viewer():
+            subscriber = hub.subscribe()
+            subscriber._offer(b"jpeg")
+            subscriber._offer(None)
+            subscriber._offer(b"late")
+            frames = [await subscriber.get(), await subscriber.get()]
+            hub.unsubscribe(subscriber)
+            hub.stop()
+            return frames
+
+        assert asyncio.run(viewer()) == [b"jpeg", None]
@@ -0,0 +1,132 @@
+import time
+
+from app.core.services.track_identity import TrackIdentityStore
+
+
+def make_store(**overrides):
+    options = dict(
+        max_tracks=3, ttl_frames=10, recheck_interval=5,
+        min_votes=3, min_confidence=0.6, identify_timeout=5.0
+    )
+    options.update(overrides)
+    return TrackIdentityStore(**options)
+
+
+class TestTrackIdentityStore:
+
+    def test_oldest_track_evicted_over_capacity(self):
+        store = make_store()
+        for track_id in (1, 2, 3):
+            store.touch(track_id, frame=0)
+        store.touch(1, frame=1)  # 1 becomes most recently seen
+
+        store.touch(4, frame=2)
+
+        assert 2 not in store
+        assert all(t in store for t in (1, 3, 4))
+        assert len(store) == 3
+
+    def test_tracks_past_ttl_evicted(self):
+        store = make_store()
+        store.touch(1, frame=0)
+        store.touch(2, frame=8)
+
+        assert store.evict(frame=15) == 1
+        assert 1 not in store and 2 in store
+
+    def test_confident_after_min_votes(self):
+        store = make_store()
+        store.record(1, "alice", 0.3, frame=0)
+        store.record(1, "alice", 0.4, frame=5)
+        assert not store.get(1).confident
+        assert store.needs_check(1, frame=10)
+
+        identity = store.record(1, "alice", 0.35, frame=10)
+
+        assert identity.confident
+        assert identity.name == "alice"
+        assert identity.distance == 0.3
+        assert not store.needs_check(1, frame=100)
+
+    def test_split_votes_below_confidence_keep_checking(self):
+        store = make_store()
+        for frame, name in enumerate(("alice", "bob", "alice", "bob")):
+            identity = store.record(1, name, 0.4, frame=frame * 5)
+
+        assert not identity.confident
+        assert identity.confidence == 0.5
+
+    def test_no_face_casts_no_vote(self):
+        store = make_store()
+
+        identity = store.record(1, "Unknown", None, frame=0)
+
+        assert identity.checks == 1
+        assert identity.votes == {}
+        assert identity.name == "Unknown"
+
+    def test_identifying_until_first_vote(self):
+        store = make_store()
+        store.touch(1, frame=0)
+        store.mark_pending(1)
+        assert store.is_identifying(1)
+        assert not store.needs_check(1, frame=1)
+
+        store.record(1, "alice", 0.3, frame=1)
+
+        assert not store.is_identifying(1)
+        assert store.get(1).name == "alice"
+
+    def test_identifying_times_out_to_unknown(self):
+        store = make_store(identify_timeout=0.05)
+        store.touch(1, frame=0)
+        store.mark_pending(1)
+        assert store.is_identifying(1)
+
+        time.sleep(0.1)
+
+        assert not store.is_identifying(1)
+        assert store.get(1).name == "Unknown"
+        assert store.needs_check(1, frame=1)  # The stale check no longer blocks a retry
+
+    def test_unsubmitted_check_retries_next_frame(self):
+        store = make_store()
+        store.touch(1, frame=0)
+
+        store.mark_pending(1, submitted=False)
+
+        assert store.is_identifying(1)
+        assert store.needs_check(1, frame=1)
+
+    def test_first_intruder_id_sticks(self):
+        store = make_store()
+
+        store.record(1, "Unknown", 0.9, frame=0, intruder_id="intruder-a")
+        identity = store.record(1, "Unknown", 0.8, frame=5, intruder_id="intruder-b")
+
+        assert identity.intruder_id == "intruder-a"
+        assert not identity.confident
+
+    def test_known_intruder_settles_unknown_track(self):
+        store = make_store()
+
+        identity = store.record(1, "Unknown", 0.9, frame=0, intruder_id="intruder-a", known_intruder=True)
+
+        assert identity.confident
+        assert not store.needs_check(1, frame=50)
+
+    def test_known_intruder_does_not_settle_known_face(self):
+        store = make_store()
+
+        identity = store.record(1, "alice", 0.3, frame=0, intruder_id="intruder-a", known_intruder=True)
+
+        assert not identity.confident
+
+    def test_invalidate_forgets_named_tracks(self):
+        store = make_store()
+        store.record(1, "alice", 0.3, frame=0)
+        store.record(2, "bob", 0.3, frame=0)
+
+        store.invalidate(["alice"])
+
+        assert 1 not in store and 2 in store
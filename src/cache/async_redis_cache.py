@@ -0,0 +1,278 @@
+from contextlib import asynccontextmanager
+from typing import Optional, Any, AsyncIterator, Dict, Iterable, List, Union
+import redis.asyncio as aioredis
+
+from .circuit_breaker import CircuitBreaker
+from .memory_backend import AsyncInMemoryRedis
+from .redis_cache import (
+    CachePipeline, CacheUnavailableError, Deserializer, _deserialize, _guarded, _serialize, _shared_memory_store
+)
+from ..config.settings import settings
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__, settings.log_level)
+
+
+class AsyncCachePipeline(CachePipeline):
+    """``CachePipeline`` for ``redis.asyncio`` pipelines: ``execute`` is awaited."""
+
+    async def execute(self) -> List[Any]:
+        replies = await self._pipe.execute()
+        self.results = [
+            _deserialize(reply, method) if method and reply is not None else reply
+            for reply, method in zip(replies, self._decoders)
+        ]
+        self._decoders = []
+        return self.results
+
+
+class AsyncRedisCache:
+    """asyncio counterpart of ``RedisCache`` built on ``redis.asyncio``.
+
+    Same methods, arguments and serialisation options, as coroutines, so
+    cache round trips from async endpoints and stream handlers never block
+    the event loop. Connections come from a pool shared by every coroutine
+    using the instance.
+
+    Behaves like ``RedisCache`` when Redis is down: nothing connects until
+    the first command, and every command goes through a ``CircuitBreaker``
+    so calls fail fast while the circuit is open. ``backend="memory"``
+    uses the same in-process store as the sync client.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        db: Optional[int] = None,
+        password: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        backend: Optional[str] = None,
+        client: Optional[Any] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        """
+        Initialize async Redis client settings; the pool is created lazily.
+
+        Args:
+            host: Redis host
+            port: Redis port
+            db: Redis database number
+            password: Redis password
+            max_connections: Max connections in pool
+            backend: 'redis' or 'memory'
+            client: Ready-made async client to use instead (e.g. an AsyncInMemoryRedis)
+            breaker: Circuit breaker guarding the client
+        """
+        self.host = host or settings.redis.host
+        self.port = port or settings.redis.port
+        self.db = db or settings.redis.db
+        self.password = password or settings.redis.password
+        self.max_connections = max_connections or settings.redis.max_connections
+        self.backend = backend or settings.redis.backend
+        if self.backend not in ("redis", "memory"):
+            raise ValueError(f"Unknown Redis backend: {self.backend}")
+        self.breaker = breaker or CircuitBreaker(name=f"Redis {self.host}:{self.port} (async)")
+
+        self.pool = None
+        self._client = client
+
+    @property
+    def client(self):
+        """Underlying async client, created on first use."""
+        if self._client is None:
+            self._client = self._connect()
+        return self._client
+
+    def _connect(self):
+        if self.backend == "memory":
+            logger.info("Using in-memory Redis stand-in")
+            return AsyncInMemoryRedis(_shared_memory_store())
+
+        self.pool = aioredis.ConnectionPool(
+            host=self.host,
+            port=self.port,
+            db=self.db,
+            password=self.password,
+            max_connections=self.max_connections,
+            socket_timeout=settings.redis.socket_timeout,
+            socket_connect_timeout=settings.redis.connect_timeout,
+            decode_responses=False  # We'll handle encoding
+        )
+        logger.info(f"Async Redis client ready for {self.host}:{self.port} (connects on first command)")
+        return aioredis.Redis(connection_pool=self.pool)
+
+    async def _call(self, command: str, *args, **kwargs) -> Any:
+        """Await a client command through the circuit breaker."""
+        with _guarded(self.breaker, command.upper()):
+            return await getattr(self.client, command)(*args, **kwargs)
+
+    async def ping(self) -> bool:
+        """Check the connection (also serves as a manual half-open probe)."""
+        try:
+            return bool(await self._call("ping"))
+        except Exception as e:
+            logger.error(f"Failed to connect to Redis: {e}")
+            return False
+
+    async def command(self, name: str, *args, default: Any = None) -> Any:
+        """See ``RedisCache.command``."""
+        try:
+            return await self._call(name, *args)
+        except CacheUnavailableError:
+            return default
+        except Exception as e:
+            logger.error(f"Redis {name.upper()} failed: {e}")
+            return default
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        serialize: str = "pickle"
+    ) -> bool:
+        """See ``RedisCache.set``."""
+        try:
+            serialized = _serialize(value, serialize)
+            if ttl:
+                return bool(await self._call("setex", key, ttl, serialized))
+            return bool(await self._call("set", key, serialized))
+        except CacheUnavailableError:
+            return False
+        except Exception as e:
+            logger.error(f"Redis SET failed for key '{key}': {e}")
+            return False
+
+    async def get(
+        self,
+        key: str,
+        deserialize: Deserializer = "pickle"
+    ) -> Optional[Any]:
+        """See ``RedisCache.get``."""
+        try:
+            value = await self._call("get", key)
+            if value is None:
+                return None
+            return _deserialize(value, deserialize)
+        except CacheUnavailableError:
+            return None
+        except Exception as e:
+            logger.error(f"Redis GET failed for key '{key}': {e}")
+            return None
+
+    async def delete(self, key: str) -> bool:
+        """Delete a key."""
+        try:
+            return bool(await self._call("delete", key))
+        except CacheUnavailableError:
+            return False
+        except Exception as e:
+            logger.error(f"Redis DELETE failed for key '{key}': {e}")
+            return False
+
+    async def exists(self, key: str) -> bool:
+        """Check if key exists."""
+        try:
+            return bool(await self._call("exists", key))
+        except CacheUnavailableError:
+            return False
+        except Exception as e:
+            logger.error(f"Redis EXISTS failed for key '{key}': {e}")
+            return False
+
+    async def get_many(
+        self,
+        keys: Iterable[str],
+        deserialize: Deserializer = "pickle"
+    ) -> Dict[str, Any]:
+        """See ``RedisCache.get_many``."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        try:
+            values = await self._call("mget", keys)
+        except CacheUnavailableError:
+            return {}
+        except Exception as e:
+            logger.error(f"Redis MGET failed for {len(keys)} keys: {e}")
+            return {}
+
+        found = {}
+        for key, value in zip(keys, values):
+            if value is None:
+                continue
+            try:
+                found[key] = _deserialize(value, deserialize)
+            except Exception as e:
+                logger.error(f"Redis MGET could not decode key '{key}': {e}")
+        return found
+
+    async def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Optional[Union[int, Dict[str, int]]] = None,
+        serialize: str = "pickle"
+    ) -> bool:
+        """See ``RedisCache.set_many``."""
+        if not mapping:
+            return True
+        try:
+            async with self.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    key_ttl = ttl.get(key) if isinstance(ttl, dict) else ttl
+                    pipe.set(key, value, ttl=key_ttl, serialize=serialize)
+            return all(pipe.results)
+        except CacheUnavailableError:
+            return False
+        except Exception as e:
+            logger.error(f"Redis SET failed for {len(mapping)} keys: {e}")
+            return False
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several keys with a single DEL; returns how many existed."""
+        keys = list(keys)
+        if not keys:
+            return 0
+        try:
+            return int(await self._call("delete", *keys))
+        except CacheUnavailableError:
+            return 0
+        except Exception as e:
+            logger.error(f"Redis DELETE failed for {len(keys)} keys: {e}")
+            return 0
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = True) -> AsyncIterator[AsyncCachePipeline]:
+        """
+        See ``RedisCache.pipeline``; commands are queued synchronously.
+        Raises ``CacheUnavailableError`` if the circuit is open.
+
+        Example:
+            async with cache.pipeline() as pipe:
+                pipe.set("a", 1, ttl=60)
+                pipe.delete("b")
+            pipe.results  # [True, 1]
+        """
+        pipe = self.client.pipeline(transaction=transaction)
+        wrapper = AsyncCachePipeline(pipe)
+        try:
+            yield wrapper
+            with _guarded(self.breaker, "pipeline"):
+                await wrapper.execute()
+        finally:
+            await pipe.reset()
+
+    async def close(self) -> None:
+        """Close the client and disconnect the pool."""
+        if self._client is None:
+            return
+        try:
+            # aclose() replaced close() in redis 5.0.1
+            closer = getattr(self._client, "aclose", None) or self._client.close
+            await closer()
+            if self.pool is not None:
+                await self.pool.disconnect()
+            logger.info("Redis connection closed")
+        except Exception as e:
+            logger.error(f"Error closing Redis connection: {e}")
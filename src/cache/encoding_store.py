@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+from ..config.settings import settings
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__, settings.log_level)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def file_sha1(path: str) -> str:
+    """
+    Content hash of a file, read in 1 MB chunks.
+
+    Args:
+        path: File path
+
+    Returns:
+        Hex SHA-1 digest
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def matrix_sha1(matrix: np.ndarray) -> str:
+    """
+    Content hash of an array's raw bytes.
+
+    Args:
+        matrix: Array to hash
+
+    Returns:
+        Hex SHA-1 digest
+    """
+    return hashlib.sha1(np.ascontiguousarray(matrix).data).hexdigest()
+
+
+class EncodingStore:
+    """On-disk known-face encoding cache keyed by image content hash.
+
+    The index records the matrix's shape and checksum, so a matrix and
+    index left over from different writes are rejected and rebuilt.
+    """
+
+    VERSION = 2
+
+    def __init__(self, faces_dir: str = "known_faces", cache_dir: Optional[str] = None):
+        """
+        Initialize encoding store.
+
+        Args:
+            faces_dir: Directory of enrolment images
+            cache_dir: Where ``encodings.npy`` and ``index.json`` are kept
+        """
+        self.faces_dir = Path(faces_dir)
+        self.cache_dir = Path(cache_dir or settings.cache.encoding_dir)
+        self.matrix_path = self.cache_dir / "encodings.npy"
+        self.index_path = self.cache_dir / "index.json"
+
+    def _load(self) -> Tuple[Dict[str, dict], np.ndarray]:
+        """Read the index and memory-map the encoding matrix."""
+        empty = np.empty((0, 128), dtype=np.float32)
+        if not self.index_path.exists() or not self.matrix_path.exists():
+            return {}, empty
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") != self.VERSION:
+                return {}, empty
+            matrix = np.load(self.matrix_path, mmap_mode="r")
+            if list(matrix.shape) != index.get("shape") or matrix_sha1(matrix) != index.get("matrix_sha1"):
+                logger.warning("Encoding cache index does not match its matrix, rebuilding")
+                return {}, empty
+            return index.get("entries", {}), matrix
+        except Exception as e:
+            logger.warning(f"Encoding cache unreadable, rebuilding: {e}")
+            return {}, empty
+
+    def _save(self, entries: Dict[str, dict], matrix: np.ndarray) -> None:
+        """Write both files via temp files + rename; ``_load`` rejects a mismatched pair."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Per-PID temp names so concurrent processes never write the same file
+        tmp_matrix = self.cache_dir / f"encodings.{os.getpid()}.tmp.npy"
+        tmp_index = self.cache_dir / f"index.{os.getpid()}.tmp.json"
+        np.save(tmp_matrix, matrix)
+        with open(tmp_index, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": self.VERSION,
+                "shape": list(matrix.shape),
+                "matrix_sha1": matrix_sha1(matrix),
+                "entries": entries,
+            }, f)
+        os.replace(tmp_matrix, self.matrix_path)
+        os.replace(tmp_index, self.index_path)
+
+    def sync(self, encode: Callable[[str], Optional[np.ndarray]]) -> Tuple[np.ndarray, List[str]]:
+        """
+        Bring the cache in line with the faces directory.
+
+        Only new or changed images are passed to ``encode``; files whose
+        size and mtime are unchanged are not re-hashed. Images without a
+        face are remembered (row -1) so they are not retried on every start.
+
+        Args:
+            encode: Returns the encoding for an image path, or None if no face
+
+        Returns:
+            (matrix, filenames): float32 encodings and the image of each row
+        """
+        if not self.faces_dir.exists():
+            return np.empty((0, 128), dtype=np.float32), []
+
+        cached, cached_matrix = self._load()
+        entries: Dict[str, dict] = {}
+        rows: List[np.ndarray] = []
+        filenames: List[str] = []
+        encoded = reused = 0
+        changed = False
+
+        for filename in sorted(os.listdir(self.faces_dir)):
+            if not filename.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            path = str(self.faces_dir / filename)
+            try:
+                stat = os.stat(path)
+                previous = cached.get(filename)
+                same_stat = bool(previous) and previous["size"] == stat.st_size and previous["mtime"] == stat.st_mtime
+                sha1 = previous["sha1"] if same_stat else file_sha1(path)
+
+                if previous and previous["sha1"] == sha1 and previous["row"] < len(cached_matrix):
+                    encoding = cached_matrix[previous["row"]] if previous["row"] >= 0 else None
+                    reused += 1
+                    changed = changed or not same_stat
+                else:
+                    encoding = encode(path)
+                    encoded += 1
+                    changed = True
+            except Exception as e:
+                logger.error(f"Error loading {filename}: {e}")
+                changed = True
+                continue
+
+            row = -1
+            if encoding is not None:
+                row = len(rows)
+                rows.append(np.asarray(encoding, dtype=np.float32))
+                filenames.append(filename)
+            entries[filename] = {"sha1": sha1, "size": stat.st_size, "mtime": stat.st_mtime, "row": row}
+
+        changed = changed or bool(set(cached) - set(entries))
+        matrix = np.stack(rows) if rows else np.empty((0, 128), dtype=np.float32)
+        # Drop the memory map before the files are replaced (required on Windows)
+        rows = cached_matrix = encoding = None
+        if changed:
+            try:
+                self._save(entries, matrix)
+            except OSError as e:
+                logger.warning(f"Could not write encoding cache: {e}")
+
+        logger.info(f"Encodings: {reused} from cache, {encoded} encoded")
+        return matrix, filenames
@@ -1,27 +1,104 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Set, Tuple
+import json
+import pickle
+import struct
 import numpy as np
 from datetime import datetime
 
 from .redis_cache import RedisCache
+from .tiered_cache import TieredCache
 from ..config.settings import settings
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__, settings.log_level)
 
+# Binary entry layout: header, raw little-endian float32 encoding, JSON metadata
+_MAGIC = b"FE"
+_VERSION = 1
+_HEADER = struct.Struct("<2sBHI")  # magic, version, dimensions, metadata length
+
+
+def pack_face(encoding: np.ndarray, metadata: Optional[Dict[str, Any]] = None, cached_at: Optional[str] = None) -> bytes:
+    """
+    Serialize a face encoding and its metadata into the compact binary format.
+
+    Args:
+        encoding: Face encoding vector
+        metadata: Optional metadata (must be JSON serializable)
+        cached_at: ISO timestamp, defaults to now
+
+    Returns:
+        Header + float32 bytes + UTF-8 JSON
+    """
+    vector = np.ascontiguousarray(encoding, dtype="<f4").ravel()
+    meta = json.dumps({
+        "metadata": metadata or {},
+        "cached_at": cached_at or datetime.utcnow().isoformat()
+    }, separators=(",", ":")).encode("utf-8")
+    return _HEADER.pack(_MAGIC, _VERSION, vector.size, len(meta)) + vector.tobytes() + meta
+
+
+def unpack_face(payload: bytes) -> Dict[str, Any]:
+    """
+    Deserialize an entry written by ``pack_face``.
+
+    Entries pickled by older versions of FaceCache are still understood.
+
+    Args:
+        payload: Raw value stored in Redis
+
+    Returns:
+        Dict with ``encoding`` (float32 array), ``metadata`` and ``cached_at``
+    """
+    if payload[:2] != _MAGIC:
+        legacy = pickle.loads(payload)
+        legacy["encoding"] = np.asarray(legacy["encoding"], dtype=np.float32)
+        return legacy
+    _, version, dims, meta_len = _HEADER.unpack_from(payload)
+    if version != _VERSION:
+        raise ValueError(f"Unsupported face entry version: {version}")
+    offset = _HEADER.size
+    # Copy so callers get a writable array independent of the payload
+    encoding = np.frombuffer(payload, dtype="<f4", count=dims, offset=offset).astype(np.float32)
+    offset += dims * 4
+    entry = json.loads(payload[offset:offset + meta_len].decode("utf-8"))
+    entry["encoding"] = encoding
+    return entry
+
+
 class FaceCache:
-    """Distributed face encoding cache using Redis."""
-    
+    """Distributed face encoding cache using Redis.
+
+    Each face is one key holding ``pack_face`` bytes (about 590 bytes for a
+    128-d encoding). Cached face IDs are also kept in an index set, so the
+    gallery can be enumerated and loaded in bulk without a ``KEYS`` scan.
+
+    With ``CACHE_LOCAL_ENABLED`` (or a ``TieredCache`` passed in), decoded
+    entries are also kept in process, so repeated lookups skip both the
+    round trip and the decoding. Entries may then be shared between
+    callers: treat them as read-only.
+    """
+
+    # Commands per pipeline round trip for bulk operations
+    BATCH_SIZE = 1000
+
     def __init__(self, redis_client: Optional[RedisCache] = None):
         """
         Initialize face cache.
-        
+
         Args:
-            redis_client: Redis client instance
+            redis_client: Redis client instance (``RedisCache`` or ``TieredCache``)
         """
-        self.redis = redis_client or RedisCache()
+        if redis_client is None:
+            redis_client = TieredCache() if settings.cache.local_enabled else RedisCache()
+        self.redis = redis_client
         self.ttl = settings.cache.face_ttl
         self.key_prefix = "face:"
-    
+        self.index_key = f"{self.key_prefix}index"
+
+    def _key(self, face_id: str) -> str:
+        return f"{self.key_prefix}{face_id}"
+
     def cache_face(
         self,
         face_id: str,
@@ -30,69 +107,144 @@ class FaceCache:
     ) -> bool:
         """
         Cache a face encoding.
-        
+
         Args:
             face_id: Unique face identifier
             encoding: Face encoding vector (numpy array)
             metadata: Optional metadata (name, last_seen, etc.)
-            
+
         Returns:
             True if cached successfully
         """
-        try:
-            cache_data = {
-                "encoding": encoding.tolist(),  # Convert numpy to list
-                "metadata": metadata or {},
-                "cached_at": datetime.utcnow().isoformat()
-            }
-            
-            key = f"{self.key_prefix}{face_id}"
-            success = self.redis.set(key, cache_data, ttl=self.ttl)
-            
-            if success:
-                logger.debug(f"Cached face: {face_id}")
-            else:
-                logger.warning(f"Failed to cache face: {face_id}")
-            
-            return success
-            
-        except Exception as e:
-            logger.error(f"Error caching face {face_id}: {e}")
-            return False
-    
+        success = self.cache_many({face_id: (encoding, metadata)}) == 1
+        if success:
+            logger.debug(f"Cached face: {face_id}")
+        else:
+            logger.warning(f"Failed to cache face: {face_id}")
+        return success
+
+    def cache_many(self, faces: Dict[str, Tuple[np.ndarray, Optional[Dict[str, Any]]]]) -> int:
+        """
+        Cache several face encodings in pipelined round trips.
+
+        Args:
+            faces: Mapping of face_id -> (encoding, metadata)
+
+        Returns:
+            Number of faces cached
+        """
+        items = list(faces.items())
+        cached = 0
+        cached_at = datetime.utcnow().isoformat()
+        for start in range(0, len(items), self.BATCH_SIZE):
+            batch = items[start:start + self.BATCH_SIZE]
+            try:
+                with self.redis.pipeline(transaction=False) as pipe:
+                    for face_id, (encoding, metadata) in batch:
+                        pipe.set(self._key(face_id), pack_face(encoding, metadata, cached_at), ttl=self.ttl, serialize="raw")
+                    pipe.sadd(self.index_key, *[face_id for face_id, _ in batch])
+                cached += sum(1 for ok in pipe.results[:-1] if ok)
+            except Exception as e:
+                logger.error(f"Error caching {len(batch)} faces: {e}")
+        return cached
+
     def get_face(self, face_id: str) -> Optional[Dict[str, Any]]:
         """
         Get cached face encoding.
-        
+
         Args:
             face_id: Face identifier
-            
+
         Returns:
             Dict with encoding and metadata, or None
         """
         try:
-            key = f"{self.key_prefix}{face_id}"
-            cached = self.redis.get(key)
-            
+            cached = self.redis.get(self._key(face_id), deserialize=unpack_face)
+
             if cached:
-                # Convert encoding back to numpy array
-                cached["encoding"] = np.array(cached["encoding"])
                 logger.debug(f"Cache HIT: {face_id}")
                 return cached
             else:
                 logger.debug(f"Cache MISS: {face_id}")
                 return None
-                
+
         except Exception as e:
             logger.error(f"Error getting face {face_id}: {e}")
             return None
-    
+
+    def get_many(self, face_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several cached faces with one MGET per batch.
+
+        Args:
+            face_ids: Face identifiers
+
+        Returns:
+            Dict of face_id -> entry for the faces found
+        """
+        face_ids = list(face_ids)
+        found: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(face_ids), self.BATCH_SIZE):
+            batch = face_ids[start:start + self.BATCH_SIZE]
+            values = self.redis.get_many([self._key(face_id) for face_id in batch], deserialize=unpack_face)
+            for face_id in batch:
+                entry = values.get(self._key(face_id))
+                if entry is not None:
+                    found[face_id] = entry
+        return found
+
+    def face_ids(self) -> Set[str]:
+        """IDs of all indexed faces (entries may have expired since)."""
+        return {
+            member.decode("utf-8") if isinstance(member, bytes) else member
+            for member in self.redis.command("smembers", self.index_key, default=set())
+        }
+
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load every cached face: one SMEMBERS plus one MGET per batch.
+
+        IDs whose entry has expired are dropped from the index on the way.
+        An ID is only dropped once Redis confirms its key is gone, so a
+        failed fetch never empties the index.
+
+        Returns:
+            Dict of face_id -> entry
+        """
+        face_ids = self.face_ids()
+        found = self.get_many(face_ids)
+        expired = self._confirm_expired([face_id for face_id in face_ids if face_id not in found])
+        if expired:
+            self.redis.command("srem", self.index_key, *expired)
+        logger.debug(f"Loaded {len(found)} cached faces")
+        return found
+
+    def _confirm_expired(self, face_ids: List[str]) -> List[str]:
+        """The subset of ``face_ids`` whose key no longer exists (pipelined EXISTS)."""
+        expired: List[str] = []
+        for start in range(0, len(face_ids), self.BATCH_SIZE):
+            batch = face_ids[start:start + self.BATCH_SIZE]
+            try:
+                with self.redis.pipeline(transaction=False) as pipe:
+                    for face_id in batch:
+                        pipe.exists(self._key(face_id))
+            except Exception as e:
+                logger.warning(f"Could not check {len(face_ids) - start} missing faces, index kept: {e}")
+                break
+            expired.extend(face_id for face_id, exists in zip(batch, pipe.results) if not exists)
+        return expired
+
     def delete_face(self, face_id: str) -> bool:
         """Delete a cached face."""
-        key = f"{self.key_prefix}{face_id}"
-        return self.redis.delete(key)
-    
+        try:
+            with self.redis.pipeline(transaction=False) as pipe:
+                pipe.delete(self._key(face_id))
+                pipe.srem(self.index_key, face_id)
+            return bool(pipe.results[0])
+        except Exception as e:
+            logger.error(f"Error deleting face {face_id}: {e}")
+            return False
+
     def face_exists(self, face_id: str) -> bool:
         """Check if face is cached."""
-        key = f"{self.key_prefix}{face_id}"
-        return self.redis.exists(key)
+        return self.redis.exists(self._key(face_id))
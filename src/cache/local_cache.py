@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ..config.settings import settings
+
+_MISSING = object()
+
+
+class LocalCache:
+    """In-process LRU cache with a per-entry TTL.
+
+    Holds at most ``max_size`` entries; the least recently used is evicted
+    first, and entries older than ``ttl`` seconds are treated as misses.
+    Every invalidation bumps a generation counter, so a reader can tell
+    whether an entry was invalidated while it was fetching the value
+    (see ``set_if_generation``).
+    """
+
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Initialize local cache.
+
+        Args:
+            max_size: Maximum number of entries
+            ttl: Seconds an entry stays valid, 0 = no expiry
+        """
+        self.max_size = max_size or settings.cache.local_max_size
+        self.ttl = settings.cache.local_ttl if ttl is None else ttl
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Cached value, or ``default`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, stored_at = entry
+            if self.ttl and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._set_locked(key, value)
+
+    def set_if_generation(self, key: str, value: Any, generation: int) -> bool:
+        """Stores ``value`` only if nothing was invalidated since ``generation`` was read."""
+        with self._lock:
+            if self.generation != generation:
+                return False
+            self._set_locked(key, value)
+            return True
+
+    def _set_locked(self, key: str, value: Any) -> None:
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        return self.delete_many([key]) > 0
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Invalidate keys; returns how many were cached."""
+        with self._lock:
+            self.generation += 1
+            return sum(1 for key in keys if self._entries.pop(key, _MISSING) is not _MISSING)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
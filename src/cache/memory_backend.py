@@ -0,0 +1,271 @@
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import redis
+
+
+def _b(value: Union[bytes, str, int, float]) -> bytes:
+    """Values as redis-py returns them with ``decode_responses=False``."""
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode("utf-8")
+
+
+class InMemoryRedis:
+    """In-process stand-in for the subset of ``redis.Redis`` the caches use.
+
+    Strings (with expiry), sets, hashes, pipelines and pub/sub, guarded by
+    one lock. Data lives only as long as the instance, within one process;
+    meant for running without a Redis server (tests, benchmarks, or
+    ``REDIS_BACKEND=memory`` on a single-process deployment).
+    """
+
+    def __init__(self):
+        self._data: Dict[bytes, Any] = {}
+        self._expires: Dict[bytes, float] = {}
+        self._subscribers: Dict[bytes, List["InMemoryPubSub"]] = {}
+        self._lock = threading.RLock()
+
+    # ----- internals -----
+
+    def _alive(self, key: bytes) -> bool:
+        expires = self._expires.get(key)
+        if expires is not None and time.monotonic() >= expires:
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+            return False
+        return key in self._data
+
+    def _lookup(self, key, kind: type, create: bool = False):
+        key = _b(key)
+        if not self._alive(key):
+            if not create:
+                return None
+            self._data[key] = kind()
+        value = self._data[key]
+        if not isinstance(value, kind):
+            raise redis.ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    # ----- connection -----
+
+    def ping(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+    def pipeline(self, transaction: bool = True) -> "InMemoryPipeline":
+        return InMemoryPipeline(self)
+
+    # ----- keys & strings -----
+
+    def get(self, key) -> Optional[bytes]:
+        with self._lock:
+            return self._lookup(key, bytes)
+
+    def mget(self, keys: Iterable) -> List[Optional[bytes]]:
+        with self._lock:
+            return [self._lookup(key, bytes) for key in keys]
+
+    def set(self, key, value, ex: Optional[int] = None) -> bool:
+        with self._lock:
+            key = _b(key)
+            self._data[key] = _b(value)
+            self._expires.pop(key, None)
+            if ex:
+                self._expires[key] = time.monotonic() + ex
+            return True
+
+    def setex(self, key, ttl: int, value) -> bool:
+        return self.set(key, value, ex=ttl)
+
+    def delete(self, *keys) -> int:
+        with self._lock:
+            deleted = 0
+            for key in map(_b, keys):
+                if self._alive(key):
+                    deleted += 1
+                self._data.pop(key, None)
+                self._expires.pop(key, None)
+            return deleted
+
+    def exists(self, *keys) -> int:
+        with self._lock:
+            return sum(1 for key in map(_b, keys) if self._alive(key))
+
+    def expire(self, key, ttl: int) -> bool:
+        with self._lock:
+            key = _b(key)
+            if not self._alive(key):
+                return False
+            self._expires[key] = time.monotonic() + ttl
+            return True
+
+    def ttl(self, key) -> int:
+        with self._lock:
+            key = _b(key)
+            if not self._alive(key):
+                return -2
+            expires = self._expires.get(key)
+            return -1 if expires is None else max(0, int(round(expires - time.monotonic())))
+
+    # ----- sets -----
+
+    def sadd(self, key, *members) -> int:
+        with self._lock:
+            members_set: Set[bytes] = self._lookup(key, set, create=True)
+            before = len(members_set)
+            members_set.update(map(_b, members))
+            return len(members_set) - before
+
+    def srem(self, key, *members) -> int:
+        with self._lock:
+            members_set = self._lookup(key, set)
+            if members_set is None:
+                return 0
+            removed = sum(1 for m in map(_b, members) if m in members_set)
+            members_set.difference_update(map(_b, members))
+            return removed
+
+    def smembers(self, key) -> Set[bytes]:
+        with self._lock:
+            return set(self._lookup(key, set) or ())
+
+    # ----- hashes -----
+
+    def hset(self, key, field=None, value=None, mapping: Optional[Dict] = None) -> int:
+        with self._lock:
+            fields: Dict[bytes, bytes] = self._lookup(key, dict, create=True)
+            items = dict(mapping or {})
+            if field is not None:
+                items[field] = value
+            added = sum(1 for f in items if _b(f) not in fields)
+            fields.update({_b(f): _b(v) for f, v in items.items()})
+            return added
+
+    def hgetall(self, key) -> Dict[bytes, bytes]:
+        with self._lock:
+            return dict(self._lookup(key, dict) or {})
+
+    # ----- pub/sub -----
+
+    def publish(self, channel, message) -> int:
+        with self._lock:
+            subscribers = list(self._subscribers.get(_b(channel), ()))
+        for subscriber in subscribers:
+            subscriber._deliver(_b(channel), _b(message))
+        return len(subscribers)
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> "InMemoryPubSub":
+        return InMemoryPubSub(self, ignore_subscribe_messages)
+
+
+class InMemoryPipeline:
+    """Queues commands and applies them under the store lock on ``execute``."""
+
+    def __init__(self, store: InMemoryRedis):
+        self._store = store
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        if not callable(getattr(self._store, name, None)) or name.startswith("_"):
+            raise AttributeError(name)
+
+        def queue_command(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+        return queue_command
+
+    def execute(self) -> List[Any]:
+        commands, self._commands = self._commands, []
+        # All-or-nothing visibility to other clients, like MULTI/EXEC
+        with self._store._lock:
+            return [getattr(self._store, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+    def reset(self) -> None:
+        self._commands = []
+
+
+class InMemoryPubSub:
+    """Subscription delivering messages published on the same ``InMemoryRedis``."""
+
+    def __init__(self, store: InMemoryRedis, ignore_subscribe_messages: bool = False):
+        self._store = store
+        self._ignore_subscribe_messages = ignore_subscribe_messages
+        self._messages: "queue.Queue[dict]" = queue.Queue()
+        self._channels: Set[bytes] = set()
+
+    def subscribe(self, *channels) -> None:
+        with self._store._lock:
+            for channel in map(_b, channels):
+                self._channels.add(channel)
+                self._store._subscribers.setdefault(channel, []).append(self)
+                if not self._ignore_subscribe_messages:
+                    self._messages.put({"type": "subscribe", "channel": channel, "data": len(self._channels)})
+
+    def _deliver(self, channel: bytes, data: bytes) -> None:
+        self._messages.put({"type": "message", "channel": channel, "data": data})
+
+    def get_message(self, timeout: float = 0.0) -> Optional[dict]:
+        try:
+            return self._messages.get(timeout=timeout) if timeout else self._messages.get_nowait()
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        with self._store._lock:
+            for channel in self._channels:
+                subscribers = self._store._subscribers.get(channel, [])
+                if self in subscribers:
+                    subscribers.remove(self)
+            self._channels.clear()
+
+
+class AsyncInMemoryRedis:
+    """``redis.asyncio`` flavour of ``InMemoryRedis``: the same commands, awaited.
+
+    Wraps an ``InMemoryRedis`` (a new one by default), so a sync and an
+    async client can share one store.
+    """
+
+    def __init__(self, store: Optional[InMemoryRedis] = None):
+        self.store = store or InMemoryRedis()
+
+    def __getattr__(self, name: str):
+        command = getattr(self.store, name)
+        if name.startswith("_") or not callable(command):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            return command(*args, **kwargs)
+        return call
+
+    def pipeline(self, transaction: bool = True) -> "AsyncInMemoryPipeline":
+        return AsyncInMemoryPipeline(self.store.pipeline(transaction))
+
+    async def aclose(self) -> None:
+        pass
+
+
+class AsyncInMemoryPipeline:
+    """``InMemoryPipeline`` whose ``execute`` and ``reset`` are awaited, as in ``redis.asyncio``."""
+
+    def __init__(self, pipe: InMemoryPipeline):
+        self._pipe = pipe
+
+    def __getattr__(self, name: str):
+        command = getattr(self._pipe, name)
+
+        def queue_command(*args, **kwargs):
+            command(*args, **kwargs)
+            return self
+        return queue_command
+
+    async def execute(self) -> List[Any]:
+        return self._pipe.execute()
+
+    async def reset(self) -> None:
+        self._pipe.reset()
@@ -1,16 +1,157 @@
-from typing import Optional, Any
+from contextlib import contextmanager
+from typing import Optional, Any, Callable, Dict, Iterable, Iterator, List, Union
+import threading
 import redis
 from redis.connection import ConnectionPool
 import pickle
 import json
 
+from .circuit_breaker import CircuitBreaker
+from .memory_backend import InMemoryRedis
 from ..config.settings import settings
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__, settings.log_level)
 
+# Errors that mean Redis itself is unreachable or unhealthy (count towards the breaker)
+CONNECTION_ERRORS = (redis.ConnectionError, redis.TimeoutError, OSError)
+
+# Shared by every RedisCache using the "memory" backend without its own client,
+# the way separate clients share one server
+_memory_store: Optional[InMemoryRedis] = None
+_memory_lock = threading.Lock()
+
+
+def _shared_memory_store() -> InMemoryRedis:
+    global _memory_store
+    with _memory_lock:
+        if _memory_store is None:
+            _memory_store = InMemoryRedis()
+        return _memory_store
+
+
+class CacheUnavailableError(redis.ConnectionError):
+    """Raised instead of contacting Redis while the circuit breaker is open."""
+
+
+@contextmanager
+def _guarded(breaker: CircuitBreaker, what: str) -> Iterator[None]:
+    """
+    Run the block as one Redis call through ``breaker``.
+
+    Connection errors count as failures. Any reply, including an error
+    reply such as WRONGTYPE, proves the server reachable and counts as a
+    success. Anything else ends a half-open probe without a verdict.
+    """
+    if not breaker.allow():
+        raise CacheUnavailableError(f"Redis circuit open, {what} skipped")
+    try:
+        yield
+    except CONNECTION_ERRORS:
+        breaker.record_failure()
+        raise
+    except redis.RedisError:
+        breaker.record_success()
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record_success()
+
+
+def _serialize(value: Any, method: str) -> bytes:
+    """Encode a value with 'pickle', 'json' or 'raw' (bytes stored as-is)."""
+    if method == "pickle":
+        return pickle.dumps(value)
+    elif method == "json":
+        return json.dumps(value).encode('utf-8')
+    elif method == "raw":
+        return bytes(value)
+    raise ValueError(f"Unknown serialization: {method}")
+
+
+# A method name, or a callable decoding the raw bytes
+Deserializer = Union[str, Callable[[bytes], Any]]
+
+
+def _deserialize(value: bytes, method: Deserializer) -> Any:
+    """Inverse of ``_serialize``."""
+    if callable(method):
+        return method(value)
+    if method == "pickle":
+        return pickle.loads(value)
+    elif method == "json":
+        return json.loads(value.decode('utf-8'))
+    elif method == "raw":
+        return value
+    raise ValueError(f"Unknown deserialization: {method}")
+
+
+class CachePipeline:
+    """
+    Batch of commands sent in one round trip, with RedisCache serialisation.
+
+    ``set``/``get``/``delete`` take the same options as on RedisCache; any
+    other Redis command (``sadd``, ``expire``...) is queued as-is. After the
+    ``with`` block, ``results`` holds the reply of each command in order and
+    ``keys`` the keys written with ``set``/``delete``.
+    """
+
+    def __init__(self, pipe):
+        self._pipe = pipe
+        self._decoders: List[Optional[Deserializer]] = []
+        self.results: List[Any] = []
+        self.keys: List[str] = []
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, serialize: str = "pickle") -> "CachePipeline":
+        self._pipe.set(key, _serialize(value, serialize), ex=ttl or None)
+        self._decoders.append(None)
+        self.keys.append(key)
+        return self
+
+    def get(self, key: str, deserialize: Deserializer = "pickle") -> "CachePipeline":
+        self._pipe.get(key)
+        self._decoders.append(deserialize)
+        return self
+
+    def delete(self, *keys: str) -> "CachePipeline":
+        self._pipe.delete(*keys)
+        self._decoders.append(None)
+        self.keys.extend(keys)
+        return self
+
+    def __getattr__(self, name: str):
+        command = getattr(self._pipe, name)
+
+        def queue(*args, **kwargs):
+            command(*args, **kwargs)
+            self._decoders.append(None)
+            return self
+        return queue
+
+    def execute(self) -> List[Any]:
+        """Send the queued commands; ``get`` replies come back deserialized."""
+        replies = self._pipe.execute()
+        self.results = [
+            _deserialize(reply, method) if method and reply is not None else reply
+            for reply, method in zip(replies, self._decoders)
+        ]
+        self._decoders = []
+        return self.results
+
+
 class RedisCache:
-    """Redis client wrapper with connection pooling."""
+    """Redis client wrapper with connection pooling.
+
+    Nothing connects until the first command. Every command goes through a
+    ``CircuitBreaker``: after ``REDIS_BREAKER_THRESHOLD`` consecutive
+    connection errors, calls fail fast (returning their miss/failure value
+    without waiting on a socket) for ``REDIS_BREAKER_COOLDOWN`` seconds,
+    then a single probe decides whether to resume.
+
+    With ``backend="memory"`` (``REDIS_BACKEND=memory``) an in-process
+    ``InMemoryRedis`` stands in for the server.
+    """
     
     def __init__(
         self,
@@ -18,10 +159,13 @@ class RedisCache:
         port: Optional[int] = None,
         db: Optional[int] = None,
         password: Optional[str] = None,
-        max_connections: Optional[int] = None
+        max_connections: Optional[int] = None,
+        backend: Optional[str] = None,
+        client: Optional[Any] = None,
+        breaker: Optional[CircuitBreaker] = None
     ):
         """
-        Initialize Redis client with connection pool.
+        Initialize Redis client settings; the connection is made lazily.
         
         Args:
             host: Redis host
@@ -29,12 +173,37 @@ class RedisCache:
             db: Redis database number
             password: Redis password
             max_connections: Max connections in pool
+            backend: 'redis' or 'memory'
+            client: Ready-made client to use instead (e.g. a private InMemoryRedis)
+            breaker: Circuit breaker guarding the client
         """
         self.host = host or settings.redis.host
         self.port = port or settings.redis.port
         self.db = db or settings.redis.db
         self.password = password or settings.redis.password
         self.max_connections = max_connections or settings.redis.max_connections
+        self.backend = backend or settings.redis.backend
+        if self.backend not in ("redis", "memory"):
+            raise ValueError(f"Unknown Redis backend: {self.backend}")
+        self.breaker = breaker or CircuitBreaker(name=f"Redis {self.host}:{self.port}")
+        
+        self.pool = None
+        self._client = client
+        self._connect_lock = threading.Lock()
+    
+    @property
+    def client(self):
+        """Underlying client, created on first use."""
+        if self._client is None:
+            with self._connect_lock:
+                if self._client is None:
+                    self._client = self._connect()
+        return self._client
+    
+    def _connect(self):
+        if self.backend == "memory":
+            logger.info("Using in-memory Redis stand-in")
+            return _shared_memory_store()
         
         # Create connection pool
         self.pool = ConnectionPool(
@@ -44,18 +213,43 @@ class RedisCache:
             password=self.password,
             max_connections=self.max_connections,
             socket_timeout=settings.redis.socket_timeout,
+            socket_connect_timeout=settings.redis.connect_timeout,
             decode_responses=False  # We'll handle encoding
         )
-        
-        self.client = redis.Redis(connection_pool=self.pool)
-        
-        # Test connection
+        logger.info(f"Redis client ready for {self.host}:{self.port} (connects on first command)")
+        return redis.Redis(connection_pool=self.pool)
+    
+    def _call(self, command: str, *args, **kwargs) -> Any:
+        """Run a client command through the circuit breaker."""
+        with _guarded(self.breaker, command.upper()):
+            return getattr(self.client, command)(*args, **kwargs)
+    
+    def ping(self) -> bool:
+        """Check the connection (also serves as a manual half-open probe)."""
         try:
-            self.client.ping()
-            logger.info(f"Connected to Redis at {self.host}:{self.port}")
-        except redis.ConnectionError as e:
+            return bool(self._call("ping"))
+        except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
-            raise
+            return False
+    
+    def command(self, name: str, *args, default: Any = None) -> Any:
+        """
+        Run any other Redis command (``smembers``, ``publish``...) through the breaker.
+        
+        Args:
+            name: redis-py method name
+            default: Returned if Redis is unavailable or the command fails
+            
+        Returns:
+            The raw reply, or ``default``
+        """
+        try:
+            return self._call(name, *args)
+        except CacheUnavailableError:
+            return default
+        except Exception as e:
+            logger.error(f"Redis {name.upper()} failed: {e}")
+            return default
     
     def set(
         self,
@@ -71,24 +265,21 @@ class RedisCache:
             key: Cache key
             value: Value to cache
             ttl: Time to live in seconds
-            serialize: Serialization method ('pickle' or 'json')
+            serialize: Serialization method ('pickle', 'json' or 'raw')
             
         Returns:
             True if successful
         """
         try:
-            if serialize == "pickle":
-                serialized = pickle.dumps(value)
-            elif serialize == "json":
-                serialized = json.dumps(value).encode('utf-8')
-            else:
-                raise ValueError(f"Unknown serialization: {serialize}")
+            serialized = _serialize(value, serialize)
             
             if ttl:
-                return self.client.setex(key, ttl, serialized)
+                return self._call("setex", key, ttl, serialized)
             else:
-                return self.client.set(key, serialized)
+                return self._call("set", key, serialized)
                 
+        except CacheUnavailableError:
+            return False
         except Exception as e:
             logger.error(f"Redis SET failed for key '{key}': {e}")
             return False
@@ -96,31 +287,28 @@ class RedisCache:
     def get(
         self,
         key: str,
-        deserialize: str = "pickle"
+        deserialize: Deserializer = "pickle"
     ) -> Optional[Any]:
         """
         Get a value by key.
         
         Args:
             key: Cache key
-            deserialize: Deserialization method
+            deserialize: Deserialization method, or a callable decoding the raw bytes
             
         Returns:
             Cached value or None
         """
         try:
-            value = self.client.get(key)
+            value = self._call("get", key)
             
             if value is None:
                 return None
             
-            if deserialize == "pickle":
-                return pickle.loads(value)
-            elif deserialize == "json":
-                return json.loads(value.decode('utf-8'))
-            else:
-                raise ValueError(f"Unknown deserialization: {deserialize}")
+            return _deserialize(value, deserialize)
                 
+        except CacheUnavailableError:
+            return None
         except Exception as e:
             logger.error(f"Redis GET failed for key '{key}': {e}")
             return None
@@ -128,7 +316,9 @@ class RedisCache:
     def delete(self, key: str) -> bool:
         """Delete a key."""
         try:
-            return bool(self.client.delete(key))
+            return bool(self._call("delete", key))
+        except CacheUnavailableError:
+            return False
         except Exception as e:
             logger.error(f"Redis DELETE failed for key '{key}': {e}")
             return False
@@ -136,15 +326,125 @@ class RedisCache:
     def exists(self, key: str) -> bool:
         """Check if key exists."""
         try:
-            return bool(self.client.exists(key))
+            return bool(self._call("exists", key))
+        except CacheUnavailableError:
+            return False
         except Exception as e:
             logger.error(f"Redis EXISTS failed for key '{key}': {e}")
             return False
     
+    def get_many(
+        self,
+        keys: Iterable[str],
+        deserialize: Deserializer = "pickle"
+    ) -> Dict[str, Any]:
+        """
+        Get several values with a single MGET.
+        
+        Args:
+            keys: Cache keys
+            deserialize: Deserialization method
+            
+        Returns:
+            Dict of key -> value for the keys found
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        try:
+            values = self._call("mget", keys)
+        except CacheUnavailableError:
+            return {}
+        except Exception as e:
+            logger.error(f"Redis MGET failed for {len(keys)} keys: {e}")
+            return {}
+        
+        found = {}
+        for key, value in zip(keys, values):
+            if value is None:
+                continue
+            try:
+                found[key] = _deserialize(value, deserialize)
+            except Exception as e:
+                logger.error(f"Redis MGET could not decode key '{key}': {e}")
+        return found
+    
+    def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Optional[Union[int, Dict[str, int]]] = None,
+        serialize: str = "pickle"
+    ) -> bool:
+        """
+        Set several key-value pairs in one pipelined round trip.
+        
+        Args:
+            mapping: Key -> value
+            ttl: Time to live in seconds, for all keys or per key
+                 (keys missing from a dict never expire)
+            serialize: Serialization method ('pickle', 'json' or 'raw')
+            
+        Returns:
+            True if every key was set
+        """
+        if not mapping:
+            return True
+        try:
+            with self.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    key_ttl = ttl.get(key) if isinstance(ttl, dict) else ttl
+                    pipe.set(key, value, ttl=key_ttl, serialize=serialize)
+            return all(pipe.results)
+        except CacheUnavailableError:
+            return False
+        except Exception as e:
+            logger.error(f"Redis SET failed for {len(mapping)} keys: {e}")
+            return False
+    
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several keys with a single DEL; returns how many existed."""
+        keys = list(keys)
+        if not keys:
+            return 0
+        try:
+            return int(self._call("delete", *keys))
+        except CacheUnavailableError:
+            return 0
+        except Exception as e:
+            logger.error(f"Redis DELETE failed for {len(keys)} keys: {e}")
+            return 0
+    
+    @contextmanager
+    def pipeline(self, transaction: bool = True) -> Iterator[CachePipeline]:
+        """
+        Queue commands and send them in one round trip when the block exits.
+        
+        With ``transaction`` the batch runs as MULTI/EXEC, so other clients
+        see all of it or none. Nothing is sent if the block raises; errors
+        while executing are raised to the caller, ``CacheUnavailableError``
+        if the circuit is open.
+        
+        Example:
+            with cache.pipeline() as pipe:
+                pipe.set("a", 1, ttl=60)
+                pipe.delete("b")
+            pipe.results  # [True, 1]
+        """
+        pipe = self.client.pipeline(transaction=transaction)
+        wrapper = CachePipeline(pipe)
+        try:
+            yield wrapper
+            with _guarded(self.breaker, "pipeline"):
+                wrapper.execute()
+        finally:
+            pipe.reset()
+    
     def close(self) -> None:
         """Close the Redis connection."""
+        if self._client is None:
+            return
         try:
-            self.client.close()
+            self._client.close()
             logger.info("Redis connection closed")
         except Exception as e:
             logger.error(f"Error closing Redis connection: {e}")
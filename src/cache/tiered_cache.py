@@ -0,0 +1,228 @@
+import json
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+from .local_cache import LocalCache
+from .redis_cache import CachePipeline, Deserializer, RedisCache
+from ..config.settings import settings
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__, settings.log_level)
+
+
+class TieredCache:
+    """Two-tier cache: an in-process ``LocalCache`` in front of ``RedisCache``.
+
+    Reads are served from the local tier when possible and fall back to
+    Redis, caching the deserialized value locally. Writes and deletes go to
+    Redis, drop the key locally and publish it on the invalidation channel;
+    a listener thread in every process subscribed to the channel drops the
+    same keys from its own local tier. The local TTL bounds how stale an
+    entry can get if an invalidation is missed, and the local tier is
+    cleared whenever the listener reconnects.
+
+    Exposes the same API as ``RedisCache``, so it can be passed wherever a
+    ``RedisCache`` is expected (e.g. to ``FaceCache``). The local tier keeps
+    values as deserialized, so always read a given key with the same
+    ``deserialize`` method.
+    """
+
+    def __init__(
+        self,
+        redis_cache: Optional[RedisCache] = None,
+        local: Optional[LocalCache] = None,
+        channel: Optional[str] = None,
+        listen: bool = True
+    ):
+        """
+        Initialize tiered cache.
+
+        Args:
+            redis_cache: Shared tier
+            local: In-process tier
+            channel: Redis pub/sub channel carrying invalidations
+            listen: Start the invalidation listener thread
+        """
+        self.redis = redis_cache or RedisCache()
+        self.local = local or LocalCache()
+        self.channel = channel or settings.cache.invalidation_channel
+        # Lets the listener skip the invalidations this instance published itself
+        self.origin = uuid.uuid4().hex
+
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.invalidations_sent = 0
+        self.invalidations_received = 0
+
+        self._listener: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        if listen:
+            self.start()
+
+    @property
+    def client(self):
+        """Underlying redis client, for commands without a cache wrapper."""
+        return self.redis.client
+
+    def command(self, name: str, *args, default: Any = None) -> Any:
+        """``RedisCache.command``: any other command, straight to the shared tier."""
+        return self.redis.command(name, *args, default=default)
+
+    # ----- invalidation -----
+
+    def _invalidate(self, keys) -> None:
+        keys = list(keys)
+        if not keys:
+            return
+        self.local.delete_many(keys)
+        message = json.dumps({"origin": self.origin, "keys": keys})
+        if self.redis.command("publish", self.channel, message) is not None:
+            self.invalidations_sent += 1
+
+    def start(self) -> None:
+        """Start the invalidation listener (idempotent)."""
+        if self._listener is not None:
+            return
+        self._stop.clear()
+        self._listener = threading.Thread(target=self._listen, name="cache-invalidation", daemon=True)
+        self._listener.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join(timeout=2)
+            self._listener = None
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                pubsub = self.redis.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Anything published while we were not subscribed was missed
+                self.local.clear()
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self._on_message(message["data"])
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener error, reconnecting: {e}")
+                self._stop.wait(1.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def _on_message(self, data: Union[bytes, str]) -> None:
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning("Ignoring malformed cache invalidation message")
+            return
+        if payload.get("origin") == self.origin:
+            return
+        self.invalidations_received += 1
+        self.local.delete_many(payload.get("keys", []))
+
+    # ----- RedisCache API -----
+
+    def get(self, key: str, deserialize: Deserializer = "pickle") -> Optional[Any]:
+        """Local tier first, then Redis. The deserialized value is cached locally."""
+        generation = self.local.generation
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        value = self.redis.get(key, deserialize=deserialize)
+        if value is None:
+            self.redis_misses += 1
+            return None
+        self.redis_hits += 1
+        # Skipped if an invalidation arrived while Redis was being read
+        self.local.set_if_generation(key, value, generation)
+        return value
+
+    def get_many(self, keys: Iterable[str], deserialize: Deserializer = "pickle") -> Dict[str, Any]:
+        """Local hits plus a single MGET for the rest."""
+        generation = self.local.generation
+        found: Dict[str, Any] = {}
+        missing = []
+        for key in keys:
+            value = self.local.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+        if missing:
+            fetched = self.redis.get_many(missing, deserialize=deserialize)
+            self.redis_hits += len(fetched)
+            self.redis_misses += len(missing) - len(fetched)
+            for key, value in fetched.items():
+                self.local.set_if_generation(key, value, generation)
+            found.update(fetched)
+        return found
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, serialize: str = "pickle") -> bool:
+        success = self.redis.set(key, value, ttl=ttl, serialize=serialize)
+        self._invalidate([key])
+        return success
+
+    def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Optional[Union[int, Dict[str, int]]] = None,
+        serialize: str = "pickle"
+    ) -> bool:
+        success = self.redis.set_many(mapping, ttl=ttl, serialize=serialize)
+        self._invalidate(mapping.keys())
+        return success
+
+    def delete(self, key: str) -> bool:
+        deleted = self.redis.delete(key)
+        self._invalidate([key])
+        return deleted
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        keys = list(keys)
+        deleted = self.redis.delete_many(keys)
+        self._invalidate(keys)
+        return deleted
+
+    def exists(self, key: str) -> bool:
+        if self.local.get(key) is not None:
+            return True
+        return self.redis.exists(key)
+
+    @contextmanager
+    def pipeline(self, transaction: bool = True) -> Iterator[CachePipeline]:
+        """``RedisCache.pipeline``; keys written in it are invalidated afterwards."""
+        pipe = None
+        try:
+            with self.redis.pipeline(transaction=transaction) as pipe:
+                yield pipe
+        finally:
+            if pipe is not None and pipe.keys:
+                self._invalidate(pipe.keys)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-tier counters: local hits/misses/evictions, Redis hits/misses, invalidations."""
+        lookups = self.redis_hits + self.redis_misses
+        return {
+            "local": self.local.stats(),
+            "redis": {
+                "hits": self.redis_hits,
+                "misses": self.redis_misses,
+                "hit_rate": round(self.redis_hits / lookups, 4) if lookups else 0.0,
+            },
+            "invalidations": {
+                "sent": self.invalidations_sent,
+                "received": self.invalidations_received,
+            },
+        }
+
+    def close(self) -> None:
+        self.stop()
+        self.redis.close()
@@ -10,6 +10,10 @@ class RedisSettings(BaseSettings):
     password: Optional[str] = Field(default=None, validation_alias="REDIS_PASSWORD")
     max_connections: int = Field(default=50, validation_alias="REDIS_MAX_CONNECTIONS")
     socket_timeout: int = Field(default=5, validation_alias="REDIS_SOCKET_TIMEOUT")
+    connect_timeout: float = Field(default=1.0, validation_alias="REDIS_CONNECT_TIMEOUT")
+    backend: str = Field(default="redis", validation_alias="REDIS_BACKEND")  # "redis" or "memory" (in-process stand-in)
+    breaker_threshold: int = Field(default=3, validation_alias="REDIS_BREAKER_THRESHOLD")  # Consecutive errors before failing fast
+    breaker_cooldown: float = Field(default=30.0, validation_alias="REDIS_BREAKER_COOLDOWN")  # Seconds before a probe is let through
     
     model_config = SettingsConfigDict(env_ignore_empty=True, extra='ignore')
 
@@ -34,6 +38,11 @@ class CacheSettings(BaseSettings):
     face_ttl: int = Field(default=3600, validation_alias="CACHE_FACE_TTL")  # 1 hour
     detection_ttl: int = Field(default=300, validation_alias="CACHE_DETECTION_TTL")  # 5 min
     max_face_encodings: int = Field(default=10000, validation_alias="CACHE_MAX_FACES")
+    encoding_dir: str = Field(default="models/face_encodings/cli", validation_alias="CACHE_ENCODING_DIR")  # On-disk known-face encodings
+    local_enabled: bool = Field(default=False, validation_alias="CACHE_LOCAL_ENABLED")  # In-process tier in front of Redis
+    local_max_size: int = Field(default=10000, validation_alias="CACHE_LOCAL_MAX_SIZE")
+    local_ttl: float = Field(default=30.0, validation_alias="CACHE_LOCAL_TTL")  # Seconds, bounds staleness if an invalidation is missed
+    invalidation_channel: str = Field(default="cache:invalidate", validation_alias="CACHE_INVALIDATION_CHANNEL")
     
     model_config = SettingsConfigDict(env_ignore_empty=True, extra='ignore')
     
@@ -3,6 +3,7 @@ import numpy as np
 from ultralytics import YOLO
 from src.config import CONFIDENCE_THRESHOLD, MODEL_PATH, logger
 from src.face_auth import FaceAuthenticator
+from src.track_identity import TrackIdentityStore
 
 class ObjectDetector:
     def __init__(self, model_path=MODEL_PATH):
@@ -18,10 +19,9 @@ class ObjectDetector:
         # Initialize Face Authenticator
         self.face_auth = FaceAuthenticator()
         
-        # Optimization: Cache identities for Track IDs
-        self.identity_map = {} # {track_id: {'name': str, 'last_checked': int}}
+        # Optimization: Cache identities for Track IDs (bounded, voted over several checks)
+        self.identities = TrackIdentityStore(recheck_interval=10) # Re-check every 10 frames until confident
         self.frame_count = 0
-        self.face_check_interval = 10 # Run face check every 10 frames per object
 
     def detect_frame(self, frame, roi_points):
         """
@@ -77,30 +77,25 @@ class ObjectDetector:
                     # Only check face if inside ROI (Optimization)
                     
                     # Check if we need to run recognition
-                    should_check = False
+                    should_check = True
                     if track_id != -1:
-                        if track_id not in self.identity_map:
-                            should_check = True
-                        elif (self.frame_count - self.identity_map[track_id]['last_checked']) > self.face_check_interval:
-                            should_check = True
+                        identity = self.identities.touch(track_id, self.frame_count)
+                        should_check = self.identities.needs_check(track_id, self.frame_count)
                             
                         # If we already know them, retrieve name
                         if not should_check:
-                            name = self.identity_map[track_id]['name']
-                    else:
-                        # No track ID (rare with persist=True), always check
-                        should_check = True
+                            name = identity.name
+                    # No track ID (rare with persist=True), always check
                     
                     if should_check:
                         # Run Face Auth
-                        name = self.face_auth.identify_face(frame, (x1, y1, x2, y2))
+                        name, distance = self.face_auth.match_face(frame, (x1, y1, x2, y2))
                         
-                        # Update Cache
+                        # Update Cache (name becomes the vote over all checks of this track)
                         if track_id != -1:
-                            self.identity_map[track_id] = {
-                                'name': name,
-                                'last_checked': self.frame_count
-                            }
+                            name = self.identities.record(track_id, name, distance, self.frame_count).name
+                elif track_id != -1:
+                    self.identities.touch(track_id, self.frame_count)
                 
                 # --- STATUS DETERMINATION ---
                 status = "WARNING"
@@ -138,4 +133,7 @@ class ObjectDetector:
                 cv2.putText(frame, label_text, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
                 cv2.circle(frame, (center_x, center_y), 5, color, -1)
 
+        # Forget tracks that left the scene
+        self.identities.evict(self.frame_count)
+
         return frame, detections, overall_status
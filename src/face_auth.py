@@ -8,12 +8,20 @@ except ImportError:
 import numpy as np
 from loguru import logger
 
+from src.cache.encoding_store import EncodingStore
+
 class FaceAuthenticator:
-    def __init__(self):
+    def __init__(self, tolerance=0.5, encoding_store=None):
+        self.tolerance = tolerance
+        self.encoding_store = encoding_store or EncodingStore("known_faces")
         self.known_face_encodings = []
         self.known_face_names = []
+        # Gallery as one float32 matrix + squared norms for vectorised matching
+        self._encoding_matrix = np.empty((0, 128), dtype=np.float32)
+        self._encoding_sq_norms = np.empty(0, dtype=np.float32)
         if FACE_REC_AVAILABLE:
             self._load_known_faces()
+            self._build_matrix()
         else:
             logger.warning("Face Recognition library not installed.")
 
@@ -23,48 +31,83 @@ class FaceAuthenticator:
             os.makedirs("known_faces")
             return
 
-        for filename in os.listdir("known_faces"):
-            if filename.lower().endswith(('.jpg', '.jpeg', '.png')):
-                filepath = os.path.join("known_faces", filename)
-                try:
-                    # 1. قراءة الصورة بـ OpenCV
-                    img = cv2.imread(filepath)
-                    
-                    if img is None:
-                        logger.warning(f"Could not read {filename}")
-                        continue
-
-                    # 2. المعالجة السحرية (تصحيح الألوان)
-                    # لو الصورة فيها شفافية (4 قنوات)، شيل الشفافية
-                    if len(img.shape) > 2 and img.shape[2] == 4:
-                        rgb_img = cv2.cvtColor(img, cv2.COLOR_BGRA2RGB)
-                    else:
-                        rgb_img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-
-                    # 3. خطوة هامة جداً: إجبار الصورة تكون 8-bit
-                    # ده بيحل مشكلة Unsupported image type
-                    rgb_img = np.array(rgb_img, dtype=np.uint8)
-
-                    # 4. استخراج البصمة
-                    encodings = face_recognition.face_encodings(rgb_img)
-
-                    if len(encodings) > 0:
-                        self.known_face_encodings.append(encodings[0])
-                        # تنظيف الاسم (شيل الامتداد والأرقام)
-                        name = os.path.splitext(filename)[0].split('_')[0]
-                        self.known_face_names.append(name)
-                        logger.success(f"Loaded: {name}")
-                    else:
-                        logger.warning(f"No face found in {filename}")
-
-                except Exception as e:
-                    logger.error(f"Error loading {filename}: {e}")
+        # البصمات محفوظة على الديسك، بنحسب بس الصور الجديدة أو اللي اتغيرت
+        encodings, filenames = self.encoding_store.sync(self._encode_image)
+        self.known_face_encodings = list(encodings)
+        for filename in filenames:
+            # تنظيف الاسم (شيل الامتداد والأرقام)
+            self.known_face_names.append(os.path.splitext(filename)[0].split('_')[0])
         
         logger.info(f"Total known faces loaded: {len(self.known_face_names)}")
 
+    def _encode_image(self, filepath):
+        filename = os.path.basename(filepath)
+
+        # 1. قراءة الصورة بـ OpenCV
+        img = cv2.imread(filepath)
+        
+        if img is None:
+            raise ValueError(f"Could not read {filename}")
+
+        # 2. المعالجة السحرية (تصحيح الألوان)
+        # لو الصورة فيها شفافية (4 قنوات)، شيل الشفافية
+        if len(img.shape) > 2 and img.shape[2] == 4:
+            rgb_img = cv2.cvtColor(img, cv2.COLOR_BGRA2RGB)
+        else:
+            rgb_img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+        # 3. خطوة هامة جداً: إجبار الصورة تكون 8-bit
+        # ده بيحل مشكلة Unsupported image type
+        rgb_img = np.array(rgb_img, dtype=np.uint8)
+
+        # 4. استخراج البصمة
+        encodings = face_recognition.face_encodings(rgb_img)
+
+        if len(encodings) > 0:
+            logger.success(f"Encoded: {filename}")
+            return encodings[0]
+        logger.warning(f"No face found in {filename}")
+        return None
+
+    def _build_matrix(self):
+        if self.known_face_encodings:
+            self._encoding_matrix = np.ascontiguousarray(np.stack(self.known_face_encodings), dtype=np.float32)
+        else:
+            self._encoding_matrix = np.empty((0, 128), dtype=np.float32)
+        self._encoding_sq_norms = np.einsum("ij,ij->i", self._encoding_matrix, self._encoding_matrix)
+
+    def best_match(self, encoding):
+        """
+        Closest known identity for a face encoding.
+
+        Args:
+            encoding: 128-d face encoding
+
+        Returns:
+            (name, distance); name is "Unknown" when the closest entry is
+            beyond the tolerance, distance is inf for an empty gallery
+        """
+        if not self.known_face_names:
+            return "Unknown", float("inf")
+        probe = np.asarray(encoding, dtype=np.float32)
+        # |g - q|^2 = |g|^2 + |q|^2 - 2 g.q over the whole gallery at once
+        sq = self._encoding_sq_norms + np.dot(probe, probe) - 2.0 * (self._encoding_matrix @ probe)
+        distances = np.sqrt(np.maximum(sq, 0.0))
+        best = int(np.argmin(distances))
+        distance = float(distances[best])
+        if distance <= self.tolerance:
+            return self.known_face_names[best], distance
+        return "Unknown", distance
+
     def identify_face(self, frame, bbox):
-        if not FACE_REC_AVAILABLE or not self.known_face_encodings:
-            return "Unknown"
+        return self.match_face(frame, bbox)[0]
+
+    def match_face(self, frame, bbox):
+        if not FACE_REC_AVAILABLE:
+            return "Unknown", None
+        if not self.known_face_encodings:
+            # Nobody to recognise: an Unknown vote without looking for the face
+            return "Unknown", float("inf")
             
         # Unpack bbox to match user's logic
         x1, y1, x2, y2 = bbox
@@ -72,7 +115,7 @@ class FaceAuthenticator:
         try:
             # قص الوجه
             face_img = frame[y1:y2, x1:x2]
-            if face_img.size == 0: return "Unknown"
+            if face_img.size == 0: return "Unknown", None
 
             # تحويل وتجهيز
             rgb_face = cv2.cvtColor(face_img, cv2.COLOR_BGR2RGB)
@@ -82,15 +125,10 @@ class FaceAuthenticator:
             face_encodings = face_recognition.face_encodings(rgb_face)
             
             if not face_encodings:
-                return "Unknown"
-            
-            # مقارنة
-            matches = face_recognition.compare_faces(self.known_face_encodings, face_encodings[0], tolerance=0.5)
-            if True in matches:
-                first_match_index = matches.index(True)
-                return self.known_face_names[first_match_index]
+                return "Unknown", None
             
-            return "Unknown"
+            # مقارنة (أقرب وجه، مش أول وجه)
+            return self.best_match(face_encodings[0])
 
         except Exception as e:
-            return "Unknown"
+            return "Unknown", None
@@ -0,0 +1,134 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+
+class TrackIdentity:
+    """Identity evidence gathered for one track over several face checks."""
+
+    __slots__ = ("votes", "best_distance", "checks", "last_checked", "last_seen", "confident")
+
+    def __init__(self, frame: int):
+        self.votes: Dict[str, int] = {}
+        self.best_distance: Dict[str, float] = {}
+        self.checks = 0
+        self.last_checked = frame
+        self.last_seen = frame
+        self.confident = False
+
+    @property
+    def name(self) -> str:
+        if not self.votes:
+            return "Unknown"
+        return max(self.votes, key=self.votes.get)
+
+    @property
+    def distance(self) -> Optional[float]:
+        return self.best_distance.get(self.name)
+
+    @property
+    def confidence(self) -> float:
+        """Share of face observations that agree with the leading name."""
+        total = sum(self.votes.values())
+        return self.votes[self.name] / total if total else 0.0
+
+
+class TrackIdentityStore:
+    """Bounded per-camera map of track ID -> voted identity.
+
+    Tracks are kept in least-recently-seen order: tracks not seen for
+    ``ttl_frames`` are evicted, and the oldest go first if more than
+    ``max_tracks`` are alive. A track is re-checked every
+    ``recheck_interval`` frames until ``min_votes`` face observations agree
+    on one name with at least ``min_confidence``; after that it is never
+    re-checked.
+    """
+
+    def __init__(
+        self,
+        max_tracks: int = 512,
+        ttl_frames: int = 150,
+        recheck_interval: int = 10,
+        min_votes: int = 3,
+        min_confidence: float = 0.7
+    ):
+        self.max_tracks = max_tracks
+        self.ttl_frames = ttl_frames
+        self.recheck_interval = recheck_interval
+        self.min_votes = min_votes
+        self.min_confidence = min_confidence
+        self._tracks: "OrderedDict[int, TrackIdentity]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def __contains__(self, track_id: int) -> bool:
+        return track_id in self._tracks
+
+    def get(self, track_id: int) -> Optional[TrackIdentity]:
+        return self._tracks.get(track_id)
+
+    def touch(self, track_id: int, frame: int) -> TrackIdentity:
+        """Marks a track as seen in ``frame``, creating it if new."""
+        with self._lock:
+            return self._touch_locked(track_id, frame)
+
+    def _touch_locked(self, track_id: int, frame: int) -> TrackIdentity:
+        identity = self._tracks.get(track_id)
+        if identity is None:
+            identity = TrackIdentity(frame)
+            self._tracks[track_id] = identity
+            while len(self._tracks) > self.max_tracks:
+                self._tracks.popitem(last=False)
+        else:
+            self._tracks.move_to_end(track_id)
+        identity.last_seen = frame
+        return identity
+
+    def needs_check(self, track_id: int, frame: int) -> bool:
+        identity = self._tracks.get(track_id)
+        if identity is None or identity.checks == 0:
+            return True
+        if identity.confident:
+            return False
+        return frame - identity.last_checked >= self.recheck_interval
+
+    def record(self, track_id: int, name: str, distance: Optional[float], frame: int) -> TrackIdentity:
+        """Adds one face check result. A check that found no face (distance None) casts no vote.
+
+        A face checked against an empty gallery (distance ``inf``) votes
+        Unknown like any other unrecognised face, without a best distance.
+        """
+        with self._lock:
+            identity = self._touch_locked(track_id, frame)
+            identity.checks += 1
+            identity.last_checked = frame
+            if distance is not None:
+                identity.votes[name] = identity.votes.get(name, 0) + 1
+                if distance < identity.best_distance.get(name, float("inf")):
+                    identity.best_distance[name] = distance
+                identity.confident = (
+                    sum(identity.votes.values()) >= self.min_votes
+                    and identity.confidence >= self.min_confidence
+                )
+            return identity
+
+    def evict(self, frame: int) -> int:
+        """Drops tracks not seen for ``ttl_frames``; returns how many."""
+        evicted = 0
+        with self._lock:
+            while self._tracks:
+                track_id, identity = next(iter(self._tracks.items()))
+                if frame - identity.last_seen <= self.ttl_frames:
+                    break
+                del self._tracks[track_id]
+                evicted += 1
+        return evicted
+
+    def invalidate(self, names: Iterable[str]):
+        """Forgets tracks currently identified as any of ``names`` (e.g. after a gallery change)."""
+        names = set(names)
+        with self._lock:
+            for track_id in [t for t, identity in self._tracks.items() if identity.name in names]:
+                del self._tracks[track_id]
@@ -0,0 +1,144 @@
+import asyncio
+import pytest
+import redis
+
+from src.cache.async_redis_cache import AsyncRedisCache
+from src.cache.circuit_breaker import CircuitBreaker
+from src.cache.memory_backend import AsyncInMemoryRedis, InMemoryRedis
+from src.cache.redis_cache import CacheUnavailableError, RedisCache
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestAsyncRedisCache:
+
+    @pytest.fixture
+    def cache(self):
+        return AsyncRedisCache(
+            client=AsyncInMemoryRedis(),
+            breaker=CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        )
+
+    def test_set_get_serialization(self, cache):
+        """Test values round-trip with every serialization option."""
+        async def scenario():
+            assert await cache.set("p", {"a": [1, 2]})
+            assert await cache.set("j", {"a": 1}, serialize="json", ttl=60)
+            assert await cache.set("r", b"\x00\x01", serialize="raw")
+            return (
+                await cache.get("p"),
+                await cache.get("j", deserialize="json"),
+                await cache.get("r", deserialize="raw"),
+                await cache.get("missing"),
+            )
+
+        assert run(scenario()) == ({"a": [1, 2]}, {"a": 1}, b"\x00\x01", None)
+
+    def test_bulk_operations(self, cache):
+        """Test get_many/set_many/delete_many."""
+        async def scenario():
+            assert await cache.set_many({"a": 1, "b": 2, "c": 3}, ttl={"a": 5})
+            found = await cache.get_many(["a", "b", "x"])
+            deleted = await cache.delete_many(["b", "c", "x"])
+            return found, deleted, await cache.exists("b")
+
+        assert run(scenario()) == ({"a": 1, "b": 2}, 2, False)
+
+    def test_pipeline(self, cache):
+        """Test pipelined commands run together and discard on error."""
+        async def scenario():
+            async with cache.pipeline() as pipe:
+                pipe.set("a", 1)
+                pipe.get("a")
+                pipe.sadd("s", "m")
+            with pytest.raises(RuntimeError):
+                async with cache.pipeline() as aborted:
+                    aborted.set("never", 1)
+                    raise RuntimeError("abort")
+            return pipe.results, await cache.exists("never")
+
+        assert run(scenario()) == ([True, 1, 1], False)
+
+    def test_command(self, cache):
+        """Test generic commands reach the client."""
+        async def scenario():
+            await cache.command("sadd", "s", "a", "b")
+            return await cache.command("smembers", "s", default=set())
+
+        assert run(scenario()) == {b"a", b"b"}
+
+    def test_lazy_connect(self):
+        """Test constructing a cache does not create a pool or client."""
+        cache = AsyncRedisCache(host="unreachable.invalid", backend="redis")
+
+        assert cache.pool is None
+        assert cache._client is None
+        run(cache.close())
+
+    def test_memory_backend_shares_sync_store(self):
+        """Test the memory backend sees what the sync client wrote."""
+        RedisCache(backend="memory").set("shared", 42)
+
+        assert run(AsyncRedisCache(backend="memory").get("shared")) == 42
+
+
+class TestAsyncCircuitBreaker:
+
+    @pytest.fixture
+    def failing(self, monkeypatch):
+        """Cache whose GETs raise connection errors, counting how often Redis is hit."""
+        store = InMemoryRedis()
+        calls = []
+
+        def broken_get(key):
+            calls.append(key)
+            raise redis.ConnectionError("down")
+
+        monkeypatch.setattr(store, "get", broken_get)
+        cache = AsyncRedisCache(
+            client=AsyncInMemoryRedis(store),
+            breaker=CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        )
+        cache.calls = calls
+        return cache
+
+    def test_opens_and_fails_fast(self, failing):
+        """Test the circuit opens at the threshold and then skips Redis."""
+        async def scenario():
+            for _ in range(4):
+                assert await failing.get("a") is None
+            assert await failing.set("b", 1) is False
+            assert await failing.command("smembers", "s", default=set()) == set()
+            with pytest.raises(CacheUnavailableError):
+                async with failing.pipeline() as pipe:
+                    pipe.set("a", 1)
+
+        run(scenario())
+        assert failing.breaker.state == CircuitBreaker.OPEN
+        assert len(failing.calls) == 2
+
+    def test_probe_error_reply_closes_circuit(self, monkeypatch):
+        """Test a probe answered with an error reply lets the next call through."""
+        store = InMemoryRedis()
+        errors = [redis.ConnectionError("down"), redis.ResponseError("WRONGTYPE")]
+
+        def flaky_get(key):
+            if errors:
+                raise errors.pop(0)
+            return None
+
+        monkeypatch.setattr(store, "get", flaky_get)
+        cache = AsyncRedisCache(
+            client=AsyncInMemoryRedis(store),
+            breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        )
+
+        async def scenario():
+            await cache.get("a")
+            await cache.get("a")  # probe hits ResponseError
+            return await cache.set("b", 1)
+
+        assert run(scenario())
+        assert cache.breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,133 @@
+import pytest
+import numpy as np
+
+from src.cache.encoding_store import EncodingStore
+
+
+class TestEncodingStore:
+
+    @pytest.fixture
+    def faces_dir(self, tmp_path):
+        """Enrolment directory with two faces, one faceless image and a non-image."""
+        faces = tmp_path / "known_faces"
+        faces.mkdir()
+        (faces / "alice_1.jpg").write_bytes(b"alice")
+        (faces / "bob.png").write_bytes(b"bob")
+        (faces / "empty.jpg").write_bytes(b"no face here")
+        (faces / "notes.txt").write_bytes(b"ignored")
+        return faces
+
+    @pytest.fixture
+    def store(self, faces_dir, tmp_path):
+        return EncodingStore(str(faces_dir), str(tmp_path / "cache"))
+
+    @pytest.fixture
+    def encoder(self):
+        """Fake encoder that records which files it was asked to encode."""
+        calls = []
+
+        def encode(path):
+            calls.append(path.replace("\\", "/").rsplit("/", 1)[-1])
+            if "empty" in path:
+                return None
+            return np.full(128, float(len(calls)))
+
+        encode.calls = calls
+        return encode
+
+    def test_first_sync_encodes_every_image(self, store, encoder):
+        """Test a cold cache encodes all images and skips non-images."""
+        matrix, filenames = store.sync(encoder)
+
+        assert sorted(encoder.calls) == ["alice_1.jpg", "bob.png", "empty.jpg"]
+        assert filenames == ["alice_1.jpg", "bob.png"]
+        assert matrix.shape == (2, 128)
+        assert matrix.dtype == np.float32
+        assert store.matrix_path.exists() and store.index_path.exists()
+
+    def test_second_sync_reuses_cache(self, store, encoder):
+        """Test nothing is re-encoded when no image changed, including faceless ones."""
+        first, _ = store.sync(encoder)
+        encoder.calls.clear()
+
+        second, filenames = store.sync(encoder)
+
+        assert encoder.calls == []
+        assert filenames == ["alice_1.jpg", "bob.png"]
+        np.testing.assert_array_equal(first, second)
+
+    def test_changed_and_removed_images(self, store, encoder, faces_dir):
+        """Test only changed images are re-encoded and removed ones drop out."""
+        store.sync(encoder)
+        encoder.calls.clear()
+
+        (faces_dir / "bob.png").write_bytes(b"bob, new photo")
+        (faces_dir / "alice_1.jpg").unlink()
+        (faces_dir / "carol.jpg").write_bytes(b"carol")
+
+        matrix, filenames = store.sync(encoder)
+
+        assert sorted(encoder.calls) == ["bob.png", "carol.jpg"]
+        assert filenames == ["bob.png", "carol.jpg"]
+        assert matrix.shape == (2, 128)
+
+    def test_failed_encoding_is_retried(self, store, faces_dir):
+        """Test an image that raised is not cached and is tried again next time."""
+        def failing(path):
+            raise ValueError("unreadable")
+
+        matrix, filenames = store.sync(failing)
+        assert filenames == []
+        assert matrix.shape == (0, 128)
+
+        calls = []
+        store.sync(lambda path: calls.append(path) or np.zeros(128))
+        assert len(calls) == 3
+
+    def test_corrupt_index_rebuilds(self, store, encoder):
+        """Test an unreadable index falls back to a full rebuild."""
+        store.sync(encoder)
+        store.index_path.write_text("{not json")
+        encoder.calls.clear()
+
+        _, filenames = store.sync(encoder)
+
+        assert len(encoder.calls) == 3
+        assert filenames == ["alice_1.jpg", "bob.png"]
+
+    def test_mismatched_matrix_rebuilds(self, store, encoder):
+        """Test a matrix from a different write than the index is not trusted."""
+        store.sync(encoder)
+        np.save(store.matrix_path, np.full((2, 128), 99.0, dtype=np.float32))
+        encoder.calls.clear()
+
+        matrix, filenames = store.sync(encoder)
+
+        assert len(encoder.calls) == 3
+        assert filenames == ["alice_1.jpg", "bob.png"]
+        assert not (matrix == 99.0).any()
+
+    def test_shape_mismatch_rebuilds(self, store, encoder):
+        """Test a matrix with fewer rows than the index expects is not trusted."""
+        store.sync(encoder)
+        np.save(store.matrix_path, np.zeros((1, 128), dtype=np.float32))
+        encoder.calls.clear()
+
+        store.sync(encoder)
+
+        assert len(encoder.calls) == 3
+
+    def test_no_temp_files_left(self, store, encoder):
+        """Test a sync leaves only the matrix and index behind."""
+        store.sync(encoder)
+
+        assert sorted(p.name for p in store.cache_dir.iterdir()) == ["encodings.npy", "index.json"]
+
+    def test_missing_faces_dir(self, tmp_path, encoder):
+        """Test a missing enrolment directory yields an empty gallery."""
+        store = EncodingStore(str(tmp_path / "missing"), str(tmp_path / "cache"))
+
+        matrix, filenames = store.sync(encoder)
+
+        assert filenames == []
+        assert matrix.shape == (0, 128)
@@ -0,0 +1,126 @@
+import pickle
+import pytest
+import numpy as np
+import redis
+
+from src.cache.face_cache import FaceCache, pack_face, unpack_face
+from src.cache.memory_backend import InMemoryRedis
+from src.cache.redis_cache import RedisCache
+
+
+class CountingRedis(InMemoryRedis):
+    """In-memory backend counting network round trips."""
+
+    def __init__(self):
+        super().__init__()
+        self.round_trips = 0
+
+    def __getattribute__(self, name):
+        if name in ("get", "mget", "smembers", "srem", "pipeline", "exists"):
+            object.__setattr__(self, "round_trips", object.__getattribute__(self, "round_trips") + 1)
+        return object.__getattribute__(self, name)
+
+
+class TestFaceFormat:
+
+    def test_pack_roundtrip(self):
+        """Test encodings and metadata survive the binary format."""
+        encoding = np.random.rand(128)
+        entry = unpack_face(pack_face(encoding, {"name": "alice"}, "2024-01-01T00:00:00"))
+
+        assert entry["encoding"].dtype == np.float32
+        np.testing.assert_allclose(entry["encoding"], encoding, atol=1e-6)
+        assert entry["metadata"] == {"name": "alice"}
+        assert entry["cached_at"] == "2024-01-01T00:00:00"
+
+    def test_compact(self):
+        """Test an entry is little more than the raw float32 bytes."""
+        assert len(pack_face(np.zeros(128), {"name": "alice"})) < 128 * 4 + 100
+
+    def test_legacy_pickle(self):
+        """Test entries pickled by the old format are still read."""
+        legacy = pickle.dumps({"encoding": [0.5] * 128, "metadata": {"name": "bob"}, "cached_at": "x"})
+        entry = unpack_face(legacy)
+
+        assert entry["encoding"].shape == (128,)
+        assert entry["metadata"]["name"] == "bob"
+
+
+class TestFaceCache:
+
+    @pytest.fixture
+    def store(self):
+        return CountingRedis()
+
+    @pytest.fixture
+    def cache(self, store):
+        return FaceCache(RedisCache(client=store))
+
+    @pytest.fixture
+    def faces(self):
+        rng = np.random.default_rng(0)
+        return {f"person_{i}": (rng.random(128), {"name": f"person_{i}"}) for i in range(2500)}
+
+    def test_cache_and_get_face(self, cache):
+        """Test a single face round-trips."""
+        assert cache.cache_face("alice", np.ones(128), {"name": "alice"})
+
+        entry = cache.get_face("alice")
+        assert entry["metadata"] == {"name": "alice"}
+        assert cache.face_exists("alice")
+        assert cache.get_face("nobody") is None
+
+    def test_bulk_roundtrips(self, cache, store, faces):
+        """Test a whole gallery moves in a handful of round trips."""
+        assert cache.cache_many(faces) == len(faces)
+        assert store.round_trips == 3
+
+        store.round_trips = 0
+        loaded = cache.load_all()
+        assert store.round_trips == 4  # SMEMBERS + one MGET per 1000 faces
+        assert set(loaded) == set(faces)
+        np.testing.assert_allclose(loaded["person_7"]["encoding"], faces["person_7"][0], atol=1e-6)
+
+    def test_index_without_keys_scan(self, cache, faces):
+        """Test cached faces are enumerated from the index set."""
+        cache.cache_many(dict(list(faces.items())[:3]))
+
+        assert cache.face_ids() == {"person_0", "person_1", "person_2"}
+
+    def test_load_all_prunes_expired(self, cache, store):
+        """Test index entries whose face expired are dropped."""
+        cache.cache_many({"a": (np.ones(128), None), "b": (np.ones(128), None)})
+        store.delete("face:a")
+
+        assert set(cache.load_all()) == {"b"}
+        assert cache.face_ids() == {"b"}
+
+    def test_load_all_keeps_index_on_failed_fetch(self, cache, store, monkeypatch):
+        """Test a failed MGET neither loses nor unindexes cached faces."""
+        cache.cache_many({f"p{i}": (np.ones(128), None) for i in range(5)})
+
+        def timeout(keys):
+            raise redis.TimeoutError("timed out")
+
+        monkeypatch.setattr(store, "mget", timeout)
+        assert cache.load_all() == {}
+        assert len(cache.face_ids()) == 5
+
+        monkeypatch.undo()
+        assert len(cache.load_all()) == 5
+
+    def test_load_all_keeps_undecodable_entries(self, cache, store):
+        """Test entries that exist but cannot be decoded stay indexed."""
+        cache.cache_many({"a": (np.ones(128), None)})
+        store.set("face:a", b"not a face entry")
+
+        assert cache.load_all() == {}
+        assert cache.face_ids() == {"a"}
+
+    def test_delete_face(self, cache):
+        """Test deleting a face also removes it from the index."""
+        cache.cache_face("alice", np.ones(128))
+
+        assert cache.delete_face("alice")
+        assert not cache.face_exists("alice")
+        assert cache.face_ids() == set()
@@ -0,0 +1,65 @@
+import pytest
+
+from src.cache.local_cache import LocalCache
+
+
+class TestLocalCache:
+
+    @pytest.fixture
+    def cache(self):
+        return LocalCache(max_size=2, ttl=0)
+
+    def test_get_and_stats(self, cache):
+        """Test hits and misses are counted."""
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_lru_eviction(self, cache):
+        """Test the least recently used entry is evicted first."""
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Test entries older than the TTL are misses."""
+        clock = [100.0]
+        monkeypatch.setattr("src.cache.local_cache.time.monotonic", lambda: clock[0])
+        cache = LocalCache(max_size=10, ttl=5)
+        cache.set("a", 1)
+
+        clock[0] = 104.0
+        assert cache.get("a") == 1
+        clock[0] = 106.0
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_invalidation_blocks_stale_fill(self, cache):
+        """Test a value read before an invalidation is not cached after it."""
+        generation = cache.generation
+        cache.delete("a")
+
+        assert not cache.set_if_generation("a", "stale", generation)
+        assert cache.get("a") is None
+        assert cache.set_if_generation("a", "fresh", cache.generation)
+        assert cache.get("a") == "fresh"
+
+    def test_delete_many_and_clear(self, cache):
+        """Test bulk invalidation and clearing."""
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        assert cache.delete_many(["a", "x"]) == 1
+        cache.clear()
+        assert len(cache) == 0
@@ -0,0 +1,197 @@
+import pytest
+import redis
+
+from src.cache.circuit_breaker import CircuitBreaker
+from src.cache.memory_backend import InMemoryRedis
+from src.cache.redis_cache import CacheUnavailableError, RedisCache
+
+
+class FakeClock:
+    def __init__(self, monkeypatch, modules):
+        self.now = 1000.0
+        for module in modules:
+            monkeypatch.setattr(f"{module}.time.monotonic", lambda: self.now)
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class TestRedisCache:
+
+    @pytest.fixture
+    def cache(self):
+        return RedisCache(client=InMemoryRedis(), breaker=CircuitBreaker(failure_threshold=2, reset_timeout=30))
+
+    def test_set_get_serialization(self, cache):
+        """Test values round-trip with every serialization option."""
+        assert cache.set("p", {"a": [1, 2]})
+        assert cache.set("j", {"a": 1}, serialize="json")
+        assert cache.set("r", b"\x00\x01", serialize="raw")
+
+        assert cache.get("p") == {"a": [1, 2]}
+        assert cache.get("j", deserialize="json") == {"a": 1}
+        assert cache.get("r", deserialize="raw") == b"\x00\x01"
+        assert cache.get("r", deserialize=len) == 2
+        assert cache.get("missing") is None
+
+    def test_ttl_expiry(self, cache, monkeypatch):
+        """Test keys set with a TTL expire."""
+        clock = FakeClock(monkeypatch, ["src.cache.memory_backend"])
+        cache.set("a", 1, ttl=10)
+
+        clock.advance(9)
+        assert cache.exists("a")
+        clock.advance(2)
+        assert not cache.exists("a")
+
+    def test_bulk_operations(self, cache, monkeypatch):
+        """Test get_many/set_many (per-key TTL)/delete_many."""
+        clock = FakeClock(monkeypatch, ["src.cache.memory_backend"])
+        assert cache.set_many({"a": 1, "b": 2, "c": 3}, ttl={"a": 5})
+
+        assert cache.get_many(["a", "b", "x"]) == {"a": 1, "b": 2}
+        clock.advance(6)
+        assert cache.get_many(["a", "b", "c"]) == {"b": 2, "c": 3}
+        assert cache.delete_many(["b", "c", "x"]) == 2
+        assert cache.get_many(["b", "c"]) == {}
+
+    def test_pipeline(self, cache):
+        """Test pipelined commands run together and discard on error."""
+        with cache.pipeline() as pipe:
+            pipe.set("a", 1)
+            pipe.get("a")
+            pipe.sadd("s", "m")
+        assert pipe.results == [True, 1, 1]
+        assert pipe.keys == ["a"]
+
+        with pytest.raises(RuntimeError):
+            with cache.pipeline() as pipe:
+                pipe.set("never", 1)
+                raise RuntimeError("abort")
+        assert not cache.exists("never")
+
+    def test_wrong_type_is_a_server_error(self, cache):
+        """Test WRONGTYPE surfaces as a ResponseError that keeps the circuit closed."""
+        cache.command("sadd", "s", "m")
+
+        with pytest.raises(redis.ResponseError):
+            cache._call("get", "s")
+        assert cache.get("s") is None
+        assert cache.breaker.state == CircuitBreaker.CLOSED
+
+    def test_lazy_connect(self):
+        """Test constructing a cache does not connect."""
+        cache = RedisCache(host="unreachable.invalid", backend="redis")
+
+        assert cache.pool is None
+        assert cache._client is None
+
+    def test_unknown_backend(self):
+        """Test an unknown backend name is rejected."""
+        with pytest.raises(ValueError):
+            RedisCache(backend="memcached")
+
+
+class TestCircuitBreaker:
+
+    @pytest.fixture
+    def failing(self, monkeypatch):
+        """Cache whose GETs raise connection errors, counting how often Redis is hit."""
+        store = InMemoryRedis()
+        calls = []
+
+        def broken_get(key):
+            calls.append(key)
+            raise redis.ConnectionError("down")
+
+        monkeypatch.setattr(store, "get", broken_get)
+        cache = RedisCache(client=store, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=30))
+        cache.calls = calls
+        cache.recover = lambda: monkeypatch.delattr(store, "get")
+        return cache
+
+    def test_opens_after_consecutive_failures(self, failing):
+        """Test the circuit opens at the threshold and then fails fast."""
+        assert failing.get("a") is None
+        assert failing.breaker.state == CircuitBreaker.CLOSED
+        assert failing.get("a") is None
+        assert failing.breaker.state == CircuitBreaker.OPEN
+
+        assert failing.get("a") is None
+        assert failing.set("b", 1) is False
+        assert len(failing.calls) == 2
+
+    def test_half_open_probe(self, failing, monkeypatch):
+        """Test a single probe after the cool-down, reopening on failure and closing on success."""
+        clock = FakeClock(monkeypatch, ["src.cache.circuit_breaker"])
+        failing.get("a")
+        failing.get("a")
+
+        clock.advance(31)
+        assert failing.breaker.state == CircuitBreaker.HALF_OPEN
+        failing.get("a")
+        assert len(failing.calls) == 3
+        assert failing.breaker.state == CircuitBreaker.OPEN
+
+        clock.advance(31)
+        failing.recover()
+        assert failing.get("a") is None
+        assert failing.breaker.state == CircuitBreaker.CLOSED
+        assert failing.set("a", 1)
+        assert failing.get("a") == 1
+
+    def test_half_open_allows_one_probe(self):
+        """Test concurrent callers get a single half-open probe."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.allow()
+
+    def test_probe_error_reply_closes_circuit(self, monkeypatch):
+        """Test a probe answered with an error reply (e.g. WRONGTYPE) still lets the next call through."""
+        store = InMemoryRedis()
+        errors = [redis.ConnectionError("down"), redis.ResponseError("WRONGTYPE")]
+
+        def flaky_get(key):
+            if errors:
+                raise errors.pop(0)
+            return None
+
+        monkeypatch.setattr(store, "get", flaky_get)
+        cache = RedisCache(client=store, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0))
+        cache.get("a")
+        assert cache.breaker.state == CircuitBreaker.HALF_OPEN
+
+        assert cache.get("a") is None  # probe hits ResponseError
+        assert cache.breaker.state == CircuitBreaker.CLOSED
+        assert cache.breaker.allow()
+        assert cache.set("b", 1)
+
+    def test_probe_without_verdict_is_released(self):
+        """Test a probe failing before reaching Redis does not block later probes."""
+        cache = RedisCache(client=InMemoryRedis(), breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0))
+        cache.breaker.record_failure()
+
+        with pytest.raises(TypeError):
+            cache._call("get")  # missing argument, never sent
+        assert cache.breaker.allow()
+
+    def test_pipeline_fails_fast_when_open(self, failing):
+        """Test pipelines are refused while the circuit is open."""
+        failing.get("a")
+        failing.get("a")
+
+        with pytest.raises(CacheUnavailableError):
+            with failing.pipeline() as pipe:
+                pipe.set("a", 1)
+        assert failing.set_many({"a": 1}) is False
+
+    def test_command_default_when_open(self, failing):
+        """Test generic commands return their default while the circuit is open."""
+        failing.get("a")
+        failing.get("a")
+
+        assert failing.command("smembers", "s", default=set()) == set()
@@ -0,0 +1,93 @@
+import time
+import pytest
+
+from src.cache.local_cache import LocalCache
+from src.cache.memory_backend import InMemoryRedis
+from src.cache.redis_cache import RedisCache
+from src.cache.tiered_cache import TieredCache
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestTieredCache:
+
+    @pytest.fixture
+    def store(self):
+        return InMemoryRedis()
+
+    @pytest.fixture
+    def make_cache(self, store):
+        """Tiered caches of separate 'processes' sharing one Redis."""
+        caches = []
+
+        def make(listen=False):
+            cache = TieredCache(RedisCache(client=store), LocalCache(max_size=100, ttl=0), listen=listen)
+            caches.append(cache)
+            return cache
+
+        yield make
+        for cache in caches:
+            cache.stop()
+
+    def test_local_hits(self, make_cache, store):
+        """Test repeated reads are served by the local tier."""
+        cache = make_cache()
+        cache.set("a", {"x": 1})
+
+        assert cache.get("a") == {"x": 1}
+        store.set("a", b"changed behind our back")
+        assert cache.get("a") == {"x": 1}
+
+        stats = cache.stats()
+        assert stats["local"]["hits"] == 1
+        assert stats["redis"]["hits"] == 1
+
+    def test_get_many_fills_local_tier(self, make_cache):
+        """Test bulk reads only fetch what the local tier lacks."""
+        cache = make_cache()
+        cache.set_many({"a": 1, "b": 2})
+        cache.get("a")
+
+        assert cache.get_many(["a", "b", "c"]) == {"a": 1, "b": 2}
+        assert cache.stats()["redis"] == {"hits": 2, "misses": 1, "hit_rate": 0.6667}
+
+    def test_own_writes_invalidate(self, make_cache):
+        """Test writes and deletes drop the local copy."""
+        cache = make_cache()
+        cache.set("a", 1)
+        cache.get("a")
+
+        cache.set("a", 2)
+        assert cache.get("a") == 2
+        cache.delete("a")
+        assert cache.get("a") is None
+
+    def test_pubsub_invalidation(self, make_cache):
+        """Test a write in one process invalidates the local tier of another."""
+        reader = make_cache(listen=True)
+        writer = make_cache()
+        assert wait_for(lambda: reader.redis.client._subscribers)
+        writer.set("a", 1)
+        assert reader.get("a") == 1
+
+        writer.set("a", 2)
+        assert wait_for(lambda: reader.stats()["invalidations"]["received"] == 2)
+        assert reader.get("a") == 2
+
+    def test_pipeline_writes_invalidate(self, make_cache):
+        """Test keys written through a pipeline are invalidated too."""
+        cache = make_cache()
+        cache.set("a", 1)
+        cache.get("a")
+
+        with cache.pipeline() as pipe:
+            pipe.set("a", 5)
+
+        assert cache.get("a") == 5
@@ -0,0 +1,87 @@
+import pytest
+
+from src.track_identity import TrackIdentityStore
+
+
+class TestTrackIdentityStore:
+
+    @pytest.fixture
+    def store(self):
+        return TrackIdentityStore(max_tracks=3, ttl_frames=5, recheck_interval=10, min_votes=3, min_confidence=0.7)
+
+    def test_new_track_needs_check(self, store):
+        """Test unknown and never-checked tracks are checked."""
+        assert store.needs_check(1, frame=0)
+        store.touch(1, frame=0)
+        assert store.needs_check(1, frame=0)
+
+    def test_recheck_interval(self, store):
+        """Test an unconfident track is re-checked only after the interval."""
+        store.record(1, "alice", 0.3, frame=0)
+
+        assert not store.needs_check(1, frame=9)
+        assert store.needs_check(1, frame=10)
+
+    def test_voting_and_confidence(self, store):
+        """Test the majority name wins and checks stop once confident."""
+        store.record(1, "alice", 0.35, frame=0)
+        store.record(1, "bob", 0.45, frame=10)
+        identity = store.record(1, "alice", 0.30, frame=20)
+
+        assert identity.name == "alice"
+        assert identity.distance == pytest.approx(0.30)
+        assert not identity.confident  # 2 of 3 < 0.7
+
+        identity = store.record(1, "alice", 0.32, frame=30)
+        assert identity.confident  # 3 of 4
+        assert not store.needs_check(1, frame=1000)
+
+    def test_no_face_casts_no_vote(self, store):
+        """Test a check that found no face does not outvote real observations."""
+        store.record(1, "alice", 0.3, frame=0)
+        identity = store.record(1, "Unknown", None, frame=10)
+
+        assert identity.name == "alice"
+        assert identity.checks == 2
+        assert identity.votes == {"alice": 1}
+
+    def test_ttl_eviction(self, store):
+        """Test tracks unseen for more than ttl_frames are evicted."""
+        store.touch(1, frame=0)
+        store.touch(2, frame=3)
+
+        assert store.evict(frame=6) == 1
+        assert 1 not in store and 2 in store
+
+        store.touch(2, frame=7)
+        assert store.evict(frame=12) == 0
+
+    def test_capacity_evicts_least_recently_seen(self, store):
+        """Test the store never grows beyond max_tracks."""
+        for track_id in range(3):
+            store.touch(track_id, frame=track_id)
+        store.touch(0, frame=3)  # 1 is now the least recently seen
+        store.touch(3, frame=4)
+
+        assert len(store) == 3
+        assert 1 not in store
+        assert all(t in store for t in (0, 2, 3))
+
+    def test_invalidate_by_name(self, store):
+        """Test invalidation forgets tracks identified as the given names."""
+        store.record(1, "alice", 0.3, frame=0)
+        store.record(2, "bob", 0.3, frame=0)
+
+        store.invalidate({"alice"})
+
+        assert 1 not in store and 2 in store
+
+    def test_empty_gallery_votes_unknown(self, store):
+        """Test faces checked against an empty gallery settle the track as Unknown."""
+        for frame in (0, 10, 20):
+            identity = store.record(1, "Unknown", float("inf"), frame=frame)
+
+        assert identity.votes == {"Unknown": 3}
+        assert identity.confident
+        assert identity.distance is None
+        assert not store.needs_check(1, frame=1000)